@@ -17,6 +17,11 @@ from vlm_model.exceptions import (
 from vlm_model.routers.upload_video import router as upload_video_router
 from vlm_model.routers.send_feedback import router as send_feedback_router
 from vlm_model.routers.delete_files import router as delete_files_router 
+from vlm_model.routers.vp9_video import router as vp9_video_router
+from vlm_model.routers.rescore import router as rescore_router
+from vlm_model.routers.readiness import router as readiness_router
+from vlm_model.routers.vlm_cache import router as vlm_cache_router
+from vlm_model.utils.cv_mediapipe_analysis.graph_pool import start_warm_up
 
 from pathlib import Path
 from dotenv import load_dotenv 
@@ -25,6 +30,7 @@ import uvicorn
 import logging
 import logging.config
 import uuid
+from contextlib import asynccontextmanager
 import traceback
 import os
 import sentry_sdk
@@ -61,7 +67,13 @@ sentry_sdk.init(
     },
 )
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Mediapipe 그래프는 import 시 생성하지 않으므로, 첫 요청이 느려지지 않도록 시작 시 백그라운드에서 예열 (GET /ready로 확인)
+    start_warm_up()
+    yield
+
+app = FastAPI(lifespan=lifespan)
 
 # JSON 기반 로깅 설정 적용
 logging_config_path = Path(__file__).resolve().parent / "logging_config.json"  # 프로젝트 루트에 위치한 파일 경로
@@ -96,6 +108,10 @@ app.add_middleware(RequestIDMiddleware)
 app.include_router(upload_video_router, prefix="/api/video", tags=["Video Upload"])
 app.include_router(send_feedback_router, prefix="/api/video", tags=["Feedback Retrieval"])
 app.include_router(delete_files_router, prefix="/api/video", tags=["File Deletion"])
+app.include_router(vp9_video_router, prefix="/api/video", tags=["Video Transcoding"])
+app.include_router(rescore_router, prefix="/api/video", tags=["Rescoring"])
+app.include_router(vlm_cache_router, prefix="/api/video", tags=["VLM Cache"])
+app.include_router(readiness_router, tags=["Readiness"])
 
 # 정적 파일을 제공할 디렉토리 설정 (선택 사항)
 app.mount("/static", StaticFiles(directory="storage/output_feedback_frame"), name="static")
@@ -69,3 +69,35 @@ def test_delete_files_unlink_failure(client):
                 response = client.delete(f"/delete_files/{video_id}")
                 assert response.status_code == 500
                 assert response.json() == {"detail": f"{feedback_files[0].name} 파일 삭제에 실패했습니다."}
+
+
+def test_delete_files_removes_sidecar_files(client):
+    video_id = "test_video_id"
+
+    video_file = Path(f"/fake/upload_dir/{video_id}_original.mp4")
+    media_info_file = Path(f"/fake/upload_dir/{video_id}_original.mp4.probe.json")
+    frame_cache_files = [
+        Path(f"/fake/upload_dir/{video_id}_original.mp4.256x256_i1_s60.frames"),
+        Path(f"/fake/upload_dir/{video_id}_original.mp4.256x256_i1_s60.frames.json"),
+    ]
+
+    def fake_glob(self, pattern):
+        if self == Path("/fake/upload_dir") and pattern.endswith(".mp4"):
+            return [video_file]
+        if self == Path("/fake/upload_dir") and pattern.endswith(".probe.json"):
+            return [media_info_file]
+        if self == Path("/fake/upload_dir") and pattern.endswith(".frames"):
+            return frame_cache_files[:1]
+        if self == Path("/fake/upload_dir") and pattern.endswith(".frames.json"):
+            return frame_cache_files[1:]
+        return []
+
+    with patch("vlm_model.routers.delete_files.UPLOAD_DIR", Path("/fake/upload_dir")), \
+         patch("vlm_model.routers.delete_files.FEEDBACK_DIR", Path("/fake/feedback_dir")):
+
+        with patch.object(Path, "glob", autospec=True, side_effect=fake_glob):
+            with patch.object(Path, "unlink", autospec=True, return_value=None) as mock_unlink:
+                response = client.delete(f"/delete_files/{video_id}")
+                assert response.status_code == 200
+                deleted = {call.args[0] for call in mock_unlink.call_args_list}
+                assert deleted == {video_file, media_info_file, *frame_cache_files}
@@ -0,0 +1,29 @@
+# tests/vlm_model/test_routers/test_readiness.py
+
+import pytest
+from fastapi.testclient import TestClient
+from vlm_model.routers.readiness import router
+from fastapi import FastAPI
+
+# FastAPI 앱에 라우터를 포함시킴
+app = FastAPI()
+app.include_router(router)
+
+@pytest.fixture
+def client():
+    return TestClient(app)
+
+def test_ready_after_warm_up(client, mocker):
+    mocker.patch("vlm_model.routers.readiness.warm_up_state", return_value="ready")
+
+    response = client.get("/ready")
+    assert response.status_code == 200
+    assert response.json() == {"status": "ready", "message": "요청을 처리할 준비가 되었습니다."}
+
+@pytest.mark.parametrize("state", ["pending", "warming_up", "failed"])
+def test_not_ready(client, mocker, state):
+    mocker.patch("vlm_model.routers.readiness.warm_up_state", return_value=state)
+
+    response = client.get("/ready")
+    assert response.status_code == 503
+    assert response.json()["status"] == state
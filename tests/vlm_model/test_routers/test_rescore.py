@@ -0,0 +1,70 @@
+# tests/vlm_model/test_routers/test_rescore.py
+
+import pytest
+from fastapi.testclient import TestClient
+from pathlib import Path
+from vlm_model.routers.rescore import router
+from vlm_model.utils.landmark_store import LandmarkStore
+from fastapi import FastAPI
+
+# FastAPI 앱에 라우터를 포함시킴
+app = FastAPI()
+app.include_router(router)
+
+@pytest.fixture
+def client():
+    return TestClient(app)
+
+@pytest.fixture
+def original_file(mocker):
+    video_id = "test_video_id"
+    mocker.patch("vlm_model.routers.rescore.UPLOAD_DIR", Path("/fake/upload_dir"))
+    original_file = Path(f"/fake/upload_dir/{video_id}_original.mp4")
+    mocker.patch("os.path.exists", side_effect=lambda path: path == original_file)
+    return original_file
+
+def test_rescore_returns_problem_frames(client, original_file, mocker):
+    store = LandmarkStore(params={"segment_length": 60}, tracks=[])
+    mock_load = mocker.patch("vlm_model.routers.rescore.load_landmark_store", return_value=store)
+    mock_rescore = mocker.patch("vlm_model.routers.rescore.rescore_landmark_store", return_value=[{
+        "segment_index": 1,
+        "frame_index": 5,
+        "source_frame_index": 1950,
+        "timestamp": 65.0,
+        "scores": {"posture_score": 0.9, "gaze_score": 0.1, "gestures_score": 0.1, "sudden_movement_score": 0.0},
+        "event": {"start": 63.0, "end": 67.0, "frames": 5}
+    }])
+
+    response = client.get("/video-rescore/test_video_id/?events=true&smoothing_window=3&hysteresis=0.2&max_gap=2")
+    assert response.status_code == 200
+    body = response.json()
+    assert body["video_id"] == "test_video_id"
+    assert body["analysis"] == {"segment_length": 60}
+    assert body["frames"] == [{
+        "segment_index": 1,
+        "frame_index": 5,
+        "timestamp": "1m 5s",
+        "scores": {"posture_score": 0.9, "gaze_score": 0.1, "gestures_score": 0.1, "sudden_movement_score": 0.0},
+        "event": {"start": "1m 3s", "end": "1m 7s", "frames": 5}
+    }]
+    mock_load.assert_called_once_with(str(original_file))
+    mock_rescore.assert_called_once_with(store, True, window=3, hysteresis_margin=0.2, max_gap=2)
+
+def test_rescore_without_store(client, original_file, mocker):
+    mocker.patch("vlm_model.routers.rescore.load_landmark_store", return_value=None)
+
+    response = client.get("/video-rescore/test_video_id/")
+    assert response.status_code == 404
+
+def test_rescore_rejects_invalid_window(client, original_file):
+    response = client.get("/video-rescore/test_video_id/?smoothing_window=0")
+    assert response.status_code == 422
+
+def test_rescore_original_not_found(client, mocker):
+    mocker.patch("vlm_model.routers.rescore.UPLOAD_DIR", Path("/fake/upload_dir"))
+    mocker.patch("os.path.exists", return_value=False)
+    mock_load = mocker.patch("vlm_model.routers.rescore.load_landmark_store")
+
+    response = client.get("/video-rescore/unknown_id/")
+    assert response.status_code == 404
+    mock_load.assert_not_called()
@@ -2,7 +2,7 @@ import pytest
 from unittest.mock import patch, mock_open, MagicMock
 from fastapi.testclient import TestClient
 from vlm_model.routers.upload_video import router
-from vlm_model.exceptions import VideoImportingError
+from vlm_model.exceptions import VideoImportingError, VideoProcessingError
 from fastapi import FastAPI, UploadFile
 import io
 
@@ -21,6 +21,7 @@ def test_receive_video_success(client, mocker):
     # 파일 시스템 동작 Mock
     mocker.patch("os.path.exists", return_value=True)
     mocker.patch("os.path.getsize", return_value=len(file_content))
+    mock_probe = mocker.patch("vlm_model.routers.upload_video.write_media_info", return_value={"codec": "h264", "duration": 10.0, "fps": 30.0})
 
     m = mock_open()
     with patch("builtins.open", m):
@@ -29,6 +30,20 @@ def test_receive_video_success(client, mocker):
         json_data = response.json()
         assert "video_id" in json_data
         assert "비디오 업로드 완료" in json_data["message"]
+    mock_probe.assert_called_once()
+
+def test_receive_video_probe_failure_does_not_fail_upload(client, mocker):
+    file_content = b"fake_video_data"
+
+    mocker.patch("os.path.exists", return_value=True)
+    mocker.patch("os.path.getsize", return_value=len(file_content))
+    mocker.patch("vlm_model.routers.upload_video.write_media_info", side_effect=VideoProcessingError("ffprobe 실행 파일을 찾을 수 없습니다."))
+
+    m = mock_open()
+    with patch("builtins.open", m):
+        response = client.post("/receive-video/", files={"file": ("test.mp4", file_content, "video/mp4")})
+        assert response.status_code == 200
+        assert "video_id" in response.json()
 
 def test_receive_video_unsupported_format(client):
     # 지원하지 않는 형식
@@ -0,0 +1,42 @@
+# tests/vlm_model/test_routers/test_vlm_cache_stats.py
+
+import pytest
+from fastapi.testclient import TestClient
+from vlm_model.routers.vlm_cache import router
+from vlm_model.utils.vlm_cache import VLMResponseCache
+from fastapi import FastAPI
+
+# FastAPI 앱에 라우터를 포함시킴
+app = FastAPI()
+app.include_router(router, prefix="/api/video")
+
+@pytest.fixture
+def client():
+    return TestClient(app)
+
+def test_vlm_cache_stats(client, mocker):
+    cache = VLMResponseCache()
+    cache.put("a", "A")
+    cache.get("a")
+    cache.get("b")
+    mocker.patch("vlm_model.routers.vlm_cache.vlm_cache", cache)
+
+    response = client.get("/api/video/vlm-cache/stats/")
+    assert response.status_code == 200
+    assert response.json() == {
+        "enabled": True,
+        "hits": 1,
+        "memory_hits": 1,
+        "db_hits": 0,
+        "misses": 1,
+        "evictions": 0,
+        "memory_entries": 1,
+        "db_entries": 0
+    }
+
+def test_vlm_cache_stats_disabled(client, mocker):
+    mocker.patch("vlm_model.routers.vlm_cache.vlm_cache", None)
+
+    response = client.get("/api/video/vlm-cache/stats/")
+    assert response.status_code == 200
+    assert response.json()["enabled"] is False
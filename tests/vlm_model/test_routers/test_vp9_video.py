@@ -0,0 +1,58 @@
+# tests/vlm_model/test_routers/test_vp9_video.py
+
+import pytest
+from fastapi.testclient import TestClient
+from pathlib import Path
+from vlm_model.routers.vp9_video import router
+from fastapi import FastAPI
+
+# FastAPI 앱에 라우터를 포함시킴
+app = FastAPI()
+app.include_router(router)
+
+@pytest.fixture
+def client():
+    return TestClient(app)
+
+@pytest.fixture
+def original_file(mocker):
+    video_id = "test_video_id"
+    mocker.patch("vlm_model.routers.vp9_video.UPLOAD_DIR", Path("/fake/upload_dir"))
+    original_file = Path(f"/fake/upload_dir/{video_id}_original.mp4")
+    mocker.patch("os.path.exists", side_effect=lambda path: path == original_file)
+    return original_file
+
+def test_request_vp9_pending(client, original_file, mocker):
+    mock_request = mocker.patch("vlm_model.routers.vp9_video.request_vp9_derivative", return_value="pending")
+
+    response = client.get("/video-vp9/test_video_id/")
+    assert response.status_code == 202
+    assert response.json()["status"] == "pending"
+    mock_request.assert_called_once_with(str(original_file), "/fake/upload_dir/test_video_id_vp9.webm")
+
+def test_request_vp9_ready(client, original_file, mocker):
+    mocker.patch("vlm_model.routers.vp9_video.request_vp9_derivative", return_value="ready")
+
+    response = client.get("/video-vp9/test_video_id/")
+    assert response.status_code == 200
+    assert response.json() == {
+        "video_id": "test_video_id",
+        "status": "ready",
+        "message": "VP9 비디오 파일이 준비되었습니다."
+    }
+
+def test_request_vp9_failed(client, original_file, mocker):
+    mocker.patch("vlm_model.routers.vp9_video.request_vp9_derivative", return_value="failed")
+
+    response = client.get("/video-vp9/test_video_id/")
+    assert response.status_code == 500
+    assert response.json() == {"detail": "VP9 변환에 실패했습니다. 다시 요청하면 변환을 재시도합니다."}
+
+def test_request_vp9_original_not_found(client, mocker):
+    mocker.patch("vlm_model.routers.vp9_video.UPLOAD_DIR", Path("/fake/upload_dir"))
+    mocker.patch("os.path.exists", return_value=False)
+    mock_request = mocker.patch("vlm_model.routers.vp9_video.request_vp9_derivative")
+
+    response = client.get("/video-vp9/unknown_id/")
+    assert response.status_code == 404
+    mock_request.assert_not_called()
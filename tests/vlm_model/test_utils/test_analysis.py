@@ -1,9 +1,29 @@
+import asyncio
+import json
+import httpx
 import pytest
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, MagicMock, AsyncMock
 import numpy as np
-from vlm_model.utils.analysis import analyze_frames
+from vlm_model.utils.analysis import analyze_frames, build_user_content, build_batch_user_content, split_batch_feedback
 from vlm_model.exceptions import PromptImportingError
 from fastapi import HTTPException
+from openai import RateLimitError
+from vlm_model.utils.vlm_cache import VLMResponseCache
+from vlm_model.utils.vlm_scheduler import VLMScheduler
+
+@pytest.fixture(autouse=True)
+def empty_vlm_cache(mocker):
+    # 테스트 간에 VLM 캐시가 공유되지 않도록 빈 캐시 사용
+    cache = VLMResponseCache()
+    mocker.patch("vlm_model.utils.analysis.vlm_cache", cache)
+    return cache
+
+@pytest.fixture(autouse=True)
+def immediate_vlm_scheduler(mocker):
+    # 한도 없이 바로 요청하고 재시도하지 않는 스케줄러 사용
+    scheduler = VLMScheduler(max_retries=0)
+    mocker.patch("vlm_model.utils.analysis.vlm_scheduler", scheduler)
+    return scheduler
 
 @pytest.fixture
 def dummy_frames():
@@ -30,8 +50,8 @@ def test_analyze_frames_success(mocker, dummy_frames, dummy_timestamps, dummy_me
     # Mock encode_image
     mocker.patch("vlm_model.utils.analysis.encode_image", return_value="base64encodedimage")
 
-    # Mock openai client
-    mock_client = mocker.patch("vlm_model.utils.analysis.client.chat.completions.create")
+    # Mock openai client (비동기 클라이언트)
+    mock_client = mocker.patch("vlm_model.utils.analysis.client.chat.completions.create", new_callable=AsyncMock)
     # OpenAI 응답 Mock
     mock_client.return_value.choices = [MagicMock(message=MagicMock(content='{"problem":"none"}'))]
 
@@ -101,3 +121,286 @@ def test_analyze_frames_openai_error(mocker, dummy_frames, dummy_timestamps, dum
         )
     assert excinfo.value.status_code == 400
     assert "피드백 파싱 과정 중 오류" in str(excinfo.value)
+
+def _mock_vlm_response(content):
+    return MagicMock(choices=[MagicMock(message=MagicMock(content=content))])
+
+def test_analyze_frames_keeps_frame_order_with_concurrent_requests(mocker, dummy_frames, dummy_timestamps, dummy_mediapipe_results):
+    mocker.patch("vlm_model.utils.analysis.load_user_prompt", return_value="User prompt")
+    mocker.patch("vlm_model.utils.analysis.encode_image", side_effect=["img0", "img1", "img2"])
+    mocker.patch("vlm_model.utils.analysis.parse_feedback_text", return_value=MagicMock(**{"__fields__": ["posture_body"], "posture_body": MagicMock(improvement="자세 개선 필요")}))
+
+    in_flight = 0
+    max_in_flight = 0
+
+    async def fake_create(**kwargs):
+        nonlocal in_flight, max_in_flight
+        image_url = kwargs["messages"][1]["content"][1]["image_url"]["url"]
+        index = int(image_url[-1])
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        # 앞 프레임일수록 늦게 응답
+        await asyncio.sleep(0.05 * (3 - index))
+        in_flight -= 1
+        return _mock_vlm_response(f"feedback {index}")
+
+    mocker.patch("vlm_model.utils.analysis.client.chat.completions.create", side_effect=fake_create)
+
+    problematic_frames, feedbacks = analyze_frames(
+        frames=dummy_frames,
+        timestamps=dummy_timestamps,
+        mediapipe_results=dummy_mediapipe_results,
+        segment_idx=0,
+        duration=60,
+        segment_length=60,
+        system_instruction="System instruction text"
+    )
+
+    assert feedbacks == ["feedback 0", "feedback 1", "feedback 2"]
+    assert [frame[2] for frame in problematic_frames] == [1, 2, 3]
+    assert [frame[3] for frame in problematic_frames] == dummy_timestamps
+    assert max_in_flight == 3
+
+def test_analyze_frames_limits_concurrent_requests(mocker, dummy_frames, dummy_timestamps, dummy_mediapipe_results):
+    mocker.patch("vlm_model.utils.analysis.load_user_prompt", return_value="User prompt")
+    mocker.patch("vlm_model.utils.analysis.encode_image", return_value="base64encodedimage")
+    mocker.patch("vlm_model.utils.analysis.parse_feedback_text", return_value=MagicMock(**{"__fields__": ["posture_body"], "posture_body": MagicMock(improvement="")}))
+    mocker.patch("vlm_model.utils.analysis._vlm_semaphore", asyncio.Semaphore(1))
+
+    in_flight = 0
+    max_in_flight = 0
+
+    async def fake_create(**kwargs):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return _mock_vlm_response("{}")
+
+    mocker.patch("vlm_model.utils.analysis.client.chat.completions.create", side_effect=fake_create)
+
+    problematic_frames, feedbacks = analyze_frames(
+        frames=dummy_frames,
+        timestamps=dummy_timestamps,
+        mediapipe_results=dummy_mediapipe_results,
+        segment_idx=0,
+        duration=60,
+        segment_length=60,
+        system_instruction="System instruction text"
+    )
+
+    assert problematic_frames == []
+    assert feedbacks == []
+    assert max_in_flight == 1
+
+def test_analyze_frames_maps_openai_error_from_concurrent_request(mocker, dummy_frames, dummy_timestamps, dummy_mediapipe_results):
+    mocker.patch("vlm_model.utils.analysis.load_user_prompt", return_value="User prompt")
+    mocker.patch("vlm_model.utils.analysis.encode_image", side_effect=["img0", "img1", "img2"])
+
+    async def fake_create(**kwargs):
+        if kwargs["messages"][1]["content"][1]["image_url"]["url"].endswith("img1"):
+            raise RateLimitError("rate limited", response=httpx.Response(429, request=httpx.Request("POST", "https://api.openai.com")), body=None)
+        await asyncio.sleep(0.01)
+        return _mock_vlm_response("{}")
+
+    mocker.patch("vlm_model.utils.analysis.client.chat.completions.create", side_effect=fake_create)
+
+    with pytest.raises(HTTPException) as excinfo:
+        analyze_frames(
+            frames=dummy_frames,
+            timestamps=dummy_timestamps,
+            mediapipe_results=dummy_mediapipe_results,
+            segment_idx=0,
+            duration=60,
+            segment_length=60,
+            system_instruction="System instruction text"
+        )
+    assert excinfo.value.status_code == 429
+
+def test_build_user_content_sends_image_as_image_part():
+    content = build_user_content("User prompt", {"posture_score": 0.9}, "base64encodedimage", detail="low")
+
+    assert content[0]["type"] == "text"
+    assert "posture_score: 0.9" in content[0]["text"]
+    assert "base64" not in content[0]["text"]
+    assert content[1] == {
+        "type": "image_url",
+        "image_url": {"url": "data:image/jpeg;base64,base64encodedimage", "detail": "low"}
+    }
+
+def test_analyze_frames_logs_token_usage(mocker, caplog, dummy_frames, dummy_timestamps, dummy_mediapipe_results):
+    mocker.patch("vlm_model.utils.analysis.load_user_prompt", return_value="User prompt")
+    mocker.patch("vlm_model.utils.analysis.encode_image", return_value="base64encodedimage")
+    mocker.patch("vlm_model.utils.analysis.parse_feedback_text", return_value=MagicMock(**{"__fields__": ["posture_body"], "posture_body": MagicMock(improvement="")}))
+
+    response = _mock_vlm_response("{}")
+    response.usage = MagicMock(prompt_tokens=120, completion_tokens=30, total_tokens=150)
+    mocker.patch("vlm_model.utils.analysis.client.chat.completions.create", new_callable=AsyncMock, return_value=response)
+
+    with caplog.at_level("INFO", logger="vlm_model.utils.analysis"):
+        analyze_frames(
+            frames=dummy_frames,
+            timestamps=dummy_timestamps,
+            mediapipe_results=dummy_mediapipe_results,
+            segment_idx=0,
+            duration=60,
+            segment_length=60,
+            system_instruction="System instruction text"
+        )
+
+    assert "프레임 1 토큰 사용량: 입력 120, 출력 30, 합계 150" in caplog.text
+    assert "세그먼트 1 토큰 사용량: 요청 3건, 입력 360, 합계 450 (프레임당 평균 150" in caplog.text
+
+def test_split_batch_feedback_orders_by_frame_number():
+    generated_text = '```json\n[{"frame": 2, "gestures": {"improvement": "b"}}, {"frame": 1, "gestures": {"improvement": "a"}}]\n```'
+
+    feedbacks = split_batch_feedback(generated_text, 2)
+
+    assert [json.loads(text) for text in feedbacks] == [
+        {"gestures": {"improvement": "a"}},
+        {"gestures": {"improvement": "b"}}
+    ]
+
+def test_split_batch_feedback_rejects_count_mismatch():
+    with pytest.raises(ValueError):
+        split_batch_feedback('[{"frame": 1}]', 2)
+    with pytest.raises(ValueError):
+        split_batch_feedback('{"frame": 1}', 1)
+
+def test_build_batch_user_content_labels_each_frame():
+    content = build_batch_user_content("User prompt", [(10.0, {"posture_score": 0.9}, "img0"), (75.0, {"gaze_score": 0.8}, "img1")], detail="low")
+
+    assert [part["type"] for part in content] == ["text", "text", "image_url", "text", "image_url"]
+    assert content[0]["text"].startswith("User prompt")
+    assert "JSON 배열" in content[0]["text"]
+    assert content[1]["text"].startswith("프레임 1 (0m 10s)")
+    assert "posture_score: 0.9" in content[1]["text"]
+    assert content[3]["text"].startswith("프레임 2 (1m 15s)")
+    assert content[4]["image_url"]["url"] == "data:image/jpeg;base64,img1"
+
+def test_analyze_frames_batches_frames_into_one_request(mocker, dummy_frames, dummy_timestamps, dummy_mediapipe_results):
+    mocker.patch("vlm_model.utils.analysis.load_user_prompt", return_value="User prompt")
+    mocker.patch("vlm_model.utils.analysis.encode_image", side_effect=["img0", "img1", "img2"])
+    mocker.patch("vlm_model.utils.analysis.VLM_BATCH_SIZE", 2)
+
+    async def fake_create(**kwargs):
+        content = kwargs["messages"][1]["content"]
+        images = [part["image_url"]["url"][-4:] for part in content if part["type"] == "image_url"]
+        if len(images) == 1:
+            # 남은 한 프레임은 단일 프레임 형식으로 요청
+            return _mock_vlm_response('{"movement": {"improvement": "img2 움직임", "recommendations": "r"}}')
+        return _mock_vlm_response(json.dumps([
+            {"frame": 2, "gaze_processing": {"improvement": "", "recommendations": ""}},
+            {"frame": 1, "posture_body": {"improvement": f"{images[0]} 자세", "recommendations": "r"}}
+        ], ensure_ascii=False))
+
+    mock_create = mocker.patch("vlm_model.utils.analysis.client.chat.completions.create", side_effect=fake_create)
+
+    problematic_frames, feedbacks = analyze_frames(
+        frames=dummy_frames,
+        timestamps=dummy_timestamps,
+        mediapipe_results=dummy_mediapipe_results,
+        segment_idx=0,
+        duration=60,
+        segment_length=60,
+        system_instruction="System instruction text"
+    )
+
+    assert mock_create.call_count == 2
+    assert [frame[2] for frame in problematic_frames] == [1, 3]
+    assert json.loads(feedbacks[0])["posture_body"]["improvement"] == "img0 자세"
+    assert json.loads(feedbacks[1])["movement"]["improvement"] == "img2 움직임"
+
+@pytest.mark.parametrize("batch_response", [
+    '[{"frame": 1, "posture_body": {"improvement": "자세", "recommendations": "r"}}]',
+    "죄송합니다. 분석할 수 없습니다."
+])
+def test_analyze_frames_falls_back_to_single_frames_on_bad_batch(mocker, dummy_frames, dummy_timestamps, dummy_mediapipe_results, batch_response):
+    mocker.patch("vlm_model.utils.analysis.load_user_prompt", return_value="User prompt")
+    mocker.patch("vlm_model.utils.analysis.encode_image", side_effect=["img0", "img1", "img2"])
+    mocker.patch("vlm_model.utils.analysis.VLM_BATCH_SIZE", 3)
+
+    async def fake_create(**kwargs):
+        content = kwargs["messages"][1]["content"]
+        images = [part["image_url"]["url"][-4:] for part in content if part["type"] == "image_url"]
+        if len(images) > 1:
+            # 피드백 수가 맞지 않거나 JSON이 아닌 묶음 응답
+            return _mock_vlm_response(batch_response)
+        return _mock_vlm_response(json.dumps({"posture_body": {"improvement": f"{images[0]} 자세", "recommendations": "r"}}, ensure_ascii=False))
+
+    mock_create = mocker.patch("vlm_model.utils.analysis.client.chat.completions.create", side_effect=fake_create)
+
+    problematic_frames, feedbacks = analyze_frames(
+        frames=dummy_frames,
+        timestamps=dummy_timestamps,
+        mediapipe_results=dummy_mediapipe_results,
+        segment_idx=0,
+        duration=60,
+        segment_length=60,
+        system_instruction="System instruction text"
+    )
+
+    # 묶음 요청 1건 + 프레임별 재요청 3건, 결과는 프레임 순서 유지
+    assert mock_create.call_count == 4
+    assert [frame[2] for frame in problematic_frames] == [1, 2, 3]
+    assert [json.loads(text)["posture_body"]["improvement"] for text in feedbacks] == ["img0 자세", "img1 자세", "img2 자세"]
+
+def test_analyze_frames_reuses_cached_feedback(mocker, empty_vlm_cache, dummy_frames, dummy_timestamps, dummy_mediapipe_results):
+    mocker.patch("vlm_model.utils.analysis.load_user_prompt", return_value="User prompt")
+    mocker.patch("vlm_model.utils.analysis.encode_image", return_value="base64encodedimage")
+    response = _mock_vlm_response('{"posture_body": {"improvement": "자세 개선 필요", "recommendations": "r"}}')
+    mock_create = mocker.patch("vlm_model.utils.analysis.client.chat.completions.create", new_callable=AsyncMock, return_value=response)
+
+    kwargs = dict(
+        timestamps=dummy_timestamps,
+        mediapipe_results=dummy_mediapipe_results,
+        segment_idx=0,
+        duration=60,
+        segment_length=60,
+        system_instruction="System instruction text"
+    )
+    first_frames, first_feedbacks = analyze_frames(frames=dummy_frames, **kwargs)
+    assert mock_create.call_count == 3
+
+    # 같은 프레임을 다시 분석하면 API를 호출하지 않음
+    second_frames, second_feedbacks = analyze_frames(frames=[frame.copy() for frame in dummy_frames], **kwargs)
+    assert mock_create.call_count == 3
+    assert second_feedbacks == first_feedbacks
+    assert [frame[2] for frame in second_frames] == [1, 2, 3]
+    assert empty_vlm_cache.stats()["hits"] == 3
+    assert empty_vlm_cache.stats()["misses"] == 3
+
+    # 프롬프트가 바뀌면 캐시를 사용하지 않음
+    analyze_frames(frames=dummy_frames, **{**kwargs, "system_instruction": "Changed instruction"})
+    assert mock_create.call_count == 6
+
+def test_analyze_frames_retries_rate_limited_request(mocker, dummy_frames, dummy_timestamps, dummy_mediapipe_results):
+    mocker.patch("vlm_model.utils.analysis.load_user_prompt", return_value="User prompt")
+    mocker.patch("vlm_model.utils.analysis.encode_image", side_effect=["img0", "img1", "img2"])
+    mocker.patch("vlm_model.utils.analysis.vlm_scheduler", VLMScheduler(max_retries=2))
+    rate_limited = httpx.Response(429, headers={"retry-after-ms": "10"}, request=httpx.Request("POST", "https://api.openai.com"))
+    attempts = []
+
+    async def fake_create(**kwargs):
+        image_url = kwargs["messages"][1]["content"][1]["image_url"]["url"]
+        attempts.append(image_url[-4:])
+        if image_url.endswith("img1") and attempts.count("img1") == 1:
+            raise RateLimitError("rate limited", response=rate_limited, body=None)
+        return _mock_vlm_response(f'{{"gestures": {{"improvement": "{image_url[-4:]}", "recommendations": "r"}}}}')
+
+    mocker.patch("vlm_model.utils.analysis.client.chat.completions.create", side_effect=fake_create)
+
+    problematic_frames, feedbacks = analyze_frames(
+        frames=dummy_frames,
+        timestamps=dummy_timestamps,
+        mediapipe_results=dummy_mediapipe_results,
+        segment_idx=0,
+        duration=60,
+        segment_length=60,
+        system_instruction="System instruction text",
+        flow_id="video-1"
+    )
+
+    assert attempts.count("img1") == 2
+    assert [json.loads(text)["gestures"]["improvement"] for text in feedbacks] == ["img0", "img1", "img2"]
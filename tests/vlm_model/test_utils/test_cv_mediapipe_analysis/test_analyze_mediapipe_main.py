@@ -10,125 +10,132 @@ def dummy_frame():
     # 480x640 컬러 이미지 (BGR)
     return np.random.randint(0, 256, (480, 640, 3), dtype=np.uint8)
 
+def _pose_with_shoulders_at(x):
+    from vlm_model.utils.cv_mediapipe_analysis.landmark_arrays import empty_frame_landmarks
+
+    landmarks = empty_frame_landmarks()
+    pose = np.full_like(landmarks.pose, 0.5)
+    pose[11:13, 0] = x  # 양 어깨
+    return landmarks._replace(pose=pose)
+
 def test_analyze_frame_no_landmarks(mocker, dummy_frame):
     """
-    pose, face, hands 모두 랜드마크 없음.
+    랜드마크가 없으면 detect_landmarks 결과를 그대로 반환하고 자세/시선 점수는 0입니다.
     """
-    mock_pose = mocker.patch("vlm_model.utils.cv_mediapipe_analysis.analyze_mediapipe_main.pose")
-    mock_face_mesh = mocker.patch("vlm_model.utils.cv_mediapipe_analysis.analyze_mediapipe_main.face_mesh")
-    mock_hands = mocker.patch("vlm_model.utils.cv_mediapipe_analysis.analyze_mediapipe_main.hands")
-
-    mock_pose.process.return_value.pose_landmarks = None
-    mock_face_mesh.process.return_value.multi_face_landmarks = None
-    mock_hands.process.return_value.multi_hand_landmarks = None
-
-    feedback, current_pose_landmarks, current_hand_landmarks = analyze_frame(dummy_frame)
-    assert feedback == {
-        "posture_score": 0.0,
-        "gaze_score": 0.0,
-        "gestures_score": 0.0,
-        "sudden_movement_score": 0.0
-    }
-    assert current_pose_landmarks is None
-    assert current_hand_landmarks is None
-
-def test_analyze_frame_pose_only(mocker, dummy_frame):
+    from vlm_model.utils.cv_mediapipe_analysis.landmark_arrays import empty_frame_landmarks
+    from vlm_model.utils.cv_mediapipe_analysis.segment_scoring import SCORE_KEYS
+
+    landmarks = empty_frame_landmarks()
+    mocker.patch("vlm_model.utils.cv_mediapipe_analysis.analyze_mediapipe_main.detect_landmarks", return_value=landmarks)
+
+    feedback, current_landmarks = analyze_frame(dummy_frame)
+    assert set(feedback) == set(SCORE_KEYS)
+    assert feedback["posture_score"] == 0.0
+    assert feedback["gaze_score"] == 0.0
+    assert feedback["sudden_movement_score"] == 0.0
+    assert current_landmarks is landmarks
+
+def test_analyze_frame_matches_segment_scoring(mocker, dummy_frame):
     """
-    pose 랜드마크만 있는 경우.
+    이전 프레임 랜드마크를 주면 세그먼트 점수 계산과 같은 규칙으로 움직임을 비교합니다.
+    """
+    from vlm_model.utils.cv_mediapipe_analysis.segment_scoring import score_segment
+
+    previous, current = _pose_with_shoulders_at(0.2), _pose_with_shoulders_at(0.6)
+    mocker.patch("vlm_model.utils.cv_mediapipe_analysis.analyze_mediapipe_main.detect_landmarks", return_value=current)
+
+    feedback, _ = analyze_frame(dummy_frame, previous_landmarks=previous)
+
+    expected = score_segment([previous, current])
+    assert feedback == {key: float(values[-1]) for key, values in expected.items()}
+    assert feedback["sudden_movement_score"] > analyze_frame(dummy_frame)[0]["sudden_movement_score"]
+
+def test_analyze_frame_exception(mocker, dummy_frame):
+    """
+    검출 중 예외가 발생하면 아무것도 감지되지 않은 것으로 점수를 계산합니다.
     """
     mock_pose = mocker.patch("vlm_model.utils.cv_mediapipe_analysis.analyze_mediapipe_main.pose")
-    mock_face_mesh = mocker.patch("vlm_model.utils.cv_mediapipe_analysis.analyze_mediapipe_main.face_mesh")
-    mock_hands = mocker.patch("vlm_model.utils.cv_mediapipe_analysis.analyze_mediapipe_main.hands")
-
-    # pose 결과 Mock
-    mock_pose.process.return_value.pose_landmarks = MagicMock()
-    mock_face_mesh.process.return_value.multi_face_landmarks = None
-    mock_hands.process.return_value.multi_hand_landmarks = None
-
-    # 계산 함수들도 Mock
-    mocker.patch("vlm_model.utils.cv_mediapipe_analysis.analyze_mediapipe_main.calculate_head_position_score", return_value=0.8)
-    mocker.patch("vlm_model.utils.cv_mediapipe_analysis.analyze_mediapipe_main.calculate_sudden_movement_score", return_value=0.6)
-    mocker.patch("vlm_model.utils.cv_mediapipe_analysis.analyze_mediapipe_main.calculate_gestures_score", return_value=0.0)
-
-    feedback, current_pose_landmarks, current_hand_landmarks = analyze_frame(dummy_frame)
-    assert feedback["posture_score"] == 0.8
-    assert feedback["sudden_movement_score"] == 0.6
+    mock_pose.process.side_effect = Exception("Unexpected error")
+
+    feedback, current_landmarks = analyze_frame(dummy_frame)
+    assert feedback["posture_score"] == 0.0
     assert feedback["gaze_score"] == 0.0
-    assert feedback["gestures_score"] == 0.0
-    assert current_pose_landmarks is not None
-    assert current_hand_landmarks is None
+    assert np.isnan(current_landmarks.pose).all()
 
-def test_analyze_frame_pose_face(mocker, dummy_frame):
+def test_detect_landmarks_holistic_engine(mocker, dummy_frame):
     """
-    pose와 face 랜드마크가 모두 있는 경우.
+    Holistic 엔진이 설정되면 단일 그래프 결과로 랜드마크 배열을 만들고 개별 그래프는 실행하지 않는지 확인합니다.
     """
+    from types import SimpleNamespace
+    from vlm_model.utils.cv_mediapipe_analysis.analyze_mediapipe_main import detect_landmarks
+
+    def landmark_list(count):
+        return SimpleNamespace(landmark=[SimpleNamespace(x=0.5, y=0.5, z=0.0) for _ in range(count)])
+
+    mock_holistic = mocker.patch("vlm_model.utils.cv_mediapipe_analysis.analyze_mediapipe_main.holistic")
+    mock_holistic.process.return_value = SimpleNamespace(
+        pose_landmarks=landmark_list(33),
+        face_landmarks=landmark_list(468),
+        left_hand_landmarks=None,
+        right_hand_landmarks=landmark_list(21)
+    )
     mock_pose = mocker.patch("vlm_model.utils.cv_mediapipe_analysis.analyze_mediapipe_main.pose")
-    mock_face_mesh = mocker.patch("vlm_model.utils.cv_mediapipe_analysis.analyze_mediapipe_main.face_mesh")
-    mock_hands = mocker.patch("vlm_model.utils.cv_mediapipe_analysis.analyze_mediapipe_main.hands")
-
-    mock_pose.process.return_value.pose_landmarks = MagicMock()
-    mock_face_mesh.process.return_value.multi_face_landmarks = [MagicMock()]
-    mock_hands.process.return_value.multi_hand_landmarks = None
-
-    mocker.patch("vlm_model.utils.cv_mediapipe_analysis.analyze_mediapipe_main.calculate_head_position_score", return_value=0.5)
-    mocker.patch("vlm_model.utils.cv_mediapipe_analysis.analyze_mediapipe_main.calculate_sudden_movement_score", return_value=0.2)
-    mocker.patch("vlm_model.utils.cv_mediapipe_analysis.analyze_mediapipe_main.calculate_lack_of_eye_contact_score", return_value=0.3)
-    mocker.patch("vlm_model.utils.cv_mediapipe_analysis.analyze_mediapipe_main.calculate_gestures_score", return_value=0.0)
-
-    feedback, current_pose_landmarks, current_hand_landmarks = analyze_frame(dummy_frame)
-    assert feedback == {
-        "posture_score": 0.5,
-        "gaze_score": 0.3,
-        "gestures_score": 0.0,
-        "sudden_movement_score": 0.2
-    }
-    assert current_pose_landmarks is not None
-    assert current_hand_landmarks is None
-
-def test_analyze_frame_pose_face_hands(mocker, dummy_frame):
+
+    landmarks = detect_landmarks(dummy_frame)
+
+    mock_holistic.process.assert_called_once()
+    mock_pose.process.assert_not_called()
+    assert not np.isnan(landmarks.pose).any()
+    assert not np.isnan(landmarks.face).any()
+    # 감지된 손은 첫 번째 슬롯부터 채움
+    assert not np.isnan(landmarks.hands[0]).any()
+    assert np.isnan(landmarks.hands[1]).all()
+
+def test_detect_landmarks_roi_crop(dummy_frame):
     """
-    pose, face, hands 모두 있는 경우.
+    roi_crop 그래프 묶음이면 포즈로 구한 영역만 잘라 FaceMesh/Hands에 입력하고, 결과를 프레임 좌표로 되돌리는지 확인합니다.
     """
-    mock_pose = mocker.patch("vlm_model.utils.cv_mediapipe_analysis.analyze_mediapipe_main.pose")
-    mock_face_mesh = mocker.patch("vlm_model.utils.cv_mediapipe_analysis.analyze_mediapipe_main.face_mesh")
-    mock_hands = mocker.patch("vlm_model.utils.cv_mediapipe_analysis.analyze_mediapipe_main.hands")
-
-    mock_pose.process.return_value.pose_landmarks = MagicMock()
-    mock_face_mesh.process.return_value.multi_face_landmarks = [MagicMock()]
-    mock_hand_landmarks = MagicMock()
-    mock_hands.process.return_value.multi_hand_landmarks = [mock_hand_landmarks, mock_hand_landmarks]  # 두 개의 hand_landmarks 가정
-
-    mocker.patch("vlm_model.utils.cv_mediapipe_analysis.analyze_mediapipe_main.calculate_head_position_score", return_value=0.7)
-    mocker.patch("vlm_model.utils.cv_mediapipe_analysis.analyze_mediapipe_main.calculate_sudden_movement_score", return_value=0.4)
-    mocker.patch("vlm_model.utils.cv_mediapipe_analysis.analyze_mediapipe_main.calculate_lack_of_eye_contact_score", return_value=0.25)
-    mocker.patch("vlm_model.utils.cv_mediapipe_analysis.analyze_mediapipe_main.calculate_excessive_gestures_score", return_value=0.6)
-    mocker.patch("vlm_model.utils.cv_mediapipe_analysis.analyze_mediapipe_main.calculate_hand_movement_score", return_value=0.1)
-    mocker.patch("vlm_model.utils.cv_mediapipe_analysis.analyze_mediapipe_main.calculate_gestures_score", return_value=0.35)
-
-    feedback, current_pose_landmarks, current_hand_landmarks = analyze_frame(dummy_frame)
-    assert feedback == {
-        "posture_score": 0.7,
-        "gaze_score": 0.25,
-        "gestures_score": 0.35,
-        "sudden_movement_score": 0.4
-    }
-    assert current_pose_landmarks is not None
-    assert current_hand_landmarks is not None
+    from types import SimpleNamespace
+    from vlm_model.utils.cv_mediapipe_analysis.analyze_mediapipe_main import detect_landmarks
 
-def test_analyze_frame_exception(mocker, dummy_frame):
+    def landmark_list(points):
+        return SimpleNamespace(landmark=[SimpleNamespace(x=x, y=y, z=0.0) for x, y in points])
+
+    pose_points = [(0.5, 0.5)] * 33
+    for index, point in {0: (0.5, 0.3), 2: (0.48, 0.28), 5: (0.52, 0.28), 7: (0.45, 0.3), 8: (0.55, 0.3), 9: (0.49, 0.33), 10: (0.51, 0.33), 11: (0.4, 0.45), 12: (0.6, 0.45)}.items():
+        pose_points[index] = point
+
+    graphs = MagicMock(roi_crop=True, holistic=None)
+    graphs.pose.process.return_value = SimpleNamespace(pose_landmarks=landmark_list(pose_points))
+    graphs.face_mesh.process.return_value = SimpleNamespace(multi_face_landmarks=[landmark_list([(0.5, 0.5)] * 468)])
+    graphs.hands.process.return_value = SimpleNamespace(multi_hand_landmarks=None)
+
+    landmarks = detect_landmarks(dummy_frame, graphs)
+
+    # FaceMesh에는 잘라서 확대한 얼굴 영역이 입력됨
+    face_input = graphs.face_mesh.process.call_args.args[0]
+    assert max(face_input.shape[:2]) == 192
+    # 잘라낸 영역의 중앙은 프레임에서 얼굴 중심 근처로 변환됨
+    assert abs(landmarks.face[0, 0] - 0.5) < 0.05
+    assert abs(landmarks.face[0, 1] - 0.3) < 0.05
+    assert np.isnan(landmarks.hands).all()
+
+def test_detect_landmarks_cascade_skips_hands(dummy_frame):
     """
-    함수 내에서 예외 발생 시 기본값 반환 테스트.
+    cascade가 Hands 생략을 결정하면 Hands 그래프를 실행하지 않고 검출 결과를 cascade에 기록하는지 확인합니다.
     """
-    mock_pose = mocker.patch("vlm_model.utils.cv_mediapipe_analysis.analyze_mediapipe_main.pose")
-    # 예외 발생 시키기 위해 process 호출 시 Exception 발생
-    mock_pose.process.side_effect = Exception("Unexpected error")
+    from types import SimpleNamespace
+    from vlm_model.utils.cv_mediapipe_analysis.analyze_mediapipe_main import detect_landmarks
+
+    graphs = MagicMock(roi_crop=False, holistic=None)
+    graphs.pose.process.return_value = SimpleNamespace(pose_landmarks=None)
+    graphs.face_mesh.process.return_value = SimpleNamespace(multi_face_landmarks=None)
+    cascade = MagicMock()
+    cascade.plan.return_value = (True, False)
+
+    landmarks = detect_landmarks(dummy_frame, graphs, cascade)
 
-    feedback, current_pose_landmarks, current_hand_landmarks = analyze_frame(dummy_frame)
-    assert feedback == {
-        "posture_score": 0.0,
-        "gaze_score": 0.0,
-        "gestures_score": 0.0,
-        "sudden_movement_score": 0.0
-    }
-    assert current_pose_landmarks is None
-    assert current_hand_landmarks is None
+    graphs.face_mesh.process.assert_called_once()
+    graphs.hands.process.assert_not_called()
+    cascade.update.assert_called_once_with(landmarks)
+    assert np.isnan(landmarks.hands).all()
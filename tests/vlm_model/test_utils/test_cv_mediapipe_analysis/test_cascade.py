@@ -0,0 +1,52 @@
+# tests/vlm_model/test_utils/test_cv_mediapipe_analysis/test_cascade.py
+
+import numpy as np
+from types import SimpleNamespace
+from vlm_model.utils.cv_mediapipe_analysis.cascade import GraphCascade
+from vlm_model.utils.cv_mediapipe_analysis.landmark_arrays import to_frame_landmarks
+
+def pose_landmarks(face_visibility=0.9, wrist_visibility=0.9, wrist_y=0.8):
+    points = [SimpleNamespace(x=0.5, y=0.5, z=0.0, visibility=0.9) for _ in range(33)]
+    for index in [0, 2, 5, 7, 8]:
+        points[index].visibility = face_visibility
+    for index in [15, 16]:
+        points[index].visibility = wrist_visibility
+        points[index].y = wrist_y
+    return SimpleNamespace(landmark=points)
+
+def landmark_list(count):
+    return SimpleNamespace(landmark=[SimpleNamespace(x=0.5, y=0.5, z=0.0) for _ in range(count)])
+
+def test_plan_runs_models_for_visible_parts():
+    cascade = GraphCascade()
+    assert cascade.plan(pose_landmarks()) == (True, True)
+    assert cascade.skipped == {"face_mesh": 0, "hands": 0}
+
+def test_plan_skips_hands_below_frame_edge():
+    """
+    손목이 화면 아래로 벗어나거나 보이지 않으면 Hands를 생략하고 횟수를 기록하는지 확인합니다.
+    """
+    cascade = GraphCascade()
+
+    assert cascade.plan(pose_landmarks(wrist_y=1.2)) == (True, False)
+    assert cascade.plan(pose_landmarks(wrist_visibility=0.1)) == (True, False)
+    assert cascade.skipped == {"face_mesh": 0, "hands": 2}
+
+def test_plan_skips_face_when_not_visible():
+    cascade = GraphCascade()
+    assert cascade.plan(pose_landmarks(face_visibility=0.1)) == (False, True)
+    assert cascade.skipped["face_mesh"] == 1
+
+def test_plan_without_pose_follows_previous_detections():
+    """
+    포즈가 없으면 직전 프레임에서 검출된 모델만 실행하는지 확인합니다. 첫 프레임은 모두 실행합니다.
+    """
+    cascade = GraphCascade()
+    assert cascade.plan(None) == (True, True)
+
+    cascade.update(to_frame_landmarks(None, landmark_list(468), None))
+    assert cascade.plan(None) == (True, False)
+
+    cascade.update(to_frame_landmarks())
+    assert cascade.plan(None) == (False, False)
+    assert cascade.skipped == {"face_mesh": 1, "hands": 2}
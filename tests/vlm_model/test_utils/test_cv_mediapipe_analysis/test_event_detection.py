@@ -0,0 +1,44 @@
+# tests/vlm_model/test_utils/test_cv_mediapipe_analysis/test_event_detection.py
+
+import numpy as np
+from vlm_model.utils.cv_mediapipe_analysis.event_detection import ScoreEvent, detect_events, hysteresis, smooth, problem_mask
+
+def series(posture, movement=None):
+    length = len(posture)
+    return {
+        "posture_score": np.array(posture, dtype=float),
+        "gaze_score": np.zeros(length),
+        "gestures_score": np.zeros(length),
+        "sudden_movement_score": np.array(movement if movement is not None else [0.0] * length, dtype=float)
+    }
+
+def test_problem_mask_uses_per_score_thresholds():
+    scores = series([0.8, 0.81, 0.0], [0.0, 0.0, 0.71])
+    assert problem_mask(scores).tolist() == [False, True, True]
+
+def test_hysteresis_keeps_event_until_exit_threshold():
+    values = np.array([0.5, 0.85, 0.75, 0.72, 0.6, 0.85])
+    assert hysteresis(values, 0.8, 0.7).tolist() == [False, True, True, True, False, True]
+
+def test_smooth_moving_average():
+    values = np.array([0.0, 0.0, 0.9, 0.0, 0.0])
+    np.testing.assert_allclose(smooth(values, 3), [0.0, 0.3, 0.3, 0.3, 0.0])
+    assert smooth(values, 1) is values
+
+def test_detect_events_merges_runs_and_picks_peak():
+    """
+    hysteresis로 이어진 구간과 max_gap 이하로 끊긴 구간을 합치고, 기준 대비 가장 심한 프레임을 대표로 고르는지 확인합니다.
+    """
+    posture = [0.1, 0.85, 0.75, 0.95, 0.1, 0.9, 0.1, 0.1, 0.1, 0.9]
+    events = detect_events(series(posture), window=1, hysteresis_margin=0.1, max_gap=1)
+
+    assert events == [ScoreEvent(1, 5, 3), ScoreEvent(9, 9, 9)]
+    assert events[0].length == 5
+
+def test_detect_events_peak_compares_scores_relative_to_threshold():
+    # 자세 0.85 (기준 0.8의 1.06배)보다 움직임 0.8 (기준 0.7의 1.14배)이 더 심함
+    events = detect_events(series([0.85, 0.85], [0.0, 0.8]), window=1, hysteresis_margin=0.1, max_gap=0)
+    assert events == [ScoreEvent(0, 1, 1)]
+
+def test_detect_events_without_problems():
+    assert detect_events(series([0.1, 0.2]), window=3, hysteresis_margin=0.1, max_gap=1) == []
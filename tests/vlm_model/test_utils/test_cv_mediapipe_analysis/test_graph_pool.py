@@ -0,0 +1,146 @@
+# tests/vlm_model/test_utils/test_cv_mediapipe_analysis/test_graph_pool.py
+
+import threading
+import pytest
+from unittest.mock import MagicMock
+from vlm_model.utils.cv_mediapipe_analysis.graph_pool import GraphPool
+
+@pytest.fixture
+def mock_bundle(mocker):
+    # 실제 Mediapipe 그래프 대신 호출마다 새 Mock 묶음 생성
+    return mocker.patch("vlm_model.utils.cv_mediapipe_analysis.graph_pool.GraphBundle", side_effect=lambda **kwargs: MagicMock())
+
+def test_checkout_reuses_and_resets_bundle(mock_bundle):
+    """
+    반환된 묶음을 다음 비디오에 재사용하고, 재사용 전에 추적 상태를 초기화하는지 확인합니다.
+    """
+    pool = GraphPool(size=2)
+
+    with pool.checkout() as first:
+        first.reset.assert_not_called()
+    with pool.checkout() as second:
+        pass
+
+    assert second is first
+    assert mock_bundle.call_count == 1
+    first.reset.assert_called_once()
+
+def test_checkout_gives_each_video_its_own_bundle(mock_bundle):
+    """
+    동시에 빌린 묶음은 서로 다른 객체인지 확인합니다.
+    """
+    pool = GraphPool(size=2)
+
+    with pool.checkout() as first, pool.checkout() as second:
+        assert first is not second
+    assert mock_bundle.call_count == 2
+
+def test_checkout_waits_when_pool_exhausted(mock_bundle):
+    """
+    모든 묶음이 사용 중이면 반환될 때까지 대기하는지 확인합니다.
+    """
+    pool = GraphPool(size=1)
+    acquired = threading.Event()
+
+    def other_video():
+        with pool.checkout():
+            acquired.set()
+
+    with pool.checkout():
+        worker = threading.Thread(target=other_video)
+        worker.start()
+        assert not acquired.wait(timeout=0.2)
+    worker.join(timeout=2)
+    assert acquired.is_set()
+    assert mock_bundle.call_count == 1
+
+def test_checkout_returns_bundle_on_error(mock_bundle):
+    """
+    분석 중 예외가 발생해도 묶음이 풀에 반환되는지 확인합니다.
+    """
+    pool = GraphPool(size=1)
+
+    with pytest.raises(RuntimeError):
+        with pool.checkout():
+            raise RuntimeError("분석 실패")
+    with pool.checkout():
+        pass
+    assert mock_bundle.call_count == 1
+
+def test_warm_up_creates_and_warms_every_bundle(mock_bundle):
+    """
+    예열 시 풀 크기만큼 묶음을 만들고 각각 더미 프레임을 통과시킨 뒤, 이후 요청에서 재사용하는지 확인합니다.
+    """
+    pool = GraphPool(size=2)
+
+    pool.warm_up()
+
+    assert mock_bundle.call_count == 2
+    with pool.checkout() as first, pool.checkout() as second:
+        first.warm_up.assert_called_once()
+        second.warm_up.assert_called_once()
+    assert mock_bundle.call_count == 2
+
+def test_bundle_warm_up_runs_dummy_frame_through_graphs(mocker):
+    from vlm_model.utils.cv_mediapipe_analysis.graph_pool import GraphBundle
+    factories = {name: mocker.patch(f"vlm_model.utils.cv_mediapipe_analysis.graph_pool.create_{name}") for name in ("pose", "face_mesh", "hands")}
+
+    bundle = GraphBundle(engine="separate", roi_crop=False)
+    bundle.warm_up(size=64)
+
+    for factory in factories.values():
+        graph = factory.return_value
+        frame = graph.process.call_args.args[0]
+        assert frame.shape == (64, 64, 3)
+        graph.reset.assert_called_once()
+
+def test_warm_up_graphs_reports_state(mocker):
+    from vlm_model.utils.cv_mediapipe_analysis import graph_pool as graph_pool_module
+    mocker.patch.object(graph_pool_module, "_warm_up_state", "pending")
+    mock_warm_up = mocker.patch.object(graph_pool_module.graph_pool, "warm_up")
+
+    graph_pool_module.warm_up_graphs()
+    assert graph_pool_module.warm_up_state() == "ready"
+
+    mock_warm_up.side_effect = RuntimeError("model load failed")
+    graph_pool_module.warm_up_graphs()
+    assert graph_pool_module.warm_up_state() == "failed"
+
+def test_start_warm_up_disabled_marks_ready(mocker):
+    from vlm_model.utils.cv_mediapipe_analysis import graph_pool as graph_pool_module
+    mocker.patch.object(graph_pool_module, "_warm_up_state", "pending")
+    mock_warm_up = mocker.patch.object(graph_pool_module.graph_pool, "warm_up")
+
+    assert graph_pool_module.start_warm_up(enabled=False) is None
+    assert graph_pool_module.warm_up_state() == "ready"
+    mock_warm_up.assert_not_called()
+
+def test_start_warm_up_runs_in_background(mocker):
+    from vlm_model.utils.cv_mediapipe_analysis import graph_pool as graph_pool_module
+    mocker.patch.object(graph_pool_module, "_warm_up_state", "pending")
+    mock_warm_up = mocker.patch.object(graph_pool_module.graph_pool, "warm_up")
+
+    thread = graph_pool_module.start_warm_up(enabled=True)
+    thread.join(timeout=5)
+
+    mock_warm_up.assert_called_once()
+    assert graph_pool_module.warm_up_state() == "ready"
+
+def test_bundle_uses_profile_settings(mocker):
+    from vlm_model.utils.cv_mediapipe_analysis.graph_pool import GraphBundle
+    from vlm_model.utils.cv_mediapipe_analysis.profiles import ANALYSIS_PROFILES
+    factories = {name: mocker.patch(f"vlm_model.utils.cv_mediapipe_analysis.graph_pool.create_{name}") for name in ("pose", "face_mesh", "hands")}
+
+    GraphBundle(engine="separate", roi_crop=False, profile=ANALYSIS_PROFILES["fast"])
+
+    factories["pose"].assert_called_once_with(model_complexity=0)
+    factories["face_mesh"].assert_called_once_with(static_image_mode=False, refine_landmarks=False)
+    factories["hands"].assert_called_once_with(static_image_mode=False, max_num_hands=1)
+
+def test_checkout_graphs_uses_profile_pool(mock_bundle):
+    from vlm_model.utils.cv_mediapipe_analysis.graph_pool import checkout_graphs, graph_pools
+
+    with checkout_graphs("accurate"):
+        pass
+
+    assert mock_bundle.call_args.kwargs["profile"] is graph_pools["accurate"].profile
@@ -0,0 +1,36 @@
+# tests/vlm_model/test_utils/test_cv_mediapipe_analysis/test_landmark_arrays.py
+
+import numpy as np
+from types import SimpleNamespace
+from vlm_model.utils.cv_mediapipe_analysis.landmark_arrays import to_frame_landmarks, stack_landmarks, landmarks_to_array
+
+def landmark_list(count, value=0.5):
+    return SimpleNamespace(landmark=[SimpleNamespace(x=value, y=value, z=0.0) for _ in range(count)])
+
+def test_to_frame_landmarks_shapes_and_missing():
+    """
+    감지된 부위는 float32 배열로, 감지되지 않은 부위(두 번째 손 포함)는 NaN으로 채워지는지 확인합니다.
+    """
+    landmarks = to_frame_landmarks(landmark_list(33), None, [landmark_list(21, 0.3)])
+
+    assert landmarks.pose.shape == (33, 3) and landmarks.pose.dtype == np.float32
+    assert np.isnan(landmarks.face).all() and landmarks.face.shape == (468, 3)
+    assert landmarks.hands.shape == (2, 21, 3)
+    assert np.allclose(landmarks.hands[0, :, 0], 0.3)
+    assert np.isnan(landmarks.hands[1]).all()
+
+def test_landmarks_to_array_truncates_extra_points():
+    """
+    홍채 포함 FaceMesh처럼 랜드마크가 더 많으면 앞의 점만 사용하는지 확인합니다.
+    """
+    array = landmarks_to_array(landmark_list(478), 468)
+    assert array.shape == (468, 3)
+    assert not np.isnan(array).any()
+
+def test_stack_landmarks():
+    frames = [to_frame_landmarks(landmark_list(33)), to_frame_landmarks()]
+    series = stack_landmarks(frames)
+
+    assert len(series) == 2
+    assert series.pose.shape == (2, 33, 3)
+    assert series.hands.shape == (2, 2, 21, 3)
@@ -37,3 +37,23 @@ def test_mediapipe_initialization(mocker):
                     min_detection_confidence=0.3,
                     min_tracking_confidence=0.3
                 )
+
+def test_lazy_graph_created_on_first_use(mocker):
+    """
+    LazyGraph는 import 시가 아니라 처음 사용할 때 한 번만 그래프를 생성하는지 확인합니다.
+    """
+    from vlm_model.utils.cv_mediapipe_analysis.mediapipe_initializer import LazyGraph
+    factory = mocker.MagicMock()
+    graph = LazyGraph(factory)
+
+    assert not graph.created
+    factory.assert_not_called()
+
+    graph.process("frame1")
+    graph.process("frame2")
+    factory.assert_called_once_with()
+    assert factory.return_value.process.call_count == 2
+
+    graph.close()
+    factory.return_value.close.assert_called_once()
+    assert not graph.created
@@ -0,0 +1,21 @@
+import os
+import subprocess
+import sys
+
+from vlm_model.config import ANALYSIS_PROFILE_NAMES
+from vlm_model.utils.cv_mediapipe_analysis.profiles import ANALYSIS_PROFILES
+
+def test_config_profile_names_match_profiles():
+    assert set(ANALYSIS_PROFILE_NAMES) == set(ANALYSIS_PROFILES)
+
+def test_invalid_profile_env_falls_back_to_balanced():
+    # 대소문자는 무시하고, 오타는 import 시 KeyError 대신 balanced로 대체
+    code = (
+        "from vlm_model.config import ANALYSIS_PROFILE, MEDIAPIPE_WARMUP_PROFILES; "
+        "from vlm_model.utils.cv_mediapipe_analysis.graph_pool import graph_pool; "
+        "print(ANALYSIS_PROFILE, ','.join(MEDIAPIPE_WARMUP_PROFILES), graph_pool.profile.name)"
+    )
+    env = {"ANALYSIS_PROFILE": "Balnced", "MEDIAPIPE_WARMUP_PROFILES": "FAST, accurat, balanced", "OPENAI_API_KEY": "x"}
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True, env={**os.environ, **env})
+
+    assert result.stdout.strip().splitlines()[-1] == "balanced fast,balanced balanced"
@@ -0,0 +1,47 @@
+# tests/vlm_model/test_utils/test_cv_mediapipe_analysis/test_roi.py
+
+import numpy as np
+from vlm_model.utils.cv_mediapipe_analysis.roi import face_roi, hands_roi, crop_roi, roi_to_frame
+
+def make_pose():
+    pose = np.full((33, 3), np.nan, dtype=np.float32)
+    # 얼굴: 화면 위쪽 중앙
+    pose[[0, 2, 5, 7, 8, 9, 10], :2] = [(0.5, 0.3), (0.48, 0.28), (0.52, 0.28), (0.45, 0.3), (0.55, 0.3), (0.49, 0.33), (0.51, 0.33)]
+    # 어깨와 양손
+    pose[[11, 12], :2] = [(0.4, 0.45), (0.6, 0.45)]
+    pose[15:23, :2] = [(0.35, 0.7), (0.65, 0.7), (0.34, 0.74), (0.66, 0.74), (0.35, 0.75), (0.65, 0.75), (0.36, 0.73), (0.64, 0.73)]
+    return pose
+
+def test_face_roi_is_square_around_face():
+    x0, y0, x1, y1 = face_roi(make_pose(), 256, 256)
+
+    assert x1 - x0 == y1 - y0
+    assert x0 < 0.45 * 256 and x1 > 0.55 * 256
+    assert y0 < 0.28 * 256 and y1 > 0.33 * 256
+    # 전체 프레임보다 훨씬 작은 영역
+    assert (x1 - x0) < 256 / 2
+
+def test_hands_roi_contains_both_hands():
+    x0, y0, x1, y1 = hands_roi(make_pose(), 256, 256)
+
+    assert x0 < 0.34 * 256 and x1 > 0.66 * 256
+    assert y0 < 0.7 * 256 and y1 > 0.75 * 256
+
+def test_roi_is_none_without_pose():
+    empty = np.full((33, 3), np.nan, dtype=np.float32)
+    assert face_roi(empty, 256, 256) is None
+    assert hands_roi(empty, 256, 256) is None
+
+def test_crop_roi_upscales_keeping_aspect():
+    frame = np.zeros((256, 256, 3), dtype=np.uint8)
+    patch = crop_roi(frame, (10, 20, 60, 45), 192)
+    assert patch.shape == (96, 192, 3)
+
+def test_roi_to_frame_maps_back_to_frame_coordinates():
+    landmarks = np.array([[0.0, 0.0, 0.1], [1.0, 1.0, 0.0], [np.nan, np.nan, np.nan]], dtype=np.float32)
+
+    mapped = roi_to_frame(landmarks, (64, 32, 128, 96), 256, 256)
+
+    np.testing.assert_allclose(mapped[0], [0.25, 0.125, 0.1 * 64 / 256])
+    np.testing.assert_allclose(mapped[1, :2], [0.5, 0.375])
+    assert np.isnan(mapped[2]).all()
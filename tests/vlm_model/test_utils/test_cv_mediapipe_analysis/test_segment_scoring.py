@@ -0,0 +1,134 @@
+# tests/vlm_model/test_utils/test_cv_mediapipe_analysis/test_segment_scoring.py
+
+import pytest
+import numpy as np
+from types import SimpleNamespace
+from vlm_model.utils.cv_mediapipe_analysis.landmark_arrays import to_frame_landmarks, stack_landmarks
+from vlm_model.utils.cv_mediapipe_analysis.segment_scoring import score_segment, SCORE_KEYS
+from vlm_model.utils.cv_mediapipe_analysis.posture_analysis import calculate_head_position_score
+from vlm_model.utils.cv_mediapipe_analysis.movement_analysis import calculate_sudden_movement_score
+from vlm_model.utils.cv_mediapipe_analysis.gaze_analysis import calculate_lack_of_eye_contact_score
+from vlm_model.utils.cv_mediapipe_analysis.gesture_analysis import calculate_excessive_gestures_score
+from vlm_model.utils.cv_mediapipe_analysis.calculate_hand_move import calculate_hand_movement_score
+from vlm_model.utils.cv_mediapipe_analysis.calculate_gesture import calculate_gestures_score
+
+def landmark_list(points):
+    # Mediapipe NormalizedLandmarkList와 같은 형태 (landmark[i].x/y/z)
+    return SimpleNamespace(landmark=[SimpleNamespace(x=float(x), y=float(y), z=float(z)) for x, y, z in points])
+
+def reference_scores(frames):
+    """
+    기존 프레임별 스코어 함수와 processing_video의 이전 랜드마크 갱신 규칙으로 점수를 계산합니다.
+    """
+    results = []
+    previous_pose = None
+    previous_hand = None
+    for pose, face, hands in frames:
+        posture = gaze = excessive = hand_movement = sudden = 0.0
+        if pose is not None:
+            posture = calculate_head_position_score(pose, 640, 480)
+            sudden = calculate_sudden_movement_score(pose, previous_pose)
+        if face is not None:
+            gaze = calculate_lack_of_eye_contact_score(face, 640)
+        for hand in hands or []:
+            excessive = max(excessive, calculate_excessive_gestures_score(hand))
+            if previous_hand is not None:
+                hand_movement = max(hand_movement, calculate_hand_movement_score(hand, previous_hand))
+        results.append({
+            "posture_score": round(posture, 2),
+            "gaze_score": round(gaze, 2),
+            "gestures_score": round(calculate_gestures_score(excessive, hand_movement), 2),
+            "sudden_movement_score": round(sudden, 2)
+        })
+        previous_pose = pose if pose is not None else previous_pose
+        previous_hand = hands[0] if hands else previous_hand
+    return results
+
+def test_score_segment_matches_per_frame_scorers():
+    """
+    배열 기반 세그먼트 점수가 기존 프레임별 스코어 함수의 결과와 같은지 확인합니다.
+    """
+    rng = np.random.default_rng(0)
+    frames = []
+    for t in range(40):
+        pose = landmark_list(rng.uniform(0.2, 0.8, (33, 3))) if t % 5 != 2 else None
+        face = landmark_list(rng.uniform(0.2, 0.8, (468, 3))) if t % 7 != 3 else None
+        hand_count = t % 3
+        hands = [landmark_list(rng.uniform(0.2, 0.8, (21, 3))) for _ in range(hand_count)] or None
+        frames.append((pose, face, hands))
+
+    series = stack_landmarks([to_frame_landmarks(pose, face, hands) for pose, face, hands in frames])
+    scores = score_segment(series)
+    expected = reference_scores(frames)
+
+    assert len(series) == 40
+    # 얼굴 표정 점수는 기존 프레임별 스코어 함수가 없으므로 나머지 점수만 비교
+    for key in expected[0]:
+        assert scores[key].shape == (40,)
+        np.testing.assert_allclose(scores[key], [frame[key] for frame in expected], atol=0.011)
+
+def test_score_segment_sudden_movement_uses_previous_detected_pose():
+    """
+    포즈가 없는 프레임은 0점이고, 다음 감지 프레임은 마지막으로 감지된 포즈와 비교하는지 확인합니다.
+    """
+    def pose_at(shoulder_y):
+        points = np.full((33, 3), 0.5)
+        points[11] = (0.4, shoulder_y, 0)
+        points[12] = (0.6, shoulder_y, 0)
+        return landmark_list(points)
+
+    frames = [to_frame_landmarks(pose_at(0.35)), to_frame_landmarks(), to_frame_landmarks(pose_at(0.40))]
+    scores = score_segment(frames)
+
+    assert scores["sudden_movement_score"].tolist() == pytest.approx([0.1, 0.0, 0.5])
+    assert scores["posture_score"][1] == 0.0
+
+def test_score_segment_empty():
+    scores = score_segment([])
+    assert all(scores[key].shape == (0,) for key in SCORE_KEYS)
+
+def expression_face(mouth_open, brow_height=0.05):
+    # 양 눈 사이 거리 0.2인 얼굴에서 입 벌림과 눈썹 높이만 바꿈
+    face = np.full((468, 3), 0.5)
+    face[33] = (0.4, 0.45, 0)
+    face[263] = (0.6, 0.45, 0)
+    face[13] = (0.5, 0.6, 0)
+    face[14] = (0.5, 0.6 + mouth_open, 0)
+    face[61] = (0.45, 0.62, 0)
+    face[291] = (0.55, 0.62, 0)
+    face[105] = (0.42, 0.40 - brow_height, 0)
+    face[159] = (0.42, 0.40, 0)
+    face[334] = (0.58, 0.40 - brow_height, 0)
+    face[386] = (0.58, 0.40, 0)
+    return face
+
+def test_facial_expression_flat_affect():
+    from vlm_model.utils.cv_mediapipe_analysis.segment_scoring import facial_expression_scores
+    face = np.stack([expression_face(0.02)] * 12)
+
+    scores = facial_expression_scores(face, window=5)
+
+    assert scores.tolist() == [1.0] * 12
+
+def test_facial_expression_natural_and_excessive_change():
+    from vlm_model.utils.cv_mediapipe_analysis.segment_scoring import facial_expression_scores
+    # 입 벌림이 양 눈 사이 거리의 0~20%로 변하면 자연스러운 변화, 0~60%로 크게 반복되면 과도한 변화
+    natural = np.stack([expression_face(0.02 * (t % 3)) for t in range(12)])
+    excessive = np.stack([expression_face(0.12 * (t % 2), 0.05 + 0.04 * (t % 2)) for t in range(12)])
+
+    natural_scores = facial_expression_scores(natural, window=5)
+    excessive_scores = facial_expression_scores(excessive, window=5)
+
+    assert (natural_scores < 0.7).all()
+    assert (excessive_scores[2:-2] > 0.7).all()
+
+def test_facial_expression_ignores_missing_face():
+    from vlm_model.utils.cv_mediapipe_analysis.segment_scoring import facial_expression_scores
+    face = np.stack([expression_face(0.02)] * 4)
+    face[1] = np.nan
+
+    scores = facial_expression_scores(face, window=3)
+
+    # 얼굴이 없는 프레임과, 주변에 얼굴이 감지된 프레임이 하나뿐인 프레임은 판단하지 않음
+    assert scores.tolist() == [0.0, 0.0, 1.0, 1.0]
+    assert "facial_expression_score" in score_segment([])
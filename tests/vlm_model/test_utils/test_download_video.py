@@ -1,7 +1,8 @@
 import pytest
+import cv2
 import numpy as np
 from unittest.mock import patch, MagicMock
-from vlm_model.utils.download_video import download_and_sample_video_local
+from vlm_model.utils.download_video import download_and_sample_video_local, sample_segment_frames, stream_sampled_frames
 from vlm_model.exceptions import VideoProcessingError
 
 @pytest.fixture
@@ -57,3 +58,108 @@ def test_download_and_sample_unexpected_error(mocker, dummy_video_path):
     with pytest.raises(VideoProcessingError) as excinfo:
         download_and_sample_video_local(dummy_video_path)
     assert "비디오에서 프레임 추출 중 서버 오류가 발생했습니다." in str(excinfo.value)
+
+def make_stream_cap(mocker, fps, num_frames):
+    mock_cap = mocker.Mock()
+    mock_cap.isOpened.return_value = True
+    mock_cap.get.return_value = fps
+    frames = [np.full((4, 4, 3), i % 256, dtype=np.uint8) for i in range(num_frames)]
+    position = {"index": -1}
+
+    def grab():
+        position["index"] += 1
+        return position["index"] < num_frames
+
+    mock_cap.grab.side_effect = grab
+    mock_cap.retrieve.side_effect = lambda: (True, frames[position["index"]])
+    mocker.patch("cv2.VideoCapture", return_value=mock_cap)
+    mocker.patch("cv2.resize", side_effect=lambda frame, size: frame)
+    return mock_cap
+
+def test_stream_sampled_frames_single_pass(mocker, dummy_video_path):
+    # 10fps, 25초 분량 비디오를 10초 세그먼트, 5초 간격으로 샘플링
+    mock_cap = make_stream_cap(mocker, fps=10.0, num_frames=250)
+
+    result = list(stream_sampled_frames(dummy_video_path, segment_length=10, frame_interval=5))
+
+    assert [(s, idx, ts) for s, idx, ts, _ in result] == [
+        (0, 0, 0), (0, 50, 5),
+        (1, 100, 10), (1, 150, 15),
+        (2, 200, 20),
+    ]
+    assert result[1][3][0, 0, 0] == 50
+    # 비디오는 한 번만 열고, 샘플링된 프레임만 retrieve
+    assert mock_cap.retrieve.call_count == 5
+    mock_cap.release.assert_called_once()
+
+def test_stream_sampled_frames_end_time(mocker, dummy_video_path):
+    # end_time 이후에 시작하는 세그먼트는 디코딩하지 않음
+    mock_cap = make_stream_cap(mocker, fps=10.0, num_frames=250)
+
+    result = list(stream_sampled_frames(dummy_video_path, segment_length=10, frame_interval=5, end_time=19.5))
+
+    assert [s for s, _, _, _ in result] == [0, 0, 1, 1]
+    assert mock_cap.grab.call_count == 200
+
+def test_stream_sampled_frames_open_failure(mocker, dummy_video_path):
+    mock_cap = mocker.Mock()
+    mock_cap.isOpened.return_value = False
+    mocker.patch("cv2.VideoCapture", return_value=mock_cap)
+
+    with pytest.raises(VideoProcessingError) as excinfo:
+        list(stream_sampled_frames(dummy_video_path))
+    assert "비디오에서 처리 중 오류가 발생했습니다." in str(excinfo.value)
+
+def test_stream_sampled_frames_ffmpeg_backend(mocker, dummy_video_path):
+    # ffmpeg 백엔드: fps 필터 출력 순서대로 세그먼트/타임스탬프 부여
+    mocker.patch("vlm_model.utils.download_video.use_ffmpeg_backend", return_value=True)
+    mocker.patch("vlm_model.utils.download_video.probe_video_stream", return_value={"fps": 10.0})
+    frames = [np.zeros((4, 4, 3), dtype=np.uint8) for _ in range(5)]
+    mock_iter = mocker.patch("vlm_model.utils.download_video.iter_sampled_frames_ffmpeg", return_value=iter(frames))
+    mock_capture = mocker.patch("cv2.VideoCapture")
+
+    result = list(stream_sampled_frames(dummy_video_path, segment_length=10, frame_interval=5, end_time=25.0))
+
+    assert [(s, idx, ts) for s, idx, ts, _ in result] == [(0, 0, 0), (0, 50, 5), (1, 100, 10), (1, 150, 15), (2, 200, 20)]
+    assert mock_iter.call_args.kwargs["duration"] == 30
+    mock_capture.assert_not_called()
+
+def test_stream_sampled_frames_ffmpeg_fallback(mocker, dummy_video_path):
+    # ffmpeg 실패 시 OpenCV로 대체
+    mocker.patch("vlm_model.utils.download_video.use_ffmpeg_backend", return_value=True)
+    mocker.patch("vlm_model.utils.download_video.probe_video_stream", side_effect=VideoProcessingError("ffprobe 실패"))
+    make_stream_cap(mocker, fps=10.0, num_frames=100)
+
+    result = list(stream_sampled_frames(dummy_video_path, segment_length=10, frame_interval=5))
+
+    assert len(result) == 2
+
+def test_download_and_sample_ffmpeg_backend(mocker, dummy_video_path):
+    mocker.patch("vlm_model.utils.download_video.use_ffmpeg_backend", return_value=True)
+    frames = [np.zeros((256, 256, 3), dtype=np.uint8) for _ in range(60)]
+    mock_iter = mocker.patch("vlm_model.utils.download_video.iter_sampled_frames_ffmpeg", return_value=iter(frames))
+    mocker.patch("vlm_model.utils.download_video.probe_video_stream", return_value={"width": 256, "height": 256, "fps": 30.0, "rotation": 0})
+    mock_capture = mocker.patch("cv2.VideoCapture")
+
+    result = download_and_sample_video_local(dummy_video_path, start_time=60, duration=60)
+
+    assert result.shape == (60, 256, 256, 3)
+    mock_iter.assert_called_once_with(dummy_video_path, 1, (256, 256), 60, 60)
+    mock_capture.assert_not_called()
+
+def test_sample_segment_frames_returns_read_indices(mocker, dummy_video_path):
+    # 29.97fps: 샘플 간격은 int(29.97) = 29프레임이므로 타임스탬프 * fps 반올림과 어긋남
+    mock_cap = mocker.Mock()
+    mock_cap.isOpened.return_value = True
+    mock_cap.get.side_effect = lambda prop: 29.97 if prop == cv2.CAP_PROP_FPS else 300
+    mocker.patch("vlm_model.utils.download_video.load_media_info", return_value=None)
+    frames = [np.full((4, 4, 3), i, dtype=np.uint16) for i in range(300)]
+    mock_cap.read.side_effect = [(True, f) for f in frames] + [(False, None)]
+    mocker.patch("cv2.VideoCapture", return_value=mock_cap)
+    mocker.patch("cv2.resize", side_effect=lambda frame, size: frame)
+    mocker.patch("vlm_model.utils.download_video.get_keyframe_index", return_value=[])
+
+    frame_indices, result = sample_segment_frames(dummy_video_path, start_time=5, duration=5, frame_interval=1, target_size=(4, 4))
+
+    assert frame_indices == [149, 178, 207, 236, 265, 294]
+    assert [int(frame[0, 0, 0]) for frame in result] == frame_indices
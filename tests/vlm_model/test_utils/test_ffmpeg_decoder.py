@@ -0,0 +1,117 @@
+# tests/vlm_model/test_utils/test_ffmpeg_decoder.py
+
+import io
+import json
+import subprocess
+import pytest
+import numpy as np
+from unittest import mock
+from vlm_model.utils.ffmpeg_decoder import probe_video_stream, iter_raw_frames, iter_sampled_frames_ffmpeg, read_frames_ffmpeg
+from vlm_model.exceptions import VideoProcessingError
+
+def make_process(mocker, raw_bytes, return_code=0, stderr=b""):
+    process = mocker.Mock()
+    process.stdout = io.BytesIO(raw_bytes)
+    process.stderr = io.BytesIO(stderr)
+    process.poll.return_value = return_code
+    process.wait.return_value = return_code
+    return process
+
+def test_iter_raw_frames_reads_fixed_size_frames(mocker):
+    frames = [np.full((2, 3, 3), i, dtype=np.uint8) for i in range(3)]
+    process = make_process(mocker, b"".join(f.tobytes() for f in frames))
+    mock_popen = mocker.patch("vlm_model.utils.ffmpeg_decoder.subprocess.Popen", return_value=process)
+
+    result = list(iter_raw_frames(["ffmpeg"], width=3, height=2))
+
+    assert len(result) == 3
+    for expected, frame in zip(frames, result):
+        assert frame.shape == (2, 3, 3)
+        assert np.array_equal(frame, expected)
+    mock_popen.assert_called_once()
+
+def test_iter_raw_frames_nonzero_exit(mocker):
+    process = make_process(mocker, b"", return_code=1, stderr=b"Invalid data found")
+    mocker.patch("vlm_model.utils.ffmpeg_decoder.subprocess.Popen", return_value=process)
+
+    with pytest.raises(VideoProcessingError) as excinfo:
+        list(iter_raw_frames(["ffmpeg"], width=3, height=2))
+    assert "FFmpeg 디코딩 중 오류가 발생했습니다." in str(excinfo.value)
+
+def test_iter_raw_frames_ffmpeg_not_found(mocker):
+    mocker.patch("vlm_model.utils.ffmpeg_decoder.subprocess.Popen", side_effect=FileNotFoundError("ffmpeg"))
+
+    with pytest.raises(VideoProcessingError) as excinfo:
+        list(iter_raw_frames(["ffmpeg"], width=3, height=2))
+    assert "ffmpeg 실행 파일을 찾을 수 없습니다." in str(excinfo.value)
+
+def test_iter_raw_frames_kills_process_when_closed_early(mocker):
+    frame = np.zeros((2, 3, 3), dtype=np.uint8)
+    process = make_process(mocker, frame.tobytes() * 2)
+    process.poll.return_value = None
+    mocker.patch("vlm_model.utils.ffmpeg_decoder.subprocess.Popen", return_value=process)
+
+    frames = iter_raw_frames(["ffmpeg"], width=3, height=2)
+    next(frames)
+    frames.close()
+
+    process.kill.assert_called_once()
+
+def test_iter_sampled_frames_ffmpeg_filter_command(mocker):
+    mock_iter = mocker.patch("vlm_model.utils.ffmpeg_decoder.iter_raw_frames", return_value=iter([]))
+
+    list(iter_sampled_frames_ffmpeg("/fake/video.mp4", 1, (256, 256), start_time=60, duration=60))
+
+    command, width, height = mock_iter.call_args.args
+    assert command[command.index("-ss") + 1] == "60"
+    assert command[command.index("-t") + 1] == "60"
+    assert command[command.index("-vf") + 1] == "fps=1/1:round=up,scale=256:256"
+    assert command[-5:] == ["-f", "rawvideo", "-pix_fmt", "bgr24", "-"]
+    assert (width, height) == (256, 256)
+
+def test_read_frames_ffmpeg_select_filter(mocker):
+    mock_iter = mocker.patch("vlm_model.utils.ffmpeg_decoder.iter_raw_frames", return_value=iter([]))
+
+    read_frames_ffmpeg("/fake/video.mp4", [20, 10, 20], (640, 480))
+
+    command = mock_iter.call_args.args[0]
+    assert command[command.index("-vf") + 1] == "select=eq(n\\,10)+eq(n\\,20)"
+
+def test_probe_video_stream_rotation(mocker):
+    output = {"streams": [{
+        "width": 1920, "height": 1080,
+        "avg_frame_rate": "30000/1001", "r_frame_rate": "30/1",
+        "side_data_list": [{"rotation": -90}]
+    }]}
+    mocker.patch("vlm_model.utils.ffmpeg_decoder.subprocess.run", return_value=mock.Mock(stdout=json.dumps(output).encode()))
+
+    info = probe_video_stream("/fake/video.mp4")
+
+    assert (info["width"], info["height"]) == (1080, 1920)
+    assert info["rotation"] == 270
+    assert info["fps"] == pytest.approx(29.97, rel=1e-3)
+
+def test_probe_video_stream_failure(mocker):
+    mocker.patch("vlm_model.utils.ffmpeg_decoder.subprocess.run", side_effect=subprocess.CalledProcessError(1, "ffprobe"))
+
+    with pytest.raises(VideoProcessingError):
+        probe_video_stream("/fake/video.mp4")
+
+def test_probe_video_stream_uses_media_info(mocker):
+    media_info = {"codec": "h264", "duration": 10.0, "fps": 25.0, "vfr": False, "width": 640, "height": 360, "rotation": 0, "frame_count": 250, "keyframes": [0.0]}
+    mocker.patch("vlm_model.utils.ffmpeg_decoder.load_media_info", return_value=media_info)
+    mock_run = mocker.patch("vlm_model.utils.ffmpeg_decoder.subprocess.run")
+
+    info = probe_video_stream("/fake/video.mp4")
+
+    assert info == {"width": 640, "height": 360, "fps": 25.0, "rotation": 0}
+    mock_run.assert_not_called()
+
+def test_read_frames_ffmpeg_seeks_before_first_frame(mocker):
+    mock_iter = mocker.patch("vlm_model.utils.ffmpeg_decoder.iter_raw_frames", return_value=iter([]))
+
+    read_frames_ffmpeg("/fake/video.mp4", [260, 250], (640, 480), seek_fps=25.0)
+
+    command = mock_iter.call_args.args[0]
+    assert command[command.index("-ss") + 1] == str((250 - 0.5) / 25.0)
+    assert command[command.index("-vf") + 1] == "select=eq(n\\,0)+eq(n\\,10)"
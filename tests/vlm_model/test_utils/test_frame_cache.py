@@ -0,0 +1,66 @@
+# tests/vlm_model/test_utils/test_frame_cache.py
+
+import os
+import numpy as np
+import pytest
+from vlm_model.utils.frame_cache import frame_cache_paths, load_frame_cache, write_through_frame_cache
+
+TARGET_SIZE = (8, 6)
+
+@pytest.fixture
+def video_path(tmp_path):
+    path = tmp_path / "test_video_id_original.mp4"
+    path.write_bytes(b"fake_video_data")
+    return str(path)
+
+def make_stream(count, segment_length=2):
+    return [(i // segment_length, i * 30, float(i), np.full((6, 8, 3), i, dtype=np.uint8)) for i in range(count)]
+
+def test_frame_cache_write_and_load(video_path):
+    stream = make_stream(5)
+
+    # 스트림은 그대로 전달되고, 끝까지 읽으면 캐시가 생성됨
+    passed = list(write_through_frame_cache(video_path, 2, 1, TARGET_SIZE, iter(stream)))
+    assert [item[:3] for item in passed] == [item[:3] for item in stream]
+
+    cache = load_frame_cache(video_path, 2, 1, TARGET_SIZE)
+    assert cache is not None
+    assert isinstance(cache.frames, np.memmap)
+    cached = list(cache)
+    assert [item[:3] for item in cached] == [item[:3] for item in stream]
+    assert all(np.array_equal(a[3], b[3]) for a, b in zip(cached, stream))
+    assert [(frame_idx, timestamp) for frame_idx, timestamp, _ in cache.segment_frames(1)] == [(60, 2.0), (90, 3.0)]
+
+def test_frame_cache_keyed_by_sampling_parameters(video_path):
+    list(write_through_frame_cache(video_path, 2, 1, TARGET_SIZE, iter(make_stream(3))))
+
+    assert load_frame_cache(video_path, 60, 1, TARGET_SIZE) is None
+    assert load_frame_cache(video_path, 2, 2, TARGET_SIZE) is None
+
+def test_frame_cache_not_written_when_interrupted(video_path):
+    stream = write_through_frame_cache(video_path, 2, 1, TARGET_SIZE, iter(make_stream(5)))
+    next(stream)
+    stream.close()
+
+    data_path, index_path = frame_cache_paths(video_path, 2, 1, TARGET_SIZE)
+    assert load_frame_cache(video_path, 2, 1, TARGET_SIZE) is None
+    assert not index_path.exists()
+    # 기록 중이던 임시 파일도 남지 않음
+    assert [name for name in os.listdir(os.path.dirname(video_path)) if name.endswith(".tmp")] == []
+
+def test_frame_cache_invalidated_when_source_changes(video_path):
+    list(write_through_frame_cache(video_path, 2, 1, TARGET_SIZE, iter(make_stream(3))))
+
+    with open(video_path, "ab") as f:
+        f.write(b"changed")
+
+    assert load_frame_cache(video_path, 2, 1, TARGET_SIZE) is None
+
+def test_frame_cache_disabled(mocker, video_path):
+    mocker.patch("vlm_model.utils.frame_cache.FRAME_CACHE_ENABLED", False)
+
+    list(write_through_frame_cache(video_path, 2, 1, TARGET_SIZE, iter(make_stream(3))))
+
+    data_path, index_path = frame_cache_paths(video_path, 2, 1, TARGET_SIZE)
+    assert not data_path.exists()
+    assert load_frame_cache(video_path, 2, 1, TARGET_SIZE) is None
@@ -0,0 +1,91 @@
+# tests/vlm_model/test_utils/test_landmark_store.py
+
+import os
+import pytest
+import numpy as np
+from vlm_model.utils.cv_mediapipe_analysis.landmark_arrays import empty_frame_landmarks, stack_landmarks
+from vlm_model.utils.landmark_store import (
+    LandmarkTrack, LandmarkStore, landmark_store_path, save_landmark_store, load_landmark_store, rescore_landmark_store
+)
+
+def frame_with_nose(x, y):
+    frame = empty_frame_landmarks()
+    frame.pose[:] = 0.5
+    frame.pose[0, :2] = (x, y)
+    return frame
+
+def make_track(segment_index, nose_positions, score_rows=None, skipped=None):
+    count = len(score_rows) if score_rows is not None else len(nose_positions)
+    return LandmarkTrack(
+        segment_index=segment_index,
+        landmarks=stack_landmarks([frame_with_nose(x, y) for x, y in nose_positions]),
+        score_rows=np.array(score_rows if score_rows is not None else range(count), dtype=np.int32),
+        skipped=np.array(skipped if skipped is not None else [False] * count, dtype=bool),
+        frame_indices=np.arange(count, dtype=np.int64) * 30 + segment_index * 1800,
+        timestamps=np.arange(count, dtype=np.float64) + segment_index * 60
+    )
+
+@pytest.fixture
+def video_file(tmp_path):
+    path = tmp_path / "video_original.mp4"
+    path.write_bytes(b"video")
+    return str(path)
+
+def test_save_and_load_round_trip(video_file):
+    tracks = [
+        make_track(0, [(0.5, 0.5), (0.7, 0.5)], score_rows=[0, 0, 1], skipped=[False, True, False]),
+        make_track(2, [(0.5, 0.5)])
+    ]
+    path = save_landmark_store(video_file, tracks, {"segment_length": 60})
+    assert path == landmark_store_path(video_file)
+    assert not [name for name in os.listdir(path.parent) if name.endswith(".tmp")]
+
+    store = load_landmark_store(video_file)
+    assert store.params == {"segment_length": 60}
+    assert [track.segment_index for track in store.tracks] == [0, 2]
+    first = store.tracks[0]
+    assert first.landmarks.pose.dtype == np.float32
+    np.testing.assert_allclose(first.landmarks.pose, tracks[0].landmarks.pose, atol=1e-3)
+    assert np.isnan(first.landmarks.face).all()
+    assert first.score_rows.tolist() == [0, 0, 1]
+    assert first.skipped.tolist() == [False, True, False]
+    assert first.frame_indices.tolist() == [0, 30, 60]
+    assert store.tracks[1].timestamps.tolist() == [120.0]
+
+def test_save_skips_empty_tracks(video_file):
+    assert save_landmark_store(video_file, [], {}) is None
+    empty = make_track(0, [])
+    assert save_landmark_store(video_file, [empty], {}) is None
+    assert not landmark_store_path(video_file).exists()
+
+def test_load_missing_store(video_file):
+    assert load_landmark_store(video_file) is None
+
+def test_load_ignores_store_of_changed_video(video_file):
+    save_landmark_store(video_file, [make_track(0, [(0.5, 0.5)])], {})
+    with open(video_file, "ab") as f:
+        f.write(b"changed")
+    assert load_landmark_store(video_file) is None
+
+def test_load_ignores_corrupt_store(video_file):
+    landmark_store_path(video_file).write_bytes(b"not a zip file")
+    assert load_landmark_store(video_file) is None
+
+def test_save_failure_is_not_fatal(tmp_path):
+    # 원본 파일이 없으면 저장하지 않음
+    assert save_landmark_store(str(tmp_path / "missing.mp4"), [make_track(0, [(0.5, 0.5)])], {}) is None
+
+def test_rescore_selects_problem_frames():
+    # 1~3번 프레임 자세 불량 (코가 화면 오른쪽 끝)
+    track = make_track(0, [(0.5, 0.5), (1.0, 0.9), (1.0, 0.9), (1.0, 0.9), (0.5, 0.5)])
+    store = LandmarkStore(params={}, tracks=[track])
+
+    per_frame = rescore_landmark_store(store, merge_events=False)
+    assert [frame["frame_index"] for frame in per_frame] == [1, 2, 3]
+    assert per_frame[0]["scores"]["posture_score"] == 1.0
+    assert per_frame[0]["source_frame_index"] == 30
+    assert per_frame[0]["event"] is None
+
+    merged = rescore_landmark_store(store, merge_events=True, window=1, hysteresis_margin=0.1, max_gap=1)
+    assert len(merged) == 1
+    assert merged[0]["event"] == {"start": 1.0, "end": 3.0, "frames": 3}
@@ -0,0 +1,78 @@
+# tests/vlm_model/test_utils/test_media_probe.py
+
+import json
+import subprocess
+import pytest
+from unittest import mock
+from vlm_model.utils.media_probe import probe_media, write_media_info, load_media_info, media_info_path
+from vlm_model.exceptions import VideoProcessingError
+
+FFPROBE_OUTPUT = {
+    "packets": [
+        {"pts_time": "0.000000", "flags": "K__"},
+        {"pts_time": "0.066667", "flags": "___"},
+        {"pts_time": "0.033333", "flags": "___"},
+        {"pts_time": "2.000000", "flags": "K__"},
+        {"pts_time": "2.033333", "flags": "___"},
+    ],
+    "streams": [{
+        "codec_name": "h264",
+        "width": 1280, "height": 720,
+        "avg_frame_rate": "30/1", "r_frame_rate": "30/1",
+        "tags": {"rotate": "90"}
+    }],
+    "format": {"duration": "12.500000"}
+}
+
+def mock_ffprobe(mocker, output):
+    return mocker.patch("vlm_model.utils.media_probe.subprocess.run", return_value=mock.Mock(stdout=json.dumps(output).encode()))
+
+def test_probe_media(mocker):
+    mock_run = mock_ffprobe(mocker, FFPROBE_OUTPUT)
+
+    info = probe_media("/fake/video.mp4")
+
+    # 한 번의 ffprobe 실행으로 모든 정보를 가져옴
+    mock_run.assert_called_once()
+    assert info["codec"] == "h264"
+    assert info["duration"] == 12.5
+    assert info["fps"] == 30.0
+    assert info["vfr"] == False
+    assert (info["width"], info["height"], info["rotation"]) == (720, 1280, 90)
+    assert info["frame_count"] == 5
+    assert info["keyframes"] == [0.0, 2.0]
+
+def test_probe_media_vfr_without_container_duration(mocker):
+    output = {
+        "packets": [{"pts_time": str(i / 30), "flags": "K__" if i == 0 else "___"} for i in range(60)],
+        "streams": [{"codec_name": "vp9", "width": 640, "height": 480, "avg_frame_rate": "30/1", "r_frame_rate": "1000/1"}],
+        "format": {}
+    }
+    mock_ffprobe(mocker, output)
+
+    info = probe_media("/fake/video.webm")
+
+    assert info["vfr"] == True
+    assert info["duration"] == pytest.approx(2.0)
+
+def test_probe_media_failure(mocker):
+    mocker.patch("vlm_model.utils.media_probe.subprocess.run", side_effect=subprocess.CalledProcessError(1, "ffprobe"))
+
+    with pytest.raises(VideoProcessingError):
+        probe_media("/fake/video.mp4")
+
+def test_write_and_load_media_info(mocker, tmp_path):
+    video_path = tmp_path / "test_original.mp4"
+    mock_ffprobe(mocker, FFPROBE_OUTPUT)
+
+    info = write_media_info(str(video_path))
+
+    assert media_info_path(str(video_path)) == tmp_path / "test_original.mp4.probe.json"
+    assert load_media_info(str(video_path)) == info
+
+def test_load_media_info_missing_or_corrupt(tmp_path):
+    video_path = tmp_path / "test_original.mp4"
+    assert load_media_info(str(video_path)) is None
+
+    media_info_path(str(video_path)).write_text("{not json")
+    assert load_media_info(str(video_path)) is None
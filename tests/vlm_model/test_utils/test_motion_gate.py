@@ -0,0 +1,32 @@
+# tests/vlm_model/test_utils/test_motion_gate.py
+
+import numpy as np
+from vlm_model.utils.motion_gate import MotionGate
+
+def solid_frame(value):
+    return np.full((64, 64, 3), value, dtype=np.uint8)
+
+def test_motion_gate_disabled():
+    gate = MotionGate(threshold=0)
+    frame = solid_frame(100)
+
+    assert gate.is_unchanged(frame) == False
+    assert gate.is_unchanged(frame) == False
+    assert gate.checked == 0
+
+def test_motion_gate_skips_static_frames():
+    gate = MotionGate(threshold=0.02)
+
+    assert gate.is_unchanged(solid_frame(100)) == False  # 첫 프레임은 항상 분석
+    assert gate.is_unchanged(solid_frame(101)) == True
+    assert gate.is_unchanged(solid_frame(150)) == False
+    assert (gate.checked, gate.skipped) == (3, 1)
+
+def test_motion_gate_compares_against_last_analyzed_frame():
+    gate = MotionGate(threshold=0.02)
+    gate.is_unchanged(solid_frame(100))
+
+    # 프레임마다 조금씩 변해도 마지막 분석 프레임 대비 누적 차이가 기준을 넘으면 다시 분석
+    results = [gate.is_unchanged(solid_frame(100 + step * 2)) for step in range(1, 5)]
+
+    assert results == [True, True, False, True]
@@ -0,0 +1,69 @@
+# tests/vlm_model/test_utils/test_prefetch.py
+
+import time
+import threading
+import pytest
+from vlm_model.utils.prefetch import prefetch
+from vlm_model.exceptions import VideoProcessingError
+
+def test_prefetch_preserves_order():
+    assert list(prefetch(iter(range(100)), depth=4)) == list(range(100))
+
+def test_prefetch_disabled_runs_in_caller_thread():
+    caller = threading.current_thread()
+
+    def source():
+        yield threading.current_thread()
+
+    assert list(prefetch(source(), depth=0)) == [caller]
+
+def test_prefetch_decodes_in_producer_thread():
+    caller = threading.current_thread()
+
+    def source():
+        for _ in range(3):
+            yield threading.current_thread()
+
+    threads = list(prefetch(source(), depth=2))
+    assert all(thread is not caller for thread in threads)
+
+def test_prefetch_bounded_queue():
+    produced = []
+
+    def source():
+        for i in range(100):
+            produced.append(i)
+            yield i
+
+    stream = prefetch(source(), depth=3)
+    assert next(stream) == 0
+    # 생산자가 큐를 채울 시간을 준 뒤에도 큐 크기 + 전달 중인 항목 이상은 읽지 않음
+    time.sleep(0.3)
+    assert len(produced) <= 1 + 3 + 1
+    stream.close()
+
+def test_prefetch_propagates_producer_error():
+    def source():
+        yield 1
+        raise VideoProcessingError("프레임을 추출할 수 없습니다.")
+
+    stream = prefetch(source(), depth=2)
+    assert next(stream) == 1
+    with pytest.raises(VideoProcessingError):
+        next(stream)
+
+def test_prefetch_close_stops_and_closes_source():
+    closed = threading.Event()
+
+    def source():
+        try:
+            for i in range(1000):
+                yield i
+        finally:
+            closed.set()
+
+    stream = prefetch(source(), depth=2)
+    assert next(stream) == 0
+    stream.close()
+
+    assert closed.wait(1.0)
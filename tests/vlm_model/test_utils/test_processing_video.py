@@ -3,6 +3,7 @@ from unittest.mock import patch, MagicMock, mock_open
 from vlm_model.utils.processing_video import process_video
 from vlm_model.exceptions import VideoProcessingError, ImageEncodingError
 from fastapi import HTTPException
+from vlm_model.schemas.feedback import FeedbackDetails, FeedbackSections
 
 @pytest.fixture
 def test_video_path():
@@ -12,17 +13,54 @@ def test_video_path():
 def test_video_id():
     return "test_video_id"
 
+@pytest.fixture(autouse=True)
+def per_frame_problems(mocker):
+    # 기본적으로 기준을 초과한 프레임마다 문제 프레임으로 처리 (구간 묶음은 별도 테스트에서 확인)
+    mocker.patch("vlm_model.utils.segment_analysis.EVENT_DETECTION_ENABLED", False)
+
+def empty_feedback_sections():
+    details = FeedbackDetails(improvement="", recommendations="")
+    return FeedbackSections(gaze_processing=details, facial_expression=details, gestures=details, posture_body=details, movement=details)
+
+def mock_frame_scores(mocker, frame_scores):
+    # detect_landmarks는 빈 랜드마크를 반환하면서 프레임별 점수 dict를 순서대로 쌓아 두고,
+    # score_segment는 세그먼트의 검출 프레임 수만큼 쌓인 점수를 꺼내 점수 배열로 모음
+    import numpy as np
+    from collections import deque
+    from vlm_model.utils.cv_mediapipe_analysis.segment_scoring import SCORE_KEYS
+    from vlm_model.utils.cv_mediapipe_analysis.landmark_arrays import empty_frame_landmarks
+
+    scores_for = frame_scores if callable(frame_scores) else (lambda frame: dict(frame_scores))
+    detected_scores = deque()
+
+    def detect(frame, graphs, cascade):
+        detected_scores.append(scores_for(frame))
+        return empty_frame_landmarks()
+
+    def score(landmarks):
+        frames = [detected_scores.popleft() for _ in range(len(landmarks))]
+        return {key: np.array([frame.get(key, 0.0) for frame in frames]) for key in SCORE_KEYS}
+
+    mocker.patch("vlm_model.utils.processing_video.checkout_graphs", return_value=MagicMock())
+    mocker.patch("vlm_model.utils.segment_analysis.checkout_graphs", return_value=MagicMock())
+    mocker.patch("vlm_model.utils.processing_video.save_landmark_store")
+    mock_detect = mocker.patch("vlm_model.utils.segment_analysis.detect_landmarks", side_effect=detect)
+    mocker.patch("vlm_model.utils.cv_mediapipe_analysis.segment_scoring.score_segment", side_effect=score)
+    return mock_detect
+
+def as_stream(frames, segment_index=0, fps=30):
+    # stream_sampled_frames 형식 (segment_index, frame_idx, timestamp, frame)으로 변환
+    return [(segment_index, i * fps, float(segment_index * 60 + i), frame) for i, frame in enumerate(frames)]
+
 def test_process_video_no_problem_frames(mocker, test_video_path, test_video_id):
     # get_video_duration Mock
     mocker.patch("vlm_model.utils.processing_video.get_video_duration", return_value=120.0)
-    # download_and_sample_video_local Mock: 60프레임
+    # stream_sampled_frames Mock: 60프레임
     frames = [MagicMock() for _ in range(60)]
-    mocker.patch("vlm_model.utils.processing_video.download_and_sample_video_local", return_value=frames)
+    mocker.patch("vlm_model.utils.processing_video.stream_sampled_frames", return_value=as_stream(frames))
 
-    # analyze_frame: 문제 없는 프레임
-    def no_problem_frame(*args,**kwargs):
-        return {"posture_score":0.1,"gaze_score":0.1,"gestures_score":0.1,"sudden_movement_score":0.1}, None, None
-    mocker.patch("vlm_model.utils.processing_video.analyze_frame", side_effect=no_problem_frame)
+    # 프레임별 점수: 문제 없는 프레임
+    mock_frame_scores(mocker, {"posture_score":0.1,"gaze_score":0.1,"gestures_score":0.1,"sudden_movement_score":0.1})
 
     # 문제 프레임 없으므로 analyze_frames 호출 안됨
     # encode_feedback_image, parse_feedback_text 필요 없음
@@ -34,13 +72,13 @@ def test_process_video_no_problem_frames(mocker, test_video_path, test_video_id)
 def test_process_video_problem_frames(mocker, test_video_path, test_video_id):
     mocker.patch("vlm_model.utils.processing_video.get_video_duration", return_value=120.0)
     frames = [MagicMock() for _ in range(60)]
-    mocker.patch("vlm_model.utils.processing_video.download_and_sample_video_local", return_value=frames)
+    mocker.patch("vlm_model.utils.processing_video.stream_sampled_frames", return_value=as_stream(frames))
 
-    def first_frame_problem(frame, ppose, phand):
+    def first_frame_problem(frame):
         if frame is frames[0]:
-            return {"posture_score":0.9,"gaze_score":0.1,"gestures_score":0.1,"sudden_movement_score":0.1},None,None
-        return {"posture_score":0.1,"gaze_score":0.1,"gestures_score":0.1,"sudden_movement_score":0.1},None,None
-    mocker.patch("vlm_model.utils.processing_video.analyze_frame", side_effect=first_frame_problem)
+            return {"posture_score":0.9,"gaze_score":0.1,"gestures_score":0.1,"sudden_movement_score":0.1}
+        return {"posture_score":0.1,"gaze_score":0.1,"gestures_score":0.1,"sudden_movement_score":0.1}
+    mock_frame_scores(mocker, first_frame_problem)
 
     # analyze_frames 호출 (문제 프레임 1개)
     def analyze_frames_side_effect(*args,**kwargs):
@@ -63,7 +101,7 @@ def test_process_video_problem_frames(mocker, test_video_path, test_video_id):
 
 def test_process_video_download_failure(mocker, test_video_path, test_video_id):
     mocker.patch("vlm_model.utils.processing_video.get_video_duration", return_value=120.0)
-    mocker.patch("vlm_model.utils.processing_video.download_and_sample_video_local", side_effect=VideoProcessingError("Download failed"))
+    mocker.patch("vlm_model.utils.processing_video.stream_sampled_frames", side_effect=VideoProcessingError("Download failed"))
 
     with pytest.raises(VideoProcessingError) as excinfo:
         process_video(test_video_path, test_video_id)
@@ -71,7 +109,7 @@ def test_process_video_download_failure(mocker, test_video_path, test_video_id):
 
 def test_process_video_no_frames(mocker, test_video_path, test_video_id):
     mocker.patch("vlm_model.utils.processing_video.get_video_duration", return_value=120.0)
-    mocker.patch("vlm_model.utils.processing_video.download_and_sample_video_local", return_value=[])
+    mocker.patch("vlm_model.utils.processing_video.stream_sampled_frames", return_value=[])
 
     with pytest.raises(VideoProcessingError) as excinfo:
         process_video(test_video_path, test_video_id)
@@ -79,8 +117,8 @@ def test_process_video_no_frames(mocker, test_video_path, test_video_id):
 
 def test_process_video_analyze_frames_failure(mocker, test_video_path, test_video_id):
     mocker.patch("vlm_model.utils.processing_video.get_video_duration", return_value=120.0)
-    mocker.patch("vlm_model.utils.processing_video.download_and_sample_video_local", return_value=[MagicMock()])
-    mocker.patch("vlm_model.utils.processing_video.analyze_frame", return_value=({"posture_score":0.9,"gaze_score":0.1,"gestures_score":0.1,"sudden_movement_score":0.1},None,None))
+    mocker.patch("vlm_model.utils.processing_video.stream_sampled_frames", return_value=as_stream([MagicMock()]))
+    mock_frame_scores(mocker, {"posture_score":0.9,"gaze_score":0.1,"gestures_score":0.1,"sudden_movement_score":0.1})
     mocker.patch("vlm_model.utils.processing_video.analyze_frames", side_effect=Exception("Analyze frames failed"))
 
     with pytest.raises(HTTPException) as excinfo:
@@ -90,8 +128,8 @@ def test_process_video_analyze_frames_failure(mocker, test_video_path, test_vide
 def test_process_video_image_encoding_failure(mocker, test_video_path, test_video_id):
     # 문제 프레임 1개 시나리오
     mocker.patch("vlm_model.utils.processing_video.get_video_duration", return_value=120.0)
-    mocker.patch("vlm_model.utils.processing_video.download_and_sample_video_local", return_value=[MagicMock()])
-    mocker.patch("vlm_model.utils.processing_video.analyze_frame", return_value=({"posture_score":0.9,"gaze_score":0.0,"gestures_score":0.0,"sudden_movement_score":0.0},None,None))
+    mocker.patch("vlm_model.utils.processing_video.stream_sampled_frames", return_value=as_stream([MagicMock()]))
+    mock_frame_scores(mocker, {"posture_score":0.9,"gaze_score":0.0,"gestures_score":0.0,"sudden_movement_score":0.0})
     mocker.patch("vlm_model.utils.processing_video.analyze_frames", return_value=([(MagicMock(),1,1,10.0)], ["feedback1"]))
 
     # encode_feedback_image 실패
@@ -104,8 +142,8 @@ def test_process_video_image_encoding_failure(mocker, test_video_path, test_vide
 
 def test_process_video_feedback_parse_failure(mocker, test_video_path, test_video_id):
     mocker.patch("vlm_model.utils.processing_video.get_video_duration", return_value=120.0)
-    mocker.patch("vlm_model.utils.processing_video.download_and_sample_video_local", return_value=[MagicMock()])
-    mocker.patch("vlm_model.utils.processing_video.analyze_frame", return_value=({"posture_score":0.9,"gaze_score":0.0,"gestures_score":0.0,"sudden_movement_score":0.0},None,None))
+    mocker.patch("vlm_model.utils.processing_video.stream_sampled_frames", return_value=as_stream([MagicMock()]))
+    mock_frame_scores(mocker, {"posture_score":0.9,"gaze_score":0.0,"gestures_score":0.0,"sudden_movement_score":0.0})
     mocker.patch("vlm_model.utils.processing_video.analyze_frames", return_value=([(MagicMock(),1,1,10.0)], ["feedback1"]))
     mocker.patch("vlm_model.utils.processing_video.encode_feedback_image", return_value="encoded_image_string")
 
@@ -119,8 +157,8 @@ def test_process_video_feedback_parse_failure(mocker, test_video_path, test_vide
 
 def test_process_video_image_save_failure(mocker, test_video_path, test_video_id):
     mocker.patch("vlm_model.utils.processing_video.get_video_duration", return_value=120.0)
-    mocker.patch("vlm_model.utils.processing_video.download_and_sample_video_local", return_value=[MagicMock()])
-    mocker.patch("vlm_model.utils.processing_video.analyze_frame", return_value=({"posture_score":0.9,"gaze_score":0.0,"gestures_score":0.0,"sudden_movement_score":0.0},None,None))
+    mocker.patch("vlm_model.utils.processing_video.stream_sampled_frames", return_value=as_stream([MagicMock()]))
+    mock_frame_scores(mocker, {"posture_score":0.9,"gaze_score":0.0,"gestures_score":0.0,"sudden_movement_score":0.0})
     mocker.patch("vlm_model.utils.processing_video.analyze_frames", return_value=([(MagicMock(),1,1,10.0)], ["feedback1"]))
     mocker.patch("vlm_model.utils.processing_video.encode_feedback_image", return_value="encoded_image_string")
     mock_sections = MagicMock()
@@ -142,3 +180,284 @@ def test_process_video_image_save_failure(mocker, test_video_path, test_video_id
         process_video(test_video_path, test_video_id)
     assert excinfo.value.status_code == 500
     assert "이미지 저장 중 오류가 발생했습니다." in str(excinfo.value)
+
+def test_process_video_streams_segments_in_single_pass(mocker, test_video_path, test_video_id):
+    mocker.patch("vlm_model.utils.processing_video.get_video_duration", return_value=120.0)
+    frames = [MagicMock() for _ in range(4)]
+    stream = as_stream(frames[:2], segment_index=0) + as_stream(frames[2:], segment_index=1)
+    mock_stream = mocker.patch("vlm_model.utils.processing_video.stream_sampled_frames", return_value=stream)
+    mock_frame_scores(mocker, {"posture_score":0.9,"gaze_score":0.0,"gestures_score":0.0,"sudden_movement_score":0.0})
+    mock_analyze_frames = mocker.patch("vlm_model.utils.processing_video.analyze_frames", return_value=([], []))
+
+    result = process_video(test_video_path, test_video_id)
+
+    # 비디오는 한 번만 열고, 세그먼트마다 analyze_frames 호출
+    assert result == []
+    mock_stream.assert_called_once()
+    assert mock_analyze_frames.call_count == 2
+    second_call = mock_analyze_frames.call_args_list[1].kwargs
+    assert second_call["segment_idx"] == 1
+    assert second_call["timestamps"] == [60.0, 61.0]
+
+def test_process_video_parallel_segments_merged_in_order(mocker, test_video_path, test_video_id):
+    from concurrent.futures import ThreadPoolExecutor
+
+    mocker.patch("vlm_model.utils.processing_video.get_video_duration", return_value=150.0)
+    mocker.patch("vlm_model.utils.processing_video.SEGMENT_WORKERS", 3)
+    # 테스트에서는 같은 프로세스의 스레드 풀로 대체
+    mocker.patch("vlm_model.utils.processing_video._get_segment_pool", return_value=ThreadPoolExecutor(max_workers=3))
+    mock_stream = mocker.patch("vlm_model.utils.processing_video.stream_sampled_frames")
+
+    segment_frames = {0: [MagicMock(), MagicMock()], 60: [MagicMock()], 120: [MagicMock(), MagicMock()]}
+    mock_download = mocker.patch("vlm_model.utils.segment_analysis.sample_segment_frames", side_effect=lambda path, start_time, duration, frame_interval, target_size: (list(range(len(segment_frames[start_time]))), segment_frames[start_time]))
+    mock_frame_scores(mocker, {"posture_score":0.9,"gaze_score":0.0,"gestures_score":0.0,"sudden_movement_score":0.0})
+    mock_analyze_frames = mocker.patch("vlm_model.utils.processing_video.analyze_frames", return_value=([], []))
+
+    result = process_video(test_video_path, test_video_id)
+
+    # 각 작업자가 세그먼트 시작 지점부터 프레임을 추출하고, 결과는 세그먼트 순서대로 병합
+    assert result == []
+    mock_stream.assert_not_called()
+    assert sorted(call.kwargs["start_time"] for call in mock_download.call_args_list) == [0, 60, 120]
+    calls = [call.kwargs for call in mock_analyze_frames.call_args_list]
+    assert [call["segment_idx"] for call in calls] == [0, 1, 2]
+    assert [call["timestamps"] for call in calls] == [[0.0, 1.0], [60.0], [120.0, 121.0]]
+
+def test_process_video_parallel_skips_empty_segment(mocker, test_video_path, test_video_id):
+    from concurrent.futures import ThreadPoolExecutor
+
+    mocker.patch("vlm_model.utils.processing_video.get_video_duration", return_value=120.0)
+    mocker.patch("vlm_model.utils.processing_video.SEGMENT_WORKERS", 2)
+    mocker.patch("vlm_model.utils.processing_video._get_segment_pool", return_value=ThreadPoolExecutor(max_workers=2))
+
+    def download(path, start_time, duration, frame_interval, target_size):
+        if start_time == 60:
+            raise VideoProcessingError("지정된 프레임 인덱스에 해당하는 프레임을 찾을 수 없습니다.")
+        return [0], [MagicMock()]
+    mocker.patch("vlm_model.utils.segment_analysis.sample_segment_frames", side_effect=download)
+    mock_frame_scores(mocker, {"posture_score":0.9,"gaze_score":0.0,"gestures_score":0.0,"sudden_movement_score":0.0})
+    mock_analyze_frames = mocker.patch("vlm_model.utils.processing_video.analyze_frames", return_value=([], []))
+
+    process_video(test_video_path, test_video_id)
+
+    assert [call.kwargs["segment_idx"] for call in mock_analyze_frames.call_args_list] == [0]
+
+def test_analyze_segment_worker_uses_sampler_frame_indices(mocker, test_video_path):
+    from vlm_model.utils.segment_analysis import analyze_segment_worker
+    from vlm_model.utils.cv_mediapipe_analysis.profiles import ANALYSIS_PROFILES
+
+    mocker.patch("vlm_model.utils.segment_analysis.load_frame_cache", return_value=None)
+    mocker.patch("vlm_model.utils.segment_analysis.checkout_graphs", return_value=MagicMock())
+    # 29.97fps에서 샘플러가 읽은 인덱스 int(60 * 29.97) + i * int(1 * 29.97)
+    frame_indices = [1798, 1827, 1856]
+    mocker.patch("vlm_model.utils.segment_analysis.sample_segment_frames", return_value=(frame_indices, [MagicMock(), MagicMock(), MagicMock()]))
+    mock_analyze = mocker.patch("vlm_model.utils.segment_analysis.analyze_segment_frames", side_effect=lambda segment_index, segment_frames, graphs: list(segment_frames))
+
+    result = analyze_segment_worker(test_video_path, 1, 60, ANALYSIS_PROFILES["balanced"])
+
+    assert [item[0] for item in result] == frame_indices
+    assert [item[1] for item in result] == [60.0, 61.0, 62.0]
+    mock_analyze.assert_called_once()
+
+def test_segment_analysis_does_not_import_vlm_modules():
+    import subprocess
+    import sys
+
+    # 병렬 분석 작업자가 import하는 모듈은 VLM 클라이언트와 응답 캐시를 만들지 않아야 함
+    code = (
+        "import sys, vlm_model.utils.segment_analysis; "
+        "print([name for name in ('openai', 'vlm_model.utils.analysis', 'vlm_model.utils.vlm_cache') if name in sys.modules])"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert result.stdout.strip().splitlines()[-1] == "[]"
+
+def test_process_video_motion_gate_carries_scores_forward(mocker, test_video_path, test_video_id):
+    import numpy as np
+
+    mocker.patch("vlm_model.utils.processing_video.get_video_duration", return_value=60.0)
+    mocker.patch("vlm_model.utils.motion_gate.MOTION_GATE_THRESHOLD", 0.02)
+    static = np.full((32, 32, 3), 100, dtype=np.uint8)
+    moved = np.full((32, 32, 3), 200, dtype=np.uint8)
+    frames = [static, static.copy(), static.copy(), moved]
+    mocker.patch("vlm_model.utils.processing_video.stream_sampled_frames", return_value=as_stream(frames))
+    mock_detect = mock_frame_scores(mocker, {"posture_score":0.9,"gaze_score":0.1,"gestures_score":0.1,"sudden_movement_score":0.9})
+    mock_analyze_frames = mocker.patch("vlm_model.utils.processing_video.analyze_frames", return_value=([], []))
+
+    process_video(test_video_path, test_video_id)
+
+    # 변화 없는 두 프레임은 분석을 생략하고, 직전 점수를 사용하되 급격한 움직임 점수는 0
+    assert mock_detect.call_count == 2
+    mediapipe_results = mock_analyze_frames.call_args.kwargs["mediapipe_results"]
+    assert [result["posture_body"]["score"] for result in mediapipe_results] == [0.9, 0.9, 0.9, 0.9]
+    assert [result["movement"]["score"] for result in mediapipe_results] == [0.9, 0.0, 0.0, 0.9]
+
+def test_process_video_uses_frame_cache(mocker, test_video_path, test_video_id):
+    from vlm_model.utils.frame_cache import FrameCache
+
+    mocker.patch("vlm_model.utils.processing_video.get_video_duration", return_value=60.0)
+    frames = [MagicMock() for _ in range(3)]
+    cache = FrameCache(frames, [0, 0, 0], [0, 30, 60], [0.0, 1.0, 2.0])
+    mocker.patch("vlm_model.utils.processing_video.load_frame_cache", return_value=cache)
+    mock_stream = mocker.patch("vlm_model.utils.processing_video.stream_sampled_frames")
+    mock_frame_scores(mocker, {"posture_score":0.9,"gaze_score":0.0,"gestures_score":0.0,"sudden_movement_score":0.0})
+    mock_analyze_frames = mocker.patch("vlm_model.utils.processing_video.analyze_frames", return_value=([], []))
+
+    process_video(test_video_path, test_video_id)
+
+    # 캐시가 있으면 비디오를 디코딩하지 않음
+    mock_stream.assert_not_called()
+    assert mock_analyze_frames.call_args.kwargs["timestamps"] == [0.0, 1.0, 2.0]
+
+def test_process_video_feedback_image_uses_high_res_frame(mocker, test_video_path, test_video_id):
+    import numpy as np
+
+    mocker.patch("vlm_model.utils.processing_video.get_video_duration", return_value=60.0)
+    frames = [MagicMock() for _ in range(3)]
+    mocker.patch("vlm_model.utils.processing_video.stream_sampled_frames", return_value=as_stream(frames))
+
+    def second_frame_problem(frame):
+        score = 0.9 if frame is frames[1] else 0.1
+        return {"posture_score":score,"gaze_score":0.1,"gestures_score":0.1,"sudden_movement_score":0.1}
+    mock_frame_scores(mocker, second_frame_problem)
+    mocker.patch("vlm_model.utils.processing_video.analyze_frames", return_value=([(frames[1], 1, 1, 1.0)], ["feedback_text"]))
+
+    high_res = np.zeros((1080, 1920, 3), dtype=np.uint8)
+    mock_read = mocker.patch("vlm_model.utils.processing_video.read_video_opencv", return_value=[high_res])
+    mock_encode = mocker.patch("vlm_model.utils.processing_video.encode_feedback_image", return_value="ZW5jb2RlZA==")
+    mocker.patch("vlm_model.utils.processing_video.parse_feedback_text", return_value=empty_feedback_sections())
+    mocker.patch("os.path.exists", return_value=True)
+    mocker.patch("os.path.join", return_value="/fake/feedback_image.jpg")
+    mocker.patch("builtins.open", mock_open())
+
+    process_video(test_video_path, test_video_id)
+
+    # 피드백이 생성된 프레임만 원본 프레임 인덱스로 다시 추출하여 인코딩
+    mock_read.assert_called_once_with(test_video_path, [30])
+    assert mock_encode.call_args.args[0] is high_res
+
+def test_process_video_high_res_fetch_failure_falls_back(mocker, test_video_path, test_video_id):
+    mocker.patch("vlm_model.utils.processing_video.get_video_duration", return_value=60.0)
+    frames = [MagicMock()]
+    mocker.patch("vlm_model.utils.processing_video.stream_sampled_frames", return_value=as_stream(frames))
+    mock_frame_scores(mocker, {"posture_score":0.9,"gaze_score":0.1,"gestures_score":0.1,"sudden_movement_score":0.1})
+    mocker.patch("vlm_model.utils.processing_video.analyze_frames", return_value=([(frames[0], 1, 1, 0.0)], ["feedback_text"]))
+    mocker.patch("vlm_model.utils.processing_video.read_video_opencv", side_effect=VideoProcessingError("비디오에 처리중 오류가 발생했습니다."))
+    mock_encode = mocker.patch("vlm_model.utils.processing_video.encode_feedback_image", return_value="ZW5jb2RlZA==")
+    mocker.patch("vlm_model.utils.processing_video.parse_feedback_text", return_value=empty_feedback_sections())
+    mocker.patch("os.path.exists", return_value=True)
+    mocker.patch("os.path.join", return_value="/fake/feedback_image.jpg")
+    mocker.patch("builtins.open", mock_open())
+
+    result = process_video(test_video_path, test_video_id)
+
+    assert len(result) == 1
+    assert mock_encode.call_args.args[0] is frames[0]
+
+def test_process_video_collapses_consecutive_problem_frames_into_events(mocker, test_video_path, test_video_id):
+    mocker.patch("vlm_model.utils.segment_analysis.EVENT_DETECTION_ENABLED", True)
+    mocker.patch("vlm_model.utils.processing_video.get_video_duration", return_value=60.0)
+    frames = [MagicMock() for _ in range(8)]
+    mocker.patch("vlm_model.utils.processing_video.stream_sampled_frames", return_value=as_stream(frames))
+
+    # 1~4번 프레임 자세 불량 (3번이 가장 심함), 7번 프레임 급격한 움직임
+    posture = [0.1, 0.85, 0.9, 0.95, 0.85, 0.1, 0.1, 0.1]
+    movement = [0.1, 0.1, 0.1, 0.1, 0.1, 0.1, 0.1, 0.9]
+    def scores(frame):
+        idx = frames.index(frame)
+        return {"posture_score": posture[idx], "gaze_score": 0.1, "gestures_score": 0.1, "sudden_movement_score": movement[idx]}
+    mock_frame_scores(mocker, scores)
+    mock_analyze_frames = mocker.patch("vlm_model.utils.processing_video.analyze_frames", return_value=([], []))
+
+    process_video(test_video_path, test_video_id)
+
+    # 구간마다 대표 프레임 하나만 VLM으로 전달
+    kwargs = mock_analyze_frames.call_args.kwargs
+    assert kwargs["timestamps"] == [3.0, 7.0]
+    assert kwargs["mediapipe_results"][0]["event"] == {"start": 1.0, "end": 4.0, "frames": 4}
+    assert "event" not in kwargs["mediapipe_results"][1]
+
+def test_process_video_saves_landmark_store(mocker, test_video_path, test_video_id):
+    mocker.patch("vlm_model.utils.processing_video.get_video_duration", return_value=60.0)
+    frames = [MagicMock() for _ in range(3)]
+    mocker.patch("vlm_model.utils.processing_video.stream_sampled_frames", return_value=as_stream(frames))
+    mock_frame_scores(mocker, {"posture_score":0.1,"gaze_score":0.1,"gestures_score":0.1,"sudden_movement_score":0.1})
+    # 두 번째 프레임은 변화가 없어 검출 생략
+    mocker.patch("vlm_model.utils.segment_analysis.MotionGate.is_unchanged", side_effect=[False, True, False])
+    mock_save = mocker.patch("vlm_model.utils.processing_video.save_landmark_store")
+
+    process_video(test_video_path, test_video_id)
+
+    video_path, tracks, params = mock_save.call_args.args
+    assert video_path == test_video_path
+    assert len(tracks) == 1
+    track = tracks[0]
+    assert len(track.landmarks) == 2
+    assert track.score_rows.tolist() == [0, 0, 1]
+    assert track.skipped.tolist() == [False, True, False]
+    assert track.frame_indices.tolist() == [0, 30, 60]
+    assert track.timestamps.tolist() == [0.0, 1.0, 2.0]
+    assert params["segment_length"] == 60 and params["frame_interval"] == 1
+
+def test_process_video_landmark_store_disabled(mocker, test_video_path, test_video_id):
+    mocker.patch("vlm_model.utils.processing_video.LANDMARK_STORE_ENABLED", False)
+    mocker.patch("vlm_model.utils.processing_video.get_video_duration", return_value=60.0)
+    mocker.patch("vlm_model.utils.processing_video.stream_sampled_frames", return_value=as_stream([MagicMock()]))
+    mock_frame_scores(mocker, {"posture_score":0.1,"gaze_score":0.1,"gestures_score":0.1,"sudden_movement_score":0.1})
+    mock_save = mocker.patch("vlm_model.utils.processing_video.save_landmark_store")
+
+    process_video(test_video_path, test_video_id)
+
+    mock_save.assert_not_called()
+
+def test_process_video_fast_profile(mocker, test_video_path, test_video_id):
+    from vlm_model.utils import processing_video
+
+    mocker.patch("vlm_model.utils.processing_video.get_video_duration", return_value=60.0)
+    mock_stream = mocker.patch("vlm_model.utils.processing_video.stream_sampled_frames", return_value=as_stream([MagicMock()]))
+    mock_frame_scores(mocker, {"posture_score":0.1,"gaze_score":0.1,"gestures_score":0.1,"sudden_movement_score":0.1})
+
+    process_video(test_video_path, test_video_id, profile="fast")
+
+    # fast 프로필: 2초 간격, 192x192 샘플 프레임, fast 그래프 풀
+    args, kwargs = mock_stream.call_args
+    assert args[1:] == (60, 2)
+    assert kwargs["target_size"] == (192, 192)
+    processing_video.checkout_graphs.assert_called_once_with("fast")
+
+def test_process_video_flags_facial_expression(mocker, test_video_path, test_video_id):
+    mocker.patch("vlm_model.utils.processing_video.get_video_duration", return_value=60.0)
+    frames = [MagicMock() for _ in range(3)]
+    mocker.patch("vlm_model.utils.processing_video.stream_sampled_frames", return_value=as_stream(frames))
+
+    # 얼굴 표정 점수만 기준을 초과하는 프레임도 VLM 분석 대상
+    def scores(frame):
+        expression = 0.9 if frame is frames[1] else 0.2
+        return {"posture_score": 0.1, "gaze_score": 0.1, "gestures_score": 0.1, "sudden_movement_score": 0.1, "facial_expression_score": expression}
+    mock_frame_scores(mocker, scores)
+    mock_analyze_frames = mocker.patch("vlm_model.utils.processing_video.analyze_frames", return_value=([], []))
+
+    process_video(test_video_path, test_video_id)
+
+    kwargs = mock_analyze_frames.call_args.kwargs
+    assert kwargs["timestamps"] == [1.0]
+    assert kwargs["mediapipe_results"][0]["facial_expression"] == {"score": 0.9}
+
+def test_process_video_releases_graphs_when_vlm_fails(mocker, test_video_path, test_video_id):
+    from vlm_model.utils.cv_mediapipe_analysis.graph_pool import GraphPool
+    mocker.patch("vlm_model.utils.cv_mediapipe_analysis.graph_pool.GraphBundle", side_effect=lambda **kwargs: MagicMock())
+    pool = GraphPool(1)
+
+    mocker.patch("vlm_model.utils.processing_video.get_video_duration", return_value=120.0)
+    frames = [MagicMock() for _ in range(2)]
+    mocker.patch("vlm_model.utils.processing_video.stream_sampled_frames", return_value=as_stream(frames) + as_stream(frames, segment_index=1))
+    mock_frame_scores(mocker, {"posture_score":0.9,"gaze_score":0.1,"gestures_score":0.1,"sudden_movement_score":0.1})
+    mocker.patch("vlm_model.utils.processing_video.checkout_graphs", side_effect=lambda profile: pool.checkout())
+    mocker.patch("vlm_model.utils.processing_video.analyze_frames", side_effect=HTTPException(status_code=429, detail="rate limited"))
+
+    with pytest.raises(HTTPException) as excinfo:
+        process_video(test_video_path, test_video_id)
+
+    # 예외가 살아 있는 동안에도 그래프 묶음이 풀에 반환되어 있어야 함
+    assert excinfo.value.status_code == 422
+    assert pool._available.acquire(blocking=False)
+    pool._available.release()
@@ -75,3 +75,33 @@ def test_read_video_opencv_unexpected_exception(mocker):
         read_video_opencv(video_path, frame_indices)
 
     assert "비디오에서 프레임 추출 중 서버 오류가 발생했습니다." in str(excinfo.value)
+
+def test_read_video_ffmpeg_backend(mocker):
+    video_path = "/fake/video.mp4"
+    frames = [np.zeros((480, 640, 3), dtype=np.uint8) for _ in range(2)]
+    mocker.patch("vlm_model.utils.read_video.use_ffmpeg_backend", return_value=True)
+    mocker.patch("vlm_model.utils.read_video.probe_video_stream", return_value={"width": 640, "height": 480, "fps": 30.0})
+    mocker.patch("vlm_model.utils.read_video.get_keyframe_index", return_value=[0, 60])
+    mock_read = mocker.patch("vlm_model.utils.read_video.read_frames_ffmpeg", return_value=frames)
+    mock_capture = mocker.patch("cv2.VideoCapture")
+
+    result = read_video_opencv(video_path, [10, 20])
+
+    assert result == frames
+    mock_read.assert_called_once_with(video_path, [10, 20], (640, 480), 30.0)
+    mock_capture.assert_not_called()
+
+def test_read_video_opencv_uses_keyframe_seek(mocker):
+    video_path = "/fake/video.mp4"
+    mock_cap = mocker.Mock()
+    mock_cap.isOpened.return_value = True
+    mocker.patch("cv2.VideoCapture", return_value=mock_cap)
+    mocker.patch("vlm_model.utils.read_video.get_keyframe_index", return_value=[0, 30, 60])
+    seek_frames = [np.zeros((480, 640, 3), dtype=np.uint8)]
+    mock_seek = mocker.patch("vlm_model.utils.read_video.read_frames_with_seek", return_value=seek_frames)
+
+    result = read_video_opencv(video_path, [65])
+
+    assert result == seek_frames
+    mock_seek.assert_called_once_with(mock_cap, [65], [0, 30, 60])
+    mock_cap.read.assert_not_called()
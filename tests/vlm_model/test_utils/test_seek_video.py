@@ -0,0 +1,109 @@
+# tests/vlm_model/test_utils/test_seek_video.py
+
+import numpy as np
+import cv2
+from vlm_model.utils.seek_video import get_keyframe_index, keyframe_before, FrameSeeker, read_frames_with_seek
+from vlm_model.exceptions import VideoProcessingError
+
+def make_seek_cap(mocker, total_frames):
+    """
+    set/grab/read 호출에 따라 현재 프레임 위치를 추적하는 VideoCapture 모킹 객체를 만듭니다.
+    read()는 프레임 인덱스로 채워진 프레임을 반환합니다.
+    """
+    state = {"position": 0, "decoded": 0}
+    cap = mocker.Mock()
+
+    def set_position(prop, value):
+        assert prop == cv2.CAP_PROP_POS_FRAMES
+        state["position"] = int(value)
+        return True
+
+    def grab():
+        if state["position"] >= total_frames:
+            return False
+        state["position"] += 1
+        state["decoded"] += 1
+        return True
+
+    def read():
+        if state["position"] >= total_frames:
+            return False, None
+        frame = np.full((4, 4, 3), state["position"] % 256, dtype=np.uint8)
+        state["position"] += 1
+        state["decoded"] += 1
+        return True, frame
+
+    cap.set.side_effect = set_position
+    cap.grab.side_effect = grab
+    cap.read.side_effect = read
+    return cap, state
+
+def test_get_keyframe_index_from_media_info(mocker):
+    media_info = {"fps": 25.0, "vfr": False, "keyframes": [0.04, 2.04, 4.04]}
+    mocker.patch("vlm_model.utils.seek_video.load_media_info", return_value=media_info)
+
+    assert get_keyframe_index("/fake/video.mp4") == [0, 50, 100]
+
+def test_get_keyframe_index_vfr_falls_back(mocker):
+    media_info = {"fps": 30.0, "vfr": True, "keyframes": [0.0, 2.0]}
+    mocker.patch("vlm_model.utils.seek_video.load_media_info", return_value=media_info)
+
+    assert get_keyframe_index("/fake/video.webm") == [0]
+
+def test_get_keyframe_index_probes_once_when_missing(mocker):
+    mocker.patch("vlm_model.utils.seek_video.load_media_info", return_value=None)
+    mock_write = mocker.patch("vlm_model.utils.seek_video.write_media_info", return_value={"fps": 10.0, "vfr": False, "keyframes": [0.0, 5.0]})
+
+    assert get_keyframe_index("/fake/video.mp4") == [0, 50]
+    mock_write.assert_called_once_with("/fake/video.mp4")
+
+def test_get_keyframe_index_probe_failure(mocker):
+    mocker.patch("vlm_model.utils.seek_video.load_media_info", return_value=None)
+    mocker.patch("vlm_model.utils.seek_video.write_media_info", side_effect=VideoProcessingError("ffprobe 실행 파일을 찾을 수 없습니다."))
+
+    assert get_keyframe_index("/fake/video.mp4") == [0]
+
+def test_keyframe_before():
+    keyframes = [0, 30, 60]
+    assert keyframe_before(keyframes, 0) == 0
+    assert keyframe_before(keyframes, 29) == 0
+    assert keyframe_before(keyframes, 30) == 30
+    assert keyframe_before(keyframes, 100) == 60
+
+def test_frame_seeker_decodes_one_gop(mocker):
+    cap, state = make_seek_cap(mocker, total_frames=1000)
+    seeker = FrameSeeker(cap, list(range(0, 1000, 30)))
+
+    frame = seeker.read(905)
+
+    # 900번 키프레임으로 이동한 뒤 6프레임만 디코딩
+    cap.set.assert_called_once_with(cv2.CAP_PROP_POS_FRAMES, 900)
+    assert frame[0, 0, 0] == 905 % 256
+    assert state["decoded"] == 6
+
+def test_frame_seeker_reads_forward_within_gop_without_seeking(mocker):
+    cap, _ = make_seek_cap(mocker, total_frames=100)
+    seeker = FrameSeeker(cap, [0, 30, 60])
+
+    seeker.read(32)
+    seeker.read(40)
+
+    assert cap.set.call_count == 1
+    assert seeker.seek_count == 1
+
+def test_frame_seeker_seeks_backwards(mocker):
+    cap, _ = make_seek_cap(mocker, total_frames=100)
+    seeker = FrameSeeker(cap, [0, 30, 60])
+
+    seeker.read(70)
+    frame = seeker.read(35)
+
+    cap.set.assert_called_with(cv2.CAP_PROP_POS_FRAMES, 30)
+    assert frame[0, 0, 0] == 35
+
+def test_read_frames_with_seek_sorted_and_stops_at_end(mocker):
+    cap, _ = make_seek_cap(mocker, total_frames=100)
+
+    frames = read_frames_with_seek(cap, [90, 10, 10, 150], [0, 30, 60])
+
+    assert [frame[0, 0, 0] for frame in frames] == [10, 90]
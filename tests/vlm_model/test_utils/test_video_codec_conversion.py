@@ -5,7 +5,8 @@ import subprocess
 import numpy as np
 import pytest
 from unittest import mock
-from vlm_model.utils.video_codec_conversion import convert_to_vp9_if_needed, convert_to_vp9, is_vp9, get_video_codec_info
+from concurrent.futures import Future
+from vlm_model.utils.video_codec_conversion import convert_to_vp9_if_needed, convert_to_vp9, is_vp9, get_video_codec_info, request_vp9_derivative, _transcode_to_vp9
 from vlm_model.exceptions import VideoImportingError
 
 def test_convert_to_vp9_if_needed_already_vp9(mocker):
@@ -132,3 +133,93 @@ def test_get_video_codec_info_failure(mocker):
         get_video_codec_info(video_path)
 
     assert "코덱 정보 확인 실패" in str(excinfo.value)
+
+def test_request_vp9_derivative_ready(mocker):
+    output_path = "/fake/output_vp9.webm"
+    mocker.patch("vlm_model.utils.video_codec_conversion.os.path.exists", return_value=True)
+    mock_submit = mocker.patch("vlm_model.utils.video_codec_conversion._transcode_executor.submit")
+
+    assert request_vp9_derivative("/fake/input.mp4", output_path) == "ready"
+    mock_submit.assert_not_called()
+
+def test_request_vp9_derivative_starts_background_job_once(mocker):
+    output_path = "/fake/pending_vp9.webm"
+    mocker.patch("vlm_model.utils.video_codec_conversion.os.path.exists", return_value=False)
+    mocker.patch.dict("vlm_model.utils.video_codec_conversion._transcode_jobs", clear=True)
+    mocker.patch("vlm_model.utils.video_codec_conversion.is_vp9", return_value=False)
+    pending_job = Future()
+    mock_submit = mocker.patch("vlm_model.utils.video_codec_conversion._transcode_executor.submit", return_value=pending_job)
+
+    # 첫 요청은 변환을 시작하고, 진행 중에는 같은 작업을 재사용
+    assert request_vp9_derivative("/fake/input.mp4", output_path) == "pending"
+    assert request_vp9_derivative("/fake/input.mp4", output_path) == "pending"
+    mock_submit.assert_called_once_with(_transcode_to_vp9, "/fake/input.mp4", output_path)
+
+def test_request_vp9_derivative_original_is_vp9(mocker):
+    output_path = "/fake/original_vp9.webm"
+    mocker.patch("vlm_model.utils.video_codec_conversion.os.path.exists", return_value=False)
+    done_job = Future()
+    done_job.set_result(False)
+    mocker.patch.dict("vlm_model.utils.video_codec_conversion._transcode_jobs", {output_path: done_job}, clear=True)
+
+    assert request_vp9_derivative("/fake/input.webm", output_path) == "original"
+
+def test_request_vp9_derivative_vp9_input_stays_original(mocker):
+    output_path = "/fake/vp9_input_vp9.webm"
+    mocker.patch("vlm_model.utils.video_codec_conversion.os.path.exists", return_value=False)
+    mocker.patch.dict("vlm_model.utils.video_codec_conversion._transcode_jobs", clear=True)
+    mocker.patch("vlm_model.utils.video_codec_conversion.load_media_info", return_value={"codec": "vp9"})
+    mock_submit = mocker.patch("vlm_model.utils.video_codec_conversion._transcode_executor.submit")
+
+    # 원본이 VP9이면 몇 번을 조회해도 작업을 만들지 않고 같은 상태를 반환
+    assert [request_vp9_derivative("/fake/input.webm", output_path) for _ in range(3)] == ["original"] * 3
+    mock_submit.assert_not_called()
+
+def test_request_vp9_derivative_keeps_finished_job(mocker):
+    output_path = "/fake/finished_vp9.webm"
+    mocker.patch("vlm_model.utils.video_codec_conversion.os.path.exists", return_value=False)
+    done_job = Future()
+    done_job.set_result(False)
+    mocker.patch.dict("vlm_model.utils.video_codec_conversion._transcode_jobs", {output_path: done_job}, clear=True)
+    mock_is_vp9 = mocker.patch("vlm_model.utils.video_codec_conversion.is_vp9")
+    mock_submit = mocker.patch("vlm_model.utils.video_codec_conversion._transcode_executor.submit")
+
+    assert [request_vp9_derivative("/fake/input.webm", output_path) for _ in range(3)] == ["original"] * 3
+    mock_is_vp9.assert_not_called()
+    mock_submit.assert_not_called()
+
+def test_request_vp9_derivative_failed_allows_retry(mocker):
+    output_path = "/fake/failed_vp9.webm"
+    mocker.patch("vlm_model.utils.video_codec_conversion.os.path.exists", return_value=False)
+    failed_job = Future()
+    failed_job.set_exception(VideoImportingError("비디오 변환 중 오류가 발생했습니다."))
+    mocker.patch.dict("vlm_model.utils.video_codec_conversion._transcode_jobs", {output_path: failed_job}, clear=True)
+    mocker.patch("vlm_model.utils.video_codec_conversion.is_vp9", return_value=False)
+    mock_submit = mocker.patch("vlm_model.utils.video_codec_conversion._transcode_executor.submit", return_value=Future())
+
+    assert request_vp9_derivative("/fake/input.mp4", output_path) == "failed"
+    # 실패한 작업은 제거되므로 다음 요청에서 변환을 재시도
+    assert request_vp9_derivative("/fake/input.mp4", output_path) == "pending"
+    mock_submit.assert_called_once()
+
+def test_transcode_to_vp9_moves_partial_file(mocker, tmp_path):
+    output_path = tmp_path / "video_vp9.webm"
+    partial_path = tmp_path / "video_vp9.part.webm"
+
+    def fake_convert(input_path, output_path):
+        with open(output_path, "wb") as f:
+            f.write(b"vp9")
+        return True
+
+    mocker.patch("vlm_model.utils.video_codec_conversion.convert_to_vp9_if_needed", side_effect=fake_convert)
+
+    assert _transcode_to_vp9("/fake/input.mp4", str(output_path)) == True
+    assert output_path.read_bytes() == b"vp9"
+    assert not partial_path.exists()
+
+def test_is_vp9_uses_media_info(mocker):
+    mocker.patch("vlm_model.utils.video_codec_conversion.load_media_info", return_value={"codec": "vp9"})
+    mock_codec_info = mocker.patch("vlm_model.utils.video_codec_conversion.get_video_codec_info")
+
+    assert is_vp9("/fake/video.webm") == True
+    mock_codec_info.assert_not_called()
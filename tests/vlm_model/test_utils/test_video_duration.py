@@ -115,3 +115,13 @@ def test_get_video_duration_exception(mocker):
     cv2.VideoCapture.assert_called_once_with(video_path)
     mock_cap.isOpened.assert_called_once()
     assert "비디오 길이를 가져오는 중 서버 오류가 발생했습니다." in str(excinfo.value)
+
+def test_get_video_duration_uses_media_info(mocker):
+    """
+    업로드 시 저장된 메타데이터가 있으면 비디오 파일을 열지 않고 길이를 반환하는지 확인합니다.
+    """
+    mocker.patch("vlm_model.utils.video_duration.load_media_info", return_value={"duration": 42.5})
+    mock_capture = mocker.patch("cv2.VideoCapture")
+
+    assert get_video_duration("/fake/path/video.mp4") == 42.5
+    mock_capture.assert_not_called()
@@ -0,0 +1,71 @@
+# tests/vlm_model/test_utils/test_vlm_cache.py
+
+import numpy as np
+
+from vlm_model.utils.vlm_cache import VLMResponseCache, cache_key, perceptual_hash, score_bucket
+
+def _gradient_frame(offset=0):
+    row = np.linspace(0, 200, 64, dtype=np.float32)
+    frame = np.tile(row, (48, 1)) + offset
+    return np.repeat(frame[:, :, None], 3, axis=2).clip(0, 255).astype(np.uint8)
+
+def test_perceptual_hash_ignores_small_brightness_change():
+    assert perceptual_hash(_gradient_frame()) == perceptual_hash(_gradient_frame(offset=3))
+    assert perceptual_hash(_gradient_frame()) != perceptual_hash(_gradient_frame()[:, ::-1])
+
+def test_score_bucket_rounds_scores():
+    first = {"posture_body": {"score": 0.81}, "gestures": {"score": 0.12}}
+    second = {"gestures": {"score": 0.09}, "posture_body": {"score": 0.79}}
+    assert score_bucket(first) == score_bucket(second) == "gestures=0.10,posture_body=0.80"
+
+def test_cache_key_changes_with_model_and_prompt():
+    frame = _gradient_frame()
+    scores = {"posture_body": {"score": 0.9}}
+    assert cache_key("gpt-4o-mini", "p1", frame, scores) != cache_key("gpt-4o", "p1", frame, scores)
+    assert cache_key("gpt-4o-mini", "p1", frame, scores) != cache_key("gpt-4o-mini", "p2", frame, scores)
+
+def test_memory_cache_lru_eviction():
+    cache = VLMResponseCache(max_entries=2)
+    cache.put("a", "A")
+    cache.put("b", "B")
+    assert cache.get("a") == "A"
+    cache.put("c", "C")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "A"
+    assert cache.get("c") == "C"
+    stats = cache.stats()
+    assert stats["memory_hits"] == 3
+    assert stats["misses"] == 1
+    assert stats["evictions"] == 1
+    assert stats["memory_entries"] == 2
+
+def test_db_cache_survives_new_instance(tmp_path):
+    db_path = tmp_path / "vlm_cache.sqlite3"
+    VLMResponseCache(db_path=str(db_path)).put("a", "A")
+
+    cache = VLMResponseCache(db_path=str(db_path))
+    assert cache.get("a") == "A"
+    assert cache.get("a") == "A"
+    stats = cache.stats()
+    assert stats["db_hits"] == 1
+    assert stats["memory_hits"] == 1
+    assert stats["db_entries"] == 1
+
+def test_db_cache_ttl_and_size_eviction(tmp_path, mocker):
+    now = [1000.0]
+    mocker.patch("vlm_model.utils.vlm_cache.time.time", side_effect=lambda: now[0])
+    cache = VLMResponseCache(max_entries=1, db_path=str(tmp_path / "vlm_cache.sqlite3"), ttl=100, max_db_entries=2)
+
+    cache.put("a", "A")
+    now[0] += 10
+    cache.put("b", "B")
+    now[0] += 10
+    cache.put("c", "C")
+    assert cache.stats()["db_entries"] == 2
+    assert cache.get("a") is None
+
+    now[0] += 200
+    assert cache.get("c") is None
+    cache.put("d", "D")
+    assert cache.stats()["db_entries"] == 1
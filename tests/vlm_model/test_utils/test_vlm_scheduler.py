@@ -0,0 +1,94 @@
+# tests/vlm_model/test_utils/test_vlm_scheduler.py
+
+import asyncio
+import time
+
+import httpx
+import pytest
+from openai import BadRequestError, RateLimitError
+
+from vlm_model.utils.vlm_scheduler import TokenBucket, VLMScheduler, retry_after_seconds
+
+def _error_response(status_code, headers=None):
+    return httpx.Response(status_code, headers=headers or {}, request=httpx.Request("POST", "https://api.openai.com"))
+
+def test_token_bucket_waits_for_refill():
+    bucket = TokenBucket(60, now=0.0)  # 초당 1개
+    bucket.consume(60, now=0.0)
+
+    assert bucket.time_until(1, now=0.0) == pytest.approx(1.0)
+    assert bucket.time_until(1, now=0.5) == pytest.approx(0.5)
+    assert bucket.time_until(1, now=1.0) == 0.0
+
+    # 예상보다 적게 쓴 토큰은 돌려받음
+    bucket.consume(1, now=1.0)
+    bucket.refund(1)
+    assert bucket.time_until(1, now=1.0) == 0.0
+
+def test_token_bucket_unlimited():
+    bucket = TokenBucket(0)
+    bucket.consume(10 ** 9, now=0.0)
+    assert bucket.time_until(10 ** 9, now=0.0) == 0.0
+
+def test_retry_after_seconds_reads_headers():
+    assert retry_after_seconds(RateLimitError("r", response=_error_response(429, {"retry-after-ms": "250"}), body=None)) == 0.25
+    assert retry_after_seconds(RateLimitError("r", response=_error_response(429, {"retry-after": "2"}), body=None)) == 2.0
+    assert retry_after_seconds(RateLimitError("r", response=_error_response(429), body=None)) is None
+    assert retry_after_seconds(ValueError("no response")) is None
+
+def test_scheduler_alternates_between_flows():
+    scheduler = VLMScheduler(rpm_limit=1200)  # 초당 20개
+
+    async def scenario():
+        scheduler.requests.consume(scheduler.requests.capacity, time.monotonic())
+        order = []
+
+        async def request(flow, name):
+            await scheduler.acquire(flow, 1)
+            order.append(name)
+
+        await asyncio.gather(
+            request("video-a", "a1"), request("video-a", "a2"), request("video-a", "a3"),
+            request("video-b", "b1")
+        )
+        return order
+
+    assert asyncio.run(scenario()) == ["a1", "b1", "a2", "a3"]
+
+def test_scheduler_retries_with_retry_after():
+    scheduler = VLMScheduler(max_retries=3)
+    attempts = []
+
+    async def call():
+        attempts.append(time.monotonic())
+        if len(attempts) < 3:
+            raise RateLimitError("rate limited", response=_error_response(429, {"retry-after-ms": "20"}), body=None)
+        return "ok"
+
+    assert asyncio.run(scheduler.run("video-a", 1, call)) == "ok"
+    assert len(attempts) == 3
+    assert attempts[1] - attempts[0] >= 0.015
+
+def test_scheduler_gives_up_after_max_retries(mocker):
+    scheduler = VLMScheduler(max_retries=2, backoff_base=0.001)
+    call = mocker.AsyncMock(side_effect=RateLimitError("rate limited", response=_error_response(429), body=None))
+
+    with pytest.raises(RateLimitError):
+        asyncio.run(scheduler.run("video-a", 1, call))
+    assert call.call_count == 3
+
+def test_scheduler_does_not_retry_bad_request(mocker):
+    scheduler = VLMScheduler(max_retries=3)
+    call = mocker.AsyncMock(side_effect=BadRequestError("bad request", response=_error_response(400), body=None))
+
+    with pytest.raises(BadRequestError):
+        asyncio.run(scheduler.run("video-a", 1, call))
+    assert call.call_count == 1
+
+def test_scheduler_does_not_retry_insufficient_quota(mocker):
+    scheduler = VLMScheduler(max_retries=3)
+    call = mocker.AsyncMock(side_effect=RateLimitError("quota", response=_error_response(429), body={"code": "insufficient_quota"}))
+
+    with pytest.raises(RateLimitError):
+        asyncio.run(scheduler.run("video-a", 1, call))
+    assert call.call_count == 1
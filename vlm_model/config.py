@@ -49,6 +49,94 @@ FONT_DIR = BASE_DIR / os.getenv("FONT_DIR", "fonts")
 FONT_PATH = FONT_DIR / os.getenv("FONT_FILE", "NotoSans-VariableFont_wdth,wght.ttf")
 FONT_SIZE = int(os.getenv("FONT_SIZE", 15))  # 기본 폰트 크기 설정
 
+# 비디오 디코더 백엔드 설정 ("opencv" 또는 "ffmpeg", ffmpeg 사용 불가 시 opencv로 대체)
+VIDEO_DECODER_BACKEND = os.getenv("VIDEO_DECODER_BACKEND", "opencv").lower()
+
+# 백그라운드 VP9 변환 작업자 수 (VP9 파일은 요청이 있을 때만 생성)
+VP9_TRANSCODE_WORKERS = int(os.getenv("VP9_TRANSCODE_WORKERS", 1))
+
+# 세그먼트 병렬 분석 프로세스 수 (1이면 한 프로세스에서 순차 분석)
+# 작업자마다 세그먼트를 따로 탐색/디코딩하고 Mediapipe 그래프를 만들므로, 세그먼트가 많은 긴 비디오(수 분 이상)에서만 이득이 있음
+SEGMENT_WORKERS = int(os.getenv("SEGMENT_WORKERS", 1))
+
+# 변화 없는 프레임의 Mediapipe 분석 생략 기준 (축소 흑백 이미지의 평균 픽셀 차이 0~1, 0이면 비활성화)
+MOTION_GATE_THRESHOLD = float(os.getenv("MOTION_GATE_THRESHOLD", 0.0))
+
+# 디코딩 스레드가 분석보다 앞서 준비해 둘 최대 프레임 수 (0이면 같은 스레드에서 디코딩)
+PREFETCH_QUEUE_DEPTH = int(os.getenv("PREFETCH_QUEUE_DEPTH", 16))
+
+# 샘플링된 저해상도 프레임을 업로드 파일 옆에 캐시하여 재분석 시 디코딩 생략
+FRAME_CACHE_ENABLED = os.getenv("FRAME_CACHE_ENABLED", "true").lower() == "true"
+
+# Mediapipe 분석용 샘플 프레임 크기 (정사각형 한 변의 픽셀 수, 피드백 이미지는 원본 해상도에서 추출)
+SAMPLE_FRAME_SIZE = int(os.getenv("SAMPLE_FRAME_SIZE", 256))
+
+# Mediapipe 랜드마크 검출 엔진 ("separate": Pose/FaceMesh/Hands 개별 그래프, "holistic": Holistic 단일 그래프)
+MEDIAPIPE_ENGINE = os.getenv("MEDIAPIPE_ENGINE", "separate").lower()
+
+# 포즈 랜드마크로 얼굴/손 영역을 잘라 확대한 뒤 FaceMesh/Hands에 입력 (separate 엔진에서만 사용)
+MEDIAPIPE_ROI_CROP = os.getenv("MEDIAPIPE_ROI_CROP", "false").lower() == "true"
+
+# 포즈 결과와 직전 프레임 검출 결과로 FaceMesh/Hands 실행 여부를 프레임마다 결정 (separate 엔진에서만 사용)
+MEDIAPIPE_CASCADE = os.getenv("MEDIAPIPE_CASCADE", "false").lower() == "true"
+
+# 연속된 문제 프레임을 구간으로 묶어 구간마다 대표 프레임 하나만 VLM으로 분석
+EVENT_DETECTION_ENABLED = os.getenv("EVENT_DETECTION_ENABLED", "true").lower() == "true"
+EVENT_SMOOTHING_WINDOW = int(os.getenv("EVENT_SMOOTHING_WINDOW", 1))  # 점수 이동 평균 프레임 수 (1이면 평활화하지 않음)
+EVENT_HYSTERESIS = float(os.getenv("EVENT_HYSTERESIS", 0.1))  # 구간 종료 기준을 시작 기준보다 낮출 값
+EVENT_MAX_GAP = int(os.getenv("EVENT_MAX_GAP", 1))  # 하나로 합칠 구간 사이의 최대 프레임 수
+
+# 동시에 분석할 수 있는 비디오 수 (비디오마다 독립된 Mediapipe 그래프 묶음을 사용, 프로세스별)
+MEDIAPIPE_GRAPH_POOL_SIZE = int(os.getenv("MEDIAPIPE_GRAPH_POOL_SIZE", 2))
+
+# 분석 프로필 이름 (cv_mediapipe_analysis/profiles.py의 ANALYSIS_PROFILES와 같아야 함)
+ANALYSIS_PROFILE_NAMES = ("fast", "balanced", "accurate")
+
+def _analysis_profile_name(value: str, setting: str) -> str:
+    # 대소문자를 구분하지 않고, 알 수 없는 프로필이면 balanced 사용
+    name = value.strip().lower()
+    if name not in ANALYSIS_PROFILE_NAMES:
+        logger.info(f"{setting}의 알 수 없는 분석 프로필({value})이므로 balanced를 사용합니다. (가능한 값: {', '.join(ANALYSIS_PROFILE_NAMES)})")
+        return "balanced"
+    return name
+
+# 기본 분석 프로필 (fast, balanced, accurate), /video-send-feedback/?profile=로 요청마다 선택 가능
+ANALYSIS_PROFILE = _analysis_profile_name(os.getenv("ANALYSIS_PROFILE", "balanced"), "ANALYSIS_PROFILE")
+
+# 앱 시작 시 그래프 풀을 미리 만들고 더미 프레임으로 예열 (false이면 첫 요청에서 생성, /ready는 바로 준비 완료)
+MEDIAPIPE_WARMUP = os.getenv("MEDIAPIPE_WARMUP", "true").lower() == "true"
+MEDIAPIPE_WARMUP_PROFILES = list(dict.fromkeys(
+    _analysis_profile_name(name, "MEDIAPIPE_WARMUP_PROFILES")
+    for name in os.getenv("MEDIAPIPE_WARMUP_PROFILES", ANALYSIS_PROFILE).split(",") if name.strip()
+))  # 예열할 프로필 목록 (중복 제거)
+
+# 분석한 랜드마크를 업로드 파일 옆에 저장하여 Mediapipe 추론 없이 점수를 다시 계산할 수 있도록 함
+LANDMARK_STORE_ENABLED = os.getenv("LANDMARK_STORE_ENABLED", "true").lower() == "true"
+
+# 동시에 보낼 수 있는 VLM 요청 수 (프로세스 전체, 1이면 프레임마다 순차 요청)
+VLM_CONCURRENCY = int(os.getenv("VLM_CONCURRENCY", 4))
+
+# VLM에 보내는 이미지의 해석 수준 ("low", "high", "auto"), low는 이미지 크기와 관계없이 고정된 적은 토큰 사용
+VLM_IMAGE_DETAIL = os.getenv("VLM_IMAGE_DETAIL", "low").lower()
+
+# 한 번의 VLM 요청에 묶어 보낼 세그먼트 내 문제 프레임 수 (1이면 프레임마다 요청, 응답은 프레임별 피드백의 JSON 배열)
+VLM_BATCH_SIZE = int(os.getenv("VLM_BATCH_SIZE", 1))
+
+# 프레임 perceptual hash, 구간화한 Mediapipe 점수, 모델, 프롬프트 해시를 키로 VLM 피드백을 캐시 (같은 비디오 재분석 시 API 호출 생략)
+VLM_CACHE_ENABLED = os.getenv("VLM_CACHE_ENABLED", "true").lower() == "true"
+VLM_CACHE_MAX_ENTRIES = int(os.getenv("VLM_CACHE_MAX_ENTRIES", 1024))  # 메모리 LRU 최대 항목 수
+VLM_CACHE_DB_PATH = str(BASE_DIR / os.getenv("VLM_CACHE_DB_PATH")) if os.getenv("VLM_CACHE_DB_PATH") else ""  # SQLite 캐시 파일 (비어 있으면 메모리만 사용)
+VLM_CACHE_DB_MAX_ENTRIES = int(os.getenv("VLM_CACHE_DB_MAX_ENTRIES", 10000))  # SQLite 최대 항목 수 (초과 시 오래 사용하지 않은 항목부터 삭제)
+VLM_CACHE_TTL = float(os.getenv("VLM_CACHE_TTL", 7 * 24 * 3600))  # 캐시 항목 유효 시간(초)
+VLM_CACHE_SCORE_STEP = float(os.getenv("VLM_CACHE_SCORE_STEP", 0.1))  # 캐시 키에 쓸 Mediapipe 점수 구간 크기
+
+# 모든 VLM 호출이 거치는 스케줄러 설정 (같은 API 키를 쓰는 요청의 한도 조율, 0이면 해당 한도 없음)
+VLM_RPM_LIMIT = float(os.getenv("VLM_RPM_LIMIT", 500))  # 분당 요청 수 한도
+VLM_TPM_LIMIT = float(os.getenv("VLM_TPM_LIMIT", 200000))  # 분당 토큰 수 한도 (입력 추정치 + max_tokens로 계산)
+VLM_MAX_RETRIES = int(os.getenv("VLM_MAX_RETRIES", 5))  # 한도 초과, 타임아웃, 연결/서버 오류 시 재시도 횟수
+VLM_BACKOFF_BASE = float(os.getenv("VLM_BACKOFF_BASE", 1.0))  # 지수 백오프 기본 대기 시간(초), retry-after 헤더가 있으면 헤더 값 사용
+VLM_BACKOFF_MAX = float(os.getenv("VLM_BACKOFF_MAX", 60.0))  # 백오프 최대 대기 시간(초)
+
 # 디렉토리 존재 여부 확인 및 생성
 try:
     for directory in [UPLOAD_DIR, FEEDBACK_DIR, LOGS_DIR, FONT_DIR]:
@@ -6,6 +6,9 @@ from pathlib import Path
 import logging
 from vlm_model.schemas.feedback import DeleteResponse
 from vlm_model.config import FEEDBACK_DIR, UPLOAD_DIR
+from vlm_model.utils.media_probe import MEDIA_INFO_SUFFIX
+from vlm_model.utils.frame_cache import FRAME_CACHE_SUFFIX, FRAME_CACHE_INDEX_SUFFIX
+from vlm_model.utils.landmark_store import LANDMARK_STORE_SUFFIX
 
 router = APIRouter()
 
@@ -14,6 +17,9 @@ logger = logging.getLogger(__name__)
 # 허용된 비디오 확장자 목록 (upload_video.py와 동일하게 유지)
 ALLOWED_EXTENSIONS = {"webm", "mp4", "mov", "avi", "mkv"}
 
+# 업로드 비디오와 함께 저장되는 부가 파일 접미사 (메타데이터, 프레임 캐시, 랜드마크 기록, 기록 중 중단된 임시 파일)
+SIDECAR_SUFFIXES = (MEDIA_INFO_SUFFIX, FRAME_CACHE_SUFFIX, FRAME_CACHE_INDEX_SUFFIX, LANDMARK_STORE_SUFFIX, ".tmp")
+
 @router.delete("/delete_files/{video_id}", response_class=JSONResponse)
 async def delete_files(video_id: str):
     """
@@ -23,6 +29,9 @@ async def delete_files(video_id: str):
         # UPLOAD_DIR에서 video_id를 포함하고 허용된 확장자를 가진 모든 파일 찾기
         input_files = [file for ext in ALLOWED_EXTENSIONS for file in UPLOAD_DIR.glob(f"*{video_id}*.{ext}")]
 
+        # 업로드 비디오의 메타데이터, 프레임 캐시 등 부가 파일
+        sidecar_files = [file for suffix in SIDECAR_SUFFIXES for file in UPLOAD_DIR.glob(f"*{video_id}*{suffix}")]
+
         # FEEDBACK_DIR에서 video_id를 포함한 .jpg 파일 찾기
         output_files = list(FEEDBACK_DIR.glob(f"*{video_id}*.jpg"))
 
@@ -34,11 +43,11 @@ async def delete_files(video_id: str):
             raise HTTPException(status_code=404, detail="해당 video_id와 관련된 파일을 찾을 수 없습니다.")
 
         # 삭제할 파일 목록 결합
-        files_to_delete = input_files + output_files
+        files_to_delete = input_files + sidecar_files + output_files
 
         # 파일 삭제
         deleted_files = []
-        for file in input_files + output_files:
+        for file in files_to_delete:
             try:
                 file.unlink()
                 deleted_files.append(str(file))
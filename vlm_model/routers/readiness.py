@@ -0,0 +1,30 @@
+# vlm_model/routers/readiness.py
+
+from fastapi import APIRouter, Response
+import logging
+
+from vlm_model.schemas.feedback import ReadinessResponse
+from vlm_model.utils.cv_mediapipe_analysis.graph_pool import warm_up_state
+
+router = APIRouter()
+
+logger = logging.getLogger(__name__)  # 'vlm_model.routers.readiness' 로거 사용
+
+# 상태별 응답 메시지
+STATUS_MESSAGES = {
+    "pending": "Mediapipe 그래프 예열이 시작되지 않았습니다.",
+    "warming_up": "Mediapipe 그래프를 예열하는 중입니다.",
+    "ready": "요청을 처리할 준비가 되었습니다.",
+    "failed": "Mediapipe 그래프 예열에 실패했습니다. 첫 요청에서 그래프를 다시 생성합니다.",
+}
+
+@router.get("/ready", response_model=ReadinessResponse)
+async def readiness_endpoint(response: Response):
+    """
+    앱 시작 시 Mediapipe 그래프 예열이 끝났는지 반환합니다.
+    예열이 끝나기 전(또는 실패한 경우)에는 503을 반환하므로, 로드 밸런서의 준비 상태 확인에 사용할 수 있습니다.
+    """
+    status = warm_up_state()
+    if status != "ready":
+        response.status_code = 503
+    return ReadinessResponse(status=status, message=STATUS_MESSAGES[status])
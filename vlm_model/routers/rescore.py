@@ -0,0 +1,81 @@
+# vlm_model/routers/rescore.py
+
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
+from typing import Optional
+import os
+import time
+import logging
+
+from vlm_model.schemas.feedback import RescoreResponse
+from vlm_model.utils.landmark_store import load_landmark_store, rescore_landmark_store
+from vlm_model.config import UPLOAD_DIR, EVENT_DETECTION_ENABLED, EVENT_SMOOTHING_WINDOW, EVENT_HYSTERESIS, EVENT_MAX_GAP
+
+router = APIRouter()
+
+logger = logging.getLogger(__name__)  # 'vlm_model.routers.rescore' 로거 사용
+
+def _format_timestamp(timestamp: float) -> str:
+    # 초 단위 타임스탬프를 "Xm Ys" 형식으로 변환
+    return f"{int(timestamp // 60)}m {int(timestamp % 60)}s"
+
+@router.get("/video-rescore/{video_id}/", response_model=RescoreResponse)
+async def rescore_endpoint(
+    video_id: str,
+    events: Optional[bool] = Query(None, description="연속된 문제 프레임을 구간으로 묶을지 여부 (기본값: EVENT_DETECTION_ENABLED)"),
+    smoothing_window: int = Query(EVENT_SMOOTHING_WINDOW, ge=1, description="점수 이동 평균 프레임 수"),
+    hysteresis: float = Query(EVENT_HYSTERESIS, ge=0.0, le=1.0, description="구간 종료 기준을 시작 기준보다 낮출 값"),
+    max_gap: int = Query(EVENT_MAX_GAP, ge=0, description="하나로 합칠 구간 사이의 최대 프레임 수")
+):
+    """
+    /video-send-feedback/ 분석 때 저장한 랜드마크로 점수와 문제 프레임 선택을 다시 계산합니다.
+    비디오 디코딩, Mediapipe 추론, VLM 호출을 하지 않으므로 구간 설정을 바꿔 보며 바로 결과를 확인할 수 있습니다.
+    """
+    # 원본 비디오 파일 찾기
+    original_file = None
+    for ext in ["webm", "mp4", "mov", "avi", "mkv"]:
+        potential_path = UPLOAD_DIR / f"{video_id}_original.{ext}"
+        if os.path.exists(potential_path):
+            original_file = potential_path
+            break
+
+    if not original_file:
+        logger.error(f"원본 비디오 파일을 찾을 수 없습니다: video_id={video_id}", extra={
+            "errorType": "FileNotFoundError",
+            "error_message": f"video_id={video_id}"
+        })
+        raise HTTPException(status_code=404, detail="원본 비디오 파일을 찾을 수 없습니다.")
+
+    started = time.perf_counter()
+    store = await run_in_threadpool(load_landmark_store, str(original_file))
+    if store is None:
+        logger.info(f"저장된 랜드마크 기록이 없습니다: video_id={video_id}")
+        raise HTTPException(status_code=404, detail="저장된 랜드마크 기록이 없습니다. 먼저 피드백 분석을 요청하세요.")
+
+    problem_frames = await run_in_threadpool(
+        rescore_landmark_store, store,
+        EVENT_DETECTION_ENABLED if events is None else events,
+        window=smoothing_window, hysteresis_margin=hysteresis, max_gap=max_gap
+    )
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    logger.info(f"랜드마크 기록으로 점수 재계산 완료: video_id={video_id}, 문제 프레임 {len(problem_frames)}개 ({elapsed_ms:.1f}ms)")
+
+    return RescoreResponse(
+        video_id=video_id,
+        frames=[
+            {
+                "segment_index": frame["segment_index"],
+                "frame_index": frame["frame_index"],
+                "timestamp": _format_timestamp(frame["timestamp"]),
+                "scores": frame["scores"],
+                "event": {
+                    "start": _format_timestamp(frame["event"]["start"]),
+                    "end": _format_timestamp(frame["event"]["end"]),
+                    "frames": frame["event"]["frames"]
+                } if frame["event"] else None
+            }
+            for frame in problem_frames
+        ],
+        analysis=store.params,
+        elapsed_ms=round(elapsed_ms, 2)
+    )
@@ -1,6 +1,7 @@
 # vlm_model/routers/send_feedback.py
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
 import os
 import re
 import uuid
@@ -10,9 +11,9 @@ from pathlib import Path
 
 from vlm_model.schemas.feedback import FeedbackResponse
 from vlm_model.utils.processing_video import process_video
-from vlm_model.utils.video_codec_conversion import convert_to_vp9_if_needed
 from vlm_model.exceptions import VideoProcessingError, ImageEncodingError
-from vlm_model.config import FEEDBACK_DIR, UPLOAD_DIR
+from vlm_model.utils.cv_mediapipe_analysis.profiles import ANALYSIS_PROFILES
+from vlm_model.config import FEEDBACK_DIR, UPLOAD_DIR, ANALYSIS_PROFILE
 
 import logging
 import logging.config
@@ -23,12 +24,17 @@ router = APIRouter()
 logger = logging.getLogger(__name__)  # 'vlm_model.routers.send_feedback' 로거 사용
 
 @router.get("/video-send-feedback/{video_id}/", response_model=FeedbackResponse)
-async def send_feedback_endpoint(video_id: str):
+async def send_feedback_endpoint(
+    video_id: str,
+    profile: str = Query(ANALYSIS_PROFILE, description="분석 프로필: fast(빠름), balanced(기본), accurate(정확)")
+):
     """
     video_id를 통해 저장된 비디오 파일을 처리하고 피드백 데이터를 반환합니다.
+    profile로 분석 속도와 정확도를 선택합니다.
     """
-    # VP9 변환된 비디오 파일 경로 설정
-    vp9_file_path = UPLOAD_DIR / f"{video_id}_vp9.webm"
+    if profile not in ANALYSIS_PROFILES:
+        logger.info(f"지원하지 않는 분석 프로필: {profile}")
+        raise HTTPException(status_code=422, detail=f"지원하지 않는 분석 프로필입니다. ({', '.join(ANALYSIS_PROFILES)} 중 선택)")
 
     # 원본 비디오 파일 찾기
     original_file = None
@@ -45,42 +51,12 @@ async def send_feedback_endpoint(video_id: str):
         })
         raise HTTPException(status_code=404, detail="원본 비디오 파일을 찾을 수 없습니다.")
 
-    # VP9 파일이 이미 존재하는지 확인
-    if os.path.exists(vp9_file_path):
-        logger.info(f"이미 VP9 코덱으로 변환된 파일을 찾았습니다: {vp9_file_path}")
-        video_path_to_process = vp9_file_path
-    else:
-        # 코덱 변환 필요 여부 확인 및 변환 수행
-        try:
-            conversion_success = convert_to_vp9_if_needed(
-                input_path=str(original_file),
-                output_path=str(vp9_file_path),
-                preset='faster',        # 인코딩 프리셋
-                cpu_used=8,             # 최대 속도
-                threads=0,              # FFmpeg가 사용할 스레드 수 (0은 자동)
-                tile_columns=4,         # 타일 열 수
-                tile_rows=2,            # 타일 행 수
-                bitrate='1M'            # 비트레이트 조정
-            )
+    # 원본 컨테이너를 그대로 분석 (VP9 변환은 /video-vp9/{video_id}/ 요청 시 백그라운드에서 수행)
+    video_path_to_process = original_file
 
-            if conversion_success:
-                logger.info(f"비디오 코덱 변환 완료: {vp9_file_path}")
-                video_path_to_process = vp9_file_path
-            else:
-                # 변환 실패 시 원본을 사용
-                logger.info(f"이미 VP9 코덱인 파일이거나 변환이 필요하지 않습니다: {original_file}")
-                video_path_to_process = original_file
-
-        except Exception as e:
-            logger.error(f"코덱 변환 중 오류 발생: {str(e)}", extra={
-                "errorType": type(e).__name__,
-                "error_message": str(e)
-            })
-            raise HTTPException(status_code=500, detail="비디오 코덱 변환 중 오류가 발생했습니다.") from e
-
-    # 비디오 처리하여 피드백 생성
+    # 비디오 처리하여 피드백 생성 (이벤트 루프를 막지 않도록 스레드에서 실행하여 여러 비디오를 동시에 분석)
     try:
-        feedback_data = process_video(str(video_path_to_process), video_id)
+        feedback_data = await run_in_threadpool(process_video, str(video_path_to_process), video_id, profile)
     except VideoProcessingError as vpe:
         logger.error(f"비디오 처리 중 오류 발생: {vpe.message}", extra={
             "errorType": "VideoProcessingError",
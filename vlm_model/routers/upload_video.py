@@ -1,6 +1,7 @@
 # vlm_model/routers/upload_video.py
 
 from fastapi import APIRouter, File, UploadFile, HTTPException, BackgroundTasks, Response
+from fastapi.concurrency import run_in_threadpool
 import os
 import uuid
 import logging
@@ -10,7 +11,8 @@ from pathlib import Path
 
 from vlm_model.schemas.feedback import UploadResponse
 from vlm_model.config import UPLOAD_DIR
-from vlm_model.exceptions import VideoImportingError
+from vlm_model.exceptions import VideoImportingError, VideoProcessingError
+from vlm_model.utils.media_probe import write_media_info
 
 router = APIRouter()
 
@@ -62,6 +64,13 @@ async def receive_video_endpoint(response: Response, file: UploadFile = File(...
         file_size = os.path.getsize(original_file_path)
         logger.info(f"파일이 성공적으로 저장되었습니다. 크기: {file_size} bytes")
 
+        # 코덱, 길이, FPS, 키프레임 정보를 한 번만 분석하여 저장 (실패해도 이후 요청에서 직접 확인하므로 업로드는 계속 진행)
+        try:
+            media_info = await run_in_threadpool(write_media_info, str(original_file_path))
+            logger.debug(f"비디오 메타데이터: codec={media_info['codec']}, duration={media_info['duration']}, fps={media_info['fps']}")
+        except VideoProcessingError as vpe:
+            logger.info(f"비디오 메타데이터를 저장하지 못했습니다: {vpe.message}")
+
         return UploadResponse(
             video_id=video_id,
             message=f"비디오 업로드 완료. 피드백 데이터를 받으려면 /video-send-feedback/{video_id}/ 엔드포인트를 호출하세요."
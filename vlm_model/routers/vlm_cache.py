@@ -0,0 +1,21 @@
+# vlm_model/routers/vlm_cache.py
+
+from fastapi import APIRouter
+import logging
+
+from vlm_model.schemas.feedback import VLMCacheStatsResponse
+from vlm_model.utils.vlm_cache import vlm_cache
+
+router = APIRouter()
+
+logger = logging.getLogger(__name__)  # 'vlm_model.routers.vlm_cache' 로거 사용
+
+@router.get("/vlm-cache/stats/", response_model=VLMCacheStatsResponse)
+async def vlm_cache_stats_endpoint():
+    """
+    VLM 응답 캐시의 적중/실패 횟수와 항목 수를 반환합니다.
+    같은 비디오를 다시 분석했을 때 misses가 늘지 않으면 VLM API를 호출하지 않은 것입니다.
+    """
+    if vlm_cache is None:
+        return VLMCacheStatsResponse(enabled=False)
+    return VLMCacheStatsResponse(enabled=True, **vlm_cache.stats())
@@ -0,0 +1,58 @@
+# vlm_model/routers/vp9_video.py
+
+from fastapi import APIRouter, HTTPException, Response
+import os
+import logging
+
+from vlm_model.schemas.feedback import TranscodeResponse
+from vlm_model.utils.video_codec_conversion import request_vp9_derivative
+from vlm_model.config import UPLOAD_DIR
+
+router = APIRouter()
+
+logger = logging.getLogger(__name__)  # 'vlm_model.routers.vp9_video' 로거 사용
+
+# 상태별 응답 메시지
+STATUS_MESSAGES = {
+    "ready": "VP9 비디오 파일이 준비되었습니다.",
+    "original": "원본 비디오가 이미 VP9 코덱이므로 변환하지 않습니다.",
+    "pending": "VP9 변환이 진행 중입니다. 잠시 후 다시 요청하세요.",
+    "failed": "VP9 변환에 실패했습니다. 다시 요청하면 변환을 재시도합니다.",
+}
+
+@router.get("/video-vp9/{video_id}/", response_model=TranscodeResponse)
+async def request_vp9_endpoint(video_id: str, response: Response):
+    """
+    video_id에 해당하는 VP9 비디오 파일을 요청합니다.
+    파일이 없으면 백그라운드 변환을 시작하고 202 Accepted를 반환합니다.
+    변환에 실패한 경우 500을 반환하며, 다시 요청하면 변환을 재시도합니다.
+    """
+    # 원본 비디오 파일 찾기
+    original_file = None
+    for ext in ["webm", "mp4", "mov", "avi", "mkv"]:
+        potential_path = UPLOAD_DIR / f"{video_id}_original.{ext}"
+        if os.path.exists(potential_path):
+            original_file = potential_path
+            break
+
+    if not original_file:
+        logger.error(f"원본 비디오 파일을 찾을 수 없습니다: video_id={video_id}", extra={
+            "errorType": "FileNotFoundError",
+            "error_message": f"video_id={video_id}"
+        })
+        raise HTTPException(status_code=404, detail="원본 비디오 파일을 찾을 수 없습니다.")
+
+    vp9_file_path = UPLOAD_DIR / f"{video_id}_vp9.webm"
+    status = request_vp9_derivative(str(original_file), str(vp9_file_path))
+    logger.info(f"VP9 변환 상태: video_id={video_id}, status={status}")
+
+    if status == "failed":
+        raise HTTPException(status_code=500, detail=STATUS_MESSAGES[status])
+    if status == "pending":
+        response.status_code = 202
+
+    return TranscodeResponse(
+        video_id=video_id,
+        status=status,
+        message=STATUS_MESSAGES[status]
+    )
@@ -1,11 +1,12 @@
 # schemas/__init__.py
 
-from .feedback import UploadResponse, FeedbackDetails, FeedbackSections, FeedbackFrame, FeedbackResponse, DeleteResponse
+from .feedback import UploadResponse, FeedbackDetails, FeedbackSections, FeedbackFrame, FeedbackResponse, DeleteResponse, TranscodeResponse
 __all__ = [
     "UploadResponse",
     "FeedbackDetails",
     "FeedbackSections",
     "FeedbackFrame",
     "FeedbackResponse",
-    "DeleteResponse"
+    "DeleteResponse",
+    "TranscodeResponse"
 ]
\ No newline at end of file
@@ -1,7 +1,7 @@
 # vlm_model/schemas/feedback.py
 
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 class UploadResponse(BaseModel):
     video_id: str
@@ -32,4 +32,41 @@ class FeedbackResponse(BaseModel):
 
 class DeleteResponse(BaseModel):
     video_id: str
-    message: str
\ No newline at end of file
+    message: str
+
+class TranscodeResponse(BaseModel):
+    video_id: str
+    status: str  # "ready", "original", "pending", "failed"
+    message: str
+
+class ReadinessResponse(BaseModel):
+    status: str  # "pending", "warming_up", "ready", "failed"
+    message: str
+
+class ProblemEvent(BaseModel):
+    start: str  # 예: "0m 3s"
+    end: str
+    frames: int  # 구간에 포함된 샘플 프레임 수
+
+class RescoredFrame(BaseModel):
+    segment_index: int
+    frame_index: int  # 세그먼트 내 프레임 인덱스
+    timestamp: str  # 예: "0m 0s"
+    scores: Dict[str, float]  # posture_score, gaze_score, gestures_score, sudden_movement_score, facial_expression_score
+    event: Optional[ProblemEvent] = None  # 연속된 문제 구간의 대표 프레임인 경우
+
+class RescoreResponse(BaseModel):
+    video_id: str
+    frames: List[RescoredFrame]  # 다시 선택한 문제 프레임
+    analysis: Dict[str, object]  # 랜드마크를 기록할 때의 분석 조건
+    elapsed_ms: float
+
+class VLMCacheStatsResponse(BaseModel):
+    enabled: bool
+    hits: int = 0  # memory_hits + db_hits
+    memory_hits: int = 0
+    db_hits: int = 0
+    misses: int = 0
+    evictions: int = 0  # 메모리 LRU 초과, SQLite 만료/최대 개수 초과로 삭제된 항목 수
+    memory_entries: int = 0
+    db_entries: int = 0
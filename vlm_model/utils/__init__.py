@@ -1,19 +1,23 @@
 # utils/__init__.py
 
-from .read_video import read_video_opencv
-from .video_duration import get_video_duration
-from .download_video import download_and_sample_video_local
-from .analysis import analyze_frames
-from .encoding_image import encode_image
-from .processing_video import process_video
-from .encoding_feedback_image import encode_feedback_image
+from importlib import import_module
 
-__all__ = [
-    "read_video_opencv",
-    "get_video_duration",
-    "download_and_sample_video_local",
-    "analyze_frames",
-    "encode_image",
-    "process_video",
-    "encode_feedback_image"
-]
+# 세그먼트 병렬 분석 작업자는 vlm_model.utils 하위의 Mediapipe 모듈만 import하므로,
+# 패키지 import 시 VLM 관련 모듈(analysis, processing_video)까지 불러오지 않도록 처음 사용할 때 import
+_EXPORTS = {
+    "read_video_opencv": ".read_video",
+    "get_video_duration": ".video_duration",
+    "download_and_sample_video_local": ".download_video",
+    "stream_sampled_frames": ".download_video",
+    "analyze_frames": ".analysis",
+    "encode_image": ".encoding_image",
+    "process_video": ".processing_video",
+    "encode_feedback_image": ".encoding_feedback_image"
+}
+
+__all__ = list(_EXPORTS)
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(import_module(_EXPORTS[name], __name__), name)
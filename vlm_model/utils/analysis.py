@@ -2,7 +2,10 @@
 
 import json
 import re
-from typing import List, Tuple
+import uuid
+import asyncio
+import threading
+from typing import Dict, List, Optional, Tuple
 from openai import (
     AuthenticationError,
     APIError,
@@ -17,7 +20,7 @@ from openai import (
     PermissionDeniedError,
     UnprocessableEntityError
 )
-from openai import OpenAI # import openai
+from openai import AsyncOpenAI # import openai
 import numpy as np
 from pathlib import Path
 import logging
@@ -29,14 +32,393 @@ from vlm_model.utils.analysis_video.load_prompt import load_user_prompt
 from vlm_model.utils.analysis_video.parse_feedback import parse_feedback_text
 from vlm_model.schemas.feedback import FeedbackSections, FeedbackDetails
 from vlm_model.exceptions import PromptImportingError
+from vlm_model.utils.vlm_cache import vlm_cache, cache_key, prompt_hash
+from vlm_model.utils.vlm_scheduler import vlm_scheduler
+from vlm_model.config import VLM_CONCURRENCY, VLM_IMAGE_DETAIL, VLM_BATCH_SIZE
 
 # 모듈별 로거 생성
 logger = logging.getLogger(__name__) 
 
-# OpenAI 모듈을 client로 정의
-client = OpenAI() # openai
+# 피드백 생성에 사용하는 VLM 모델 (캐시 키에도 포함)
+VLM_MODEL = "gpt-4o-mini"
 
-def analyze_frames(frames: List[np.ndarray], timestamps: List[float], mediapipe_results: List[dict], segment_idx: int, duration: int, segment_length: int, system_instruction: str, frame_interval: int = 1) -> Tuple[List[Tuple[np.ndarray, int, int, str]], List[str]]:
+# OpenAI 모듈을 client로 정의 (비동기 클라이언트, 전용 이벤트 루프에서 사용, 재시도는 vlm_scheduler가 담당)
+client = AsyncOpenAI(max_retries=0) # openai
+
+# 프로세스 전체에서 동시에 보낼 수 있는 VLM 요청 수 제한
+_vlm_semaphore = asyncio.Semaphore(max(1, VLM_CONCURRENCY))
+
+# VLM 요청을 처리하는 전용 이벤트 루프 (analyze_frames는 스레드 풀에서 동기 함수로 호출됨)
+_vlm_loop = None
+_vlm_loop_lock = threading.Lock()
+
+def _get_vlm_loop() -> asyncio.AbstractEventLoop:
+    """
+    VLM 요청용 이벤트 루프를 반환합니다. 처음 호출될 때 데몬 스레드에서 루프를 시작합니다.
+    클라이언트의 연결 풀을 요청 간에 재사용하기 위해 하나의 루프를 계속 사용합니다.
+    """
+    global _vlm_loop
+    with _vlm_loop_lock:
+        if _vlm_loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="vlm-client", daemon=True).start()
+            _vlm_loop = loop
+    return _vlm_loop
+
+def build_user_content(user_prompt: str, mediapipe_feedback: dict, img_b64_str: str, img_type: str = "image/jpeg", detail: str = VLM_IMAGE_DETAIL) -> List[dict]:
+    """
+    VLM에 보낼 사용자 메시지를 텍스트와 이미지 파트로 구성합니다.
+    이미지는 텍스트에 포함하지 않고 image_url 파트로 보내 비전 입력으로 처리되도록 합니다.
+
+    Args:
+        user_prompt (str): 사용자 프롬프트.
+        mediapipe_feedback (dict): Mediapipe에서 감지된 문제 행동 점수.
+        img_b64_str (str): Base64로 인코딩된 이미지.
+        img_type (str, optional): 이미지 MIME 타입. 기본값은 "image/jpeg".
+        detail (str, optional): 이미지 해석 수준 ("low", "high", "auto"). 기본값은 VLM_IMAGE_DETAIL.
+
+    Returns:
+        List[dict]: chat.completions 사용자 메시지의 content 파트 리스트.
+    """
+    # Mediapipe에서 필터링된 결과를 메시지에 포함
+    mediapipe_feedback_text = "\n".join(
+        [f"{key}: {value}" for key, value in mediapipe_feedback.items()]
+    )
+    return [
+        {
+            "type": "text",
+            "text": f"{user_prompt}\n\nMediapipe에서 감지된 문제 행동:\n{mediapipe_feedback_text}"
+        },
+        {
+            "type": "image_url",
+            "image_url": {
+                "url": f"data:{img_type};base64,{img_b64_str}",
+                "detail": detail
+            }
+        }
+    ]
+
+def build_batch_user_content(user_prompt: str, frames: List[Tuple[float, dict, str]], img_type: str = "image/jpeg", detail: str = VLM_IMAGE_DETAIL) -> List[dict]:
+    """
+    한 세그먼트의 여러 프레임을 하나의 요청으로 보내도록 사용자 메시지를 구성합니다.
+    프롬프트는 한 번만 넣고, 프레임마다 번호와 타임스탬프, Mediapipe 점수를 이미지 앞에 붙입니다.
+
+    Args:
+        user_prompt (str): 사용자 프롬프트.
+        frames (List[Tuple[float, dict, str]]): 프레임별 (타임스탬프(초), Mediapipe 점수, Base64 이미지).
+        img_type (str, optional): 이미지 MIME 타입. 기본값은 "image/jpeg".
+        detail (str, optional): 이미지 해석 수준 ("low", "high", "auto"). 기본값은 VLM_IMAGE_DETAIL.
+
+    Returns:
+        List[dict]: chat.completions 사용자 메시지의 content 파트 리스트.
+    """
+    content = [
+        {
+            "type": "text",
+            "text": (
+                f"{user_prompt}\n\n"
+                f"아래에 같은 발표 영상의 프레임 {len(frames)}개가 순서대로 주어집니다. 각 프레임을 따로 분석하고, "
+                f"프레임마다 위 형식의 피드백 객체에 프레임 번호를 \"frame\" 키로 추가하여 "
+                f"프레임 순서대로 담은 JSON 배열 하나로만 응답해주세요."
+            )
+        }
+    ]
+    for number, (timestamp, mediapipe_feedback, img_b64_str) in enumerate(frames, start=1):
+        mediapipe_feedback_text = "\n".join(
+            [f"{key}: {value}" for key, value in mediapipe_feedback.items()]
+        )
+        content.append({
+            "type": "text",
+            "text": f"프레임 {number} ({int(timestamp // 60)}m {int(timestamp % 60)}s)\nMediapipe에서 감지된 문제 행동:\n{mediapipe_feedback_text}"
+        })
+        content.append({
+            "type": "image_url",
+            "image_url": {
+                "url": f"data:{img_type};base64,{img_b64_str}",
+                "detail": detail
+            }
+        })
+    return content
+
+def split_batch_feedback(generated_text: str, frame_count: int) -> List[str]:
+    """
+    여러 프레임을 묶어 보낸 요청의 JSON 배열 응답을 프레임별 피드백 텍스트로 나눕니다.
+    각 피드백 텍스트는 단일 프레임 요청의 응답과 같은 JSON 객체 형식입니다.
+
+    Args:
+        generated_text (str): VLM 응답 텍스트.
+        frame_count (int): 요청에 포함된 프레임 수.
+
+    Returns:
+        List[str]: 프레임 순서의 피드백 텍스트.
+
+    Raises:
+        ValueError: 응답이 JSON 배열이 아니거나 프레임 수와 맞지 않는 경우.
+    """
+    # 코드 블록 제거 (```json\n ... \n```)
+    clean_text = re.sub(r'^```json\s*', '', generated_text, flags=re.MULTILINE)
+    clean_text = re.sub(r'```\s*$', '', clean_text, flags=re.MULTILINE)
+
+    feedback_list = json.loads(clean_text)
+    if not isinstance(feedback_list, list) or not all(isinstance(item, dict) for item in feedback_list):
+        raise ValueError("묶음 요청의 응답이 피드백 객체의 JSON 배열이 아닙니다.")
+    if len(feedback_list) != frame_count:
+        raise ValueError(f"묶음 요청의 응답 피드백 수({len(feedback_list)})가 프레임 수({frame_count})와 다릅니다.")
+
+    # 프레임 번호가 있으면 번호 순서로 정렬 (없으면 응답 순서를 그대로 사용)
+    if all(isinstance(item.get("frame"), int) for item in feedback_list):
+        feedback_list = sorted(feedback_list, key=lambda item: item["frame"])
+    return [
+        json.dumps({key: value for key, value in item.items() if key != "frame"}, ensure_ascii=False)
+        for item in feedback_list
+    ]
+
+def _token_usage(response) -> Dict[str, int]:
+    # 응답의 토큰 사용량 (usage가 없는 응답은 0으로 기록)
+    usage = getattr(response, "usage", None)
+    return {
+        key: int(getattr(usage, key, 0) or 0)
+        for key in ("prompt_tokens", "completion_tokens", "total_tokens")
+    }
+
+def _problem_detected(i: int, feedback_text: str) -> bool:
+    """
+    프레임 하나의 피드백 텍스트를 파싱하여 문제 행동이 감지되었는지 확인합니다.
+    """
+    # 코드 블록 제거 (```json\n ... \n```)
+    clean_text = re.sub(r'^```json\s*', '', feedback_text, flags=re.MULTILINE)
+    clean_text = re.sub(r'```\s*$', '', clean_text, flags=re.MULTILINE)
+
+    # JSON 형식으로 응답을 파싱
+    feedback_sections = parse_feedback_text(clean_text)
+
+    # 문제 행동 감지 여부 확인
+    problem_detected = any(
+        getattr(feedback_sections, field).improvement for field in feedback_sections.__fields__
+    )
+
+    # 디버깅을 위해 감지된 문제 행동 출력
+    detected_behaviors = [
+        field for field in feedback_sections.__fields__ 
+        if getattr(feedback_sections, field).improvement
+    ]
+    logger.debug(f"프레임 {i+1} 응답 텍스트: {feedback_text}")
+    logger.debug(f"감지된 문제 행동: {detected_behaviors}")
+    return problem_detected
+
+def _estimate_tokens(system_instruction: str, user_content: List[dict], max_tokens: int) -> int:
+    # TPM 한도 계산용 요청 토큰 추정치 (한글 위주 텍스트는 약 2자당 1토큰, low 이미지는 85토큰, 출력은 max_tokens)
+    text_length = len(system_instruction) + sum(len(part["text"]) for part in user_content if part["type"] == "text")
+    image_tokens = sum(85 if part["image_url"].get("detail") == "low" else 765 for part in user_content if part["type"] == "image_url")
+    return text_length // 2 + image_tokens + max_tokens
+
+async def _analyze_request(indices: List[int], user_content: List[dict], system_instruction: str, flow_id: str = "default", frame_contents: Optional[List[List[dict]]] = None) -> Tuple[List[Tuple[str, bool]], Dict[str, int]]:
+    """
+    프레임 하나 또는 여러 프레임을 한 번의 요청으로 VLM에 분석합니다.
+    요청은 vlm_scheduler의 RPM/TPM 한도와 flow별 순서를 따르고, 동시 요청 수는 VLM_CONCURRENCY로 제한됩니다.
+    묶음 요청의 응답을 프레임별로 나눌 수 없으면 (JSON 배열이 아니거나 피드백 수가 다른 경우) frame_contents로 프레임마다 다시 요청합니다.
+
+    Args:
+        indices (List[int]): 요청에 포함된 세그먼트 내 프레임 인덱스.
+        user_content (List[dict]): build_user_content 또는 build_batch_user_content로 구성한 사용자 메시지 파트.
+        system_instruction (str): 시스템 지침 문자열.
+        flow_id (str, optional): 스케줄러에서 공정하게 나눌 단위 (비디오 ID).
+        frame_contents (Optional[List[List[dict]]], optional): 묶음 요청일 때 프레임별 build_user_content 결과 (indices 순서).
+
+    Returns:
+        Tuple[List[Tuple[str, bool]], Dict[str, int]]: 프레임 순서의 (피드백 텍스트, 문제 행동 감지 여부) 리스트와 요청의 토큰 사용량.
+
+    Raises:
+        HTTPException: OpenAI 오류 또는 피드백 파싱 오류를 HTTP 상태 코드로 변환하여 발생.
+    """
+    frame_label = f"프레임 {', '.join(str(i + 1) for i in indices)}"
+    max_tokens = min(2000 * len(indices), 16000)
+
+    async def create():
+        async with _vlm_semaphore:
+            return await client.chat.completions.create(
+                model=VLM_MODEL,
+                messages=[
+                    {
+                        "role": "system",
+                        "content": system_instruction
+                    },
+                    {
+                        "role": "user",
+                        "content": user_content
+                    }
+                ],
+                max_tokens=max_tokens,
+                temperature=0.4,
+                top_p=0.3
+            )
+
+    try:
+        # 한도 초과 등 재시도 가능한 오류는 스케줄러가 기다렸다가 다시 요청 (재시도를 모두 실패하면 아래에서 HTTP 오류로 변환)
+        response = await vlm_scheduler.run(
+            flow_id,
+            _estimate_tokens(system_instruction, user_content, max_tokens),
+            create,
+            used_tokens=lambda result: _token_usage(result)["total_tokens"]
+        )
+        logger.info(f"{frame_label} OpenAI 응답: {response}")
+
+        # 요청별 토큰 사용량 기록
+        usage = _token_usage(response)
+        logger.info(f"{frame_label} 토큰 사용량: 입력 {usage['prompt_tokens']}, 출력 {usage['completion_tokens']}, 합계 {usage['total_tokens']}")
+
+        # 생성된 텍스트과 문제 행동 추출
+        generated_text = response.choices[0].message.content
+
+        if len(indices) == 1:
+            return [(generated_text, _problem_detected(indices[0], generated_text))], usage
+
+        # 여러 프레임을 한 번에 요청한 경우 JSON 배열을 프레임별 피드백으로 나눔
+        try:
+            frame_texts = split_batch_feedback(generated_text, len(indices))
+        except ValueError as ve:
+            if not frame_contents:
+                raise
+            logger.info(f"{frame_label} 묶음 응답을 프레임별로 나눌 수 없어 프레임마다 다시 요청합니다: {ve}")
+        else:
+            return [(text, _problem_detected(i, text)) for i, text in zip(indices, frame_texts)], usage
+
+    except AuthenticationError as e:
+        # 401 - Invalid Authentication
+        logger.error(f"{frame_label} 처리 중 인증 오류 발생: {e}", extra={
+            "errorType": "AuthenticationError",
+            "error_message": str(e)
+        })
+        raise HTTPException(status_code=401, detail="인증 오류: API 키를 확인해주세요.") from e
+
+    except PermissionDeniedError as e:
+        # 403 - Permission Denied (e.g., Country not supported)
+        logger.error(f"{frame_label} 처리 중 권한 오류 발생: {e}", extra={
+            "errorType": "PermissionDeniedError",
+            "error_message": str(e)
+        })
+        raise HTTPException(status_code=403, detail="권한 오류: API 사용 권한을 확인해주세요.") from e
+
+    except RateLimitError as e:
+        # 429 - Rate Limit Exceeded
+        logger.error(f"{frame_label} 처리 중 Rate Limit 초과: {e}", extra={
+            "errorType": "RateLimitError",
+            "error_message": str(e)
+        })
+        raise HTTPException(status_code=429, detail="요청 제한 초과: 요청 속도를 줄여주세요.") from e
+
+    except BadRequestError as e:
+        # 400 - Bad Request
+        logger.error(f"{frame_label} 처리 중 잘못된 요청 오류 발생: {e}", extra={
+            "errorType": "BadRequestError",
+            "error_message": str(e)
+        })
+        raise HTTPException(status_code=400, detail="잘못된 요청: 요청 데이터를 확인해주세요.") from e
+
+    except ConflictError as e:
+        # 409 - Conflict
+        logger.error(f"{frame_label} 처리 중 충돌 오류 발생: {e}", extra={
+            "errorType": "ConflictError",
+            "error_message": str(e)
+        })
+        raise HTTPException(status_code=409, detail="충돌 오류: 요청을 다시 시도해주세요.") from e
+
+    except InternalServerError as e:
+        # 500 - Internal Server Error
+        logger.error(f"{frame_label} 처리 중 내부 서버 오류 발생: {e}", extra={
+            "errorType": "InternalServerError",
+            "error_message": str(e)
+        })
+        raise HTTPException(status_code=502, detail="내부 서버 오류: 나중에 다시 시도해주세요.") from e
+
+    except NotFoundError as e:
+        # 404 - Not Found
+        logger.error(f"{frame_label} 처리 중 자원 미존재 오류 발생: {e}", extra={
+            "errorType": "NotFoundError",
+            "error_message": str(e)
+        })
+        raise HTTPException(status_code=404, detail="자원이 존재하지 않습니다.") from e
+
+    except UnprocessableEntityError as e:
+        # 422 - Unprocessable Entity
+        logger.error(f"{frame_label} 처리 중 처리 불가능한 엔티티 오류 발생: {e}", extra={
+            "errorType": "UnprocessableEntityError",
+            "error_message": str(e)
+        })
+        raise HTTPException(status_code=422, detail="처리 불가능한 데이터입니다.") from e
+
+    except APIError as e:
+        # 502 - Bad Gateway
+        logger.error(f"{frame_label} 처리 중 API 오류 발생: {e}", extra={
+            "errorType": "APIError",
+            "error_message": str(e)
+        })
+        raise HTTPException(status_code=502, detail="서버 오류: 나중에 다시 시도해주세요.") from e
+
+    except APITimeoutError as e:
+        # 504 - Gateway Timeout
+        logger.error(f"{frame_label} 처리 중 API 타임아웃 오류 발생: {e}", extra={
+            "errorType": "APITimeoutError",
+            "error_message": str(e)
+        })
+        raise HTTPException(status_code=504, detail="서버 응답 지연: 나중에 다시 시도해주세요.") from e
+
+    except APIConnectionError as e:
+        # 503 - Service Unavailable
+        logger.error(f"{frame_label} 처리 중 API 연결 오류 발생: {e}", extra={
+            "errorType": "APIConnectionError",
+            "error_message": str(e)
+        })
+        raise HTTPException(status_code=503, detail="연결 오류: 네트워크 상태를 확인해주세요.") from e
+
+    except OpenAIError as e:
+        # 500 - OpenAI 관련 기타 오류
+        logger.error(f"{frame_label} 처리 중 OpenAI 라이브러리 오류 발생: {e}", extra={
+            "errorType": "OpenAIError",
+            "error_message": str(e)
+        })
+        raise HTTPException(status_code=500, detail="OpenAI 처리 중 알 수 없는 오류가 발생했습니다.") from e
+
+    except ValueError as ve:
+        # JSON 디코딩 오류 등
+        logger.error(f"{frame_label} 피드백 파싱 중 오류 발생: {ve}", extra={
+            "errorType": "ValueError",
+            "error_message": str(ve)
+        })
+        raise HTTPException(status_code=400, detail="피드백 파싱 과정 중 오류.") from ve
+
+    except Exception as e:
+        # 기타 모든 예외
+        logger.error(f"{frame_label} 처리 중 예기치 않은 오류 발생: {e}", extra={
+            "errorType": type(e).__name__,
+            "error_message": str(e)
+        })
+        raise HTTPException(status_code=500, detail="프레임 처리 중 예기치 않은 오류가 발생했습니다.") from e
+
+    # 묶음 응답을 나누지 못한 경우에만 도달: 프레임별 요청 결과를 묶음 요청 순서로 합치고, 토큰 사용량은 묶음 요청을 포함하여 합산
+    fallback_results = await _gather_in_order([([i], content, None) for i, content in zip(indices, frame_contents)], system_instruction, flow_id)
+    for _, frame_usage in fallback_results:
+        for key in usage:
+            usage[key] += frame_usage[key]
+    return [result for request_results, _ in fallback_results for result in request_results], usage
+
+async def _gather_in_order(requests: List[Tuple[List[int], List[dict], Optional[List[List[dict]]]]], system_instruction: str, flow_id: str) -> List[Tuple[List[Tuple[str, bool]], Dict[str, int]]]:
+    """
+    VLM 요청을 동시에 실행하고 요청 순서대로 결과를 모읍니다.
+    하나라도 실패하면 남은 요청을 취소하고 해당 오류를 그대로 발생시킵니다.
+    """
+    tasks = [
+        asyncio.ensure_future(_analyze_request(indices, user_content, system_instruction, flow_id, frame_contents))
+        for indices, user_content, frame_contents in requests
+    ]
+    try:
+        return await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        raise
+
+def analyze_frames(frames: List[np.ndarray], timestamps: List[float], mediapipe_results: List[dict], segment_idx: int, duration: int, segment_length: int, system_instruction: str, frame_interval: int = 1, flow_id: Optional[str] = None) -> Tuple[List[Tuple[np.ndarray, int, int, str]], List[str]]:
     """
     주어진 프레임들을 분석하여 문제 행동을 감지하고 피드백을 생성합니다.
 
@@ -47,6 +429,7 @@ def analyze_frames(frames: List[np.ndarray], timestamps: List[float], mediapipe_
     - segment_length: 세그먼트의 길이 (초 단위)
     - system_instruction: 시스템 지침 문자열
     - frame_interval: 프레임 추출 간격 (초 단위)
+    - flow_id: VLM 스케줄러에서 요청을 공정하게 나눌 단위 (비디오 ID, 없으면 호출마다 새로 생성)
 
     Returns:
     - problematic_frames: 문제 행동이 감지된 프레임 정보 리스트
@@ -69,191 +452,76 @@ def analyze_frames(frames: List[np.ndarray], timestamps: List[float], mediapipe_
         logger.error("mediapipe_results의 길이와 frames의 길이가 일치하지 않습니다.")
         raise ValueError("mediapipe_results의 길이와 frames의 길이가 일치하지 않습니다.")
 
+    # 이미지를 먼저 인코딩한 뒤 VLM 요청을 한 번에 보냄
+    encoded = []
     for i, (frame, timestamp, mediapipe_feedback) in enumerate(zip(frames, timestamps, mediapipe_results)):
-        try:
-            minutes = int(timestamp // 60)
-            seconds = int(timestamp % 60)
-            timestamp_str = f"{minutes}m {seconds}s"
-        except Exception as e:
-            logger.error(f"타임스탬프 변환 중 오류 발생: {e}", extra={
-                "errorType": "TimestampConversionError",
-                "error_message": str(e)
-            })
-            timestamp_str = "0m 0s"  # 기본값 설정 또는 적절한 처리
-
-        img_type = "image/jpeg"
-
-        # Mediapipe에서 필터링된 결과를 메시지에 포함
-        mediapipe_feedback_text = "\n".join(
-            [f"{key}: {value}" for key, value in mediapipe_feedback.items()]
-        )
-
         # 이미지를 인코딩
         img_b64_str = encode_image(frame)
 
         if img_b64_str is None:
             continue
 
-        # 사용자 메시지 구성
-        user_message = f"{user_prompt}\n\nMediapipe에서 감지된 문제 행동:\n{mediapipe_feedback_text}\n\n이미지 데이터: data:{img_type};base64,{img_b64_str}"
-
-        try:
-            response = client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": system_instruction
-                    },
-                    {
-                        "role": "user",
-                        "content": user_message
-                    }
-                ],
-                max_tokens=2000,
-                temperature=0.4,
-                top_p=0.3
-            )
-            logger.info(f"프레임 {i+1} OpenAI 응답: {response}")
-
-            # 생성된 텍스트과 문제 행동 추출
-            generated_text = response.choices[0].message.content
-
-            # 코드 블록 제거 (```json\n ... \n```)
-            clean_text = re.sub(r'^```json\s*', '', generated_text, flags=re.MULTILINE)
-            clean_text = re.sub(r'```\s*$', '', clean_text, flags=re.MULTILINE)
-
-            # JSON 형식으로 응답을 파싱
-            feedback_sections = parse_feedback_text(clean_text)
-
-            # 문제 행동 감지 여부 확인
-            problem_detected = any(
-                getattr(feedback_sections, field).improvement for field in feedback_sections.__fields__
-            )
-
-            # 디버깅을 위해 감지된 문제 행동 출력
-            detected_behaviors = [
-                field for field in feedback_sections.__fields__ 
-                if getattr(feedback_sections, field).improvement
-            ]
-            logger.debug(f"프레임 {i+1} 응답 텍스트: {generated_text}")
-            logger.debug(f"감지된 문제 행동: {detected_behaviors}")
-
-            if problem_detected:
-                # 프레임과 세그먼트 정보를 저장
-                problematic_frames.append((frame, segment_idx + 1, i + 1, timestamp))
-                feedbacks.append(generated_text)
-
-        except AuthenticationError as e:
-            # 401 - Invalid Authentication
-            logger.error(f"프레임 {i+1} 처리 중 인증 오류 발생: {e}", extra={
-                "errorType": "AuthenticationError",
-                "error_message": str(e)
-            })
-            raise HTTPException(status_code=401, detail="인증 오류: API 키를 확인해주세요.") from e
-
-        except PermissionDeniedError as e:
-            # 403 - Permission Denied (e.g., Country not supported)
-            logger.error(f"프레임 {i+1} 처리 중 권한 오류 발생: {e}", extra={
-                "errorType": "PermissionDeniedError",
-                "error_message": str(e)
-            })
-            raise HTTPException(status_code=403, detail="권한 오류: API 사용 권한을 확인해주세요.") from e
-
-        except RateLimitError as e:
-            # 429 - Rate Limit Exceeded
-            logger.error(f"프레임 {i+1} 처리 중 Rate Limit 초과: {e}", extra={
-                "errorType": "RateLimitError",
-                "error_message": str(e)
-            })
-            raise HTTPException(status_code=429, detail="요청 제한 초과: 요청 속도를 줄여주세요.") from e
-
-        except BadRequestError as e:
-            # 400 - Bad Request
-            logger.error(f"프레임 {i+1} 처리 중 잘못된 요청 오류 발생: {e}", extra={
-                "errorType": "BadRequestError",
-                "error_message": str(e)
-            })
-            raise HTTPException(status_code=400, detail="잘못된 요청: 요청 데이터를 확인해주세요.") from e
-
-        except ConflictError as e:
-            # 409 - Conflict
-            logger.error(f"프레임 {i+1} 처리 중 충돌 오류 발생: {e}", extra={
-                "errorType": "ConflictError",
-                "error_message": str(e)
-            })
-            raise HTTPException(status_code=409, detail="충돌 오류: 요청을 다시 시도해주세요.") from e
-
-        except InternalServerError as e:
-            # 500 - Internal Server Error
-            logger.error(f"프레임 {i+1} 처리 중 내부 서버 오류 발생: {e}", extra={
-                "errorType": "InternalServerError",
-                "error_message": str(e)
-            })
-            raise HTTPException(status_code=502, detail="내부 서버 오류: 나중에 다시 시도해주세요.") from e
-
-        except NotFoundError as e:
-            # 404 - Not Found
-            logger.error(f"프레임 {i+1} 처리 중 자원 미존재 오류 발생: {e}", extra={
-                "errorType": "NotFoundError",
-                "error_message": str(e)
-            })
-            raise HTTPException(status_code=404, detail="자원이 존재하지 않습니다.") from e
-
-        except UnprocessableEntityError as e:
-            # 422 - Unprocessable Entity
-            logger.error(f"프레임 {i+1} 처리 중 처리 불가능한 엔티티 오류 발생: {e}", extra={
-                "errorType": "UnprocessableEntityError",
-                "error_message": str(e)
-            })
-            raise HTTPException(status_code=422, detail="처리 불가능한 데이터입니다.") from e
-
-        except APIError as e:
-            # 502 - Bad Gateway
-            logger.error(f"프레임 {i+1} 처리 중 API 오류 발생: {e}", extra={
-                "errorType": "APIError",
-                "error_message": str(e)
-            })
-            raise HTTPException(status_code=502, detail="서버 오류: 나중에 다시 시도해주세요.") from e
-
-        except APITimeoutError as e:
-            # 504 - Gateway Timeout
-            logger.error(f"프레임 {i+1} 처리 중 API 타임아웃 오류 발생: {e}", extra={
-                "errorType": "APITimeoutError",
-                "error_message": str(e)
-            })
-            raise HTTPException(status_code=504, detail="서버 응답 지연: 나중에 다시 시도해주세요.") from e
-
-        except APIConnectionError as e:
-            # 503 - Service Unavailable
-            logger.error(f"프레임 {i+1} 처리 중 API 연결 오류 발생: {e}", extra={
-                "errorType": "APIConnectionError",
-                "error_message": str(e)
-            })
-            raise HTTPException(status_code=503, detail="연결 오류: 네트워크 상태를 확인해주세요.") from e
-
-        except OpenAIError as e:
-            # 500 - OpenAI 관련 기타 오류
-            logger.error(f"프레임 {i+1} 처리 중 OpenAI 라이브러리 오류 발생: {e}", extra={
-                "errorType": "OpenAIError",
-                "error_message": str(e)
-            })
-            raise HTTPException(status_code=500, detail="OpenAI 처리 중 알 수 없는 오류가 발생했습니다.") from e
-
-        except ValueError as ve:
-            # JSON 디코딩 오류 등
-            logger.error(f"프레임 {i+1} 피드백 파싱 중 오류 발생: {ve}", extra={
-                "errorType": "ValueError",
-                "error_message": str(ve)
-            })
-            raise HTTPException(status_code=400, detail="피드백 파싱 과정 중 오류.") from ve
-
-        except Exception as e:
-            # 기타 모든 예외
-            logger.error(f"프레임 {i+1} 처리 중 예기치 않은 오류 발생: {e}", extra={
-                "errorType": type(e).__name__,
-                "error_message": str(e)
-            })
-            raise HTTPException(status_code=500, detail="프레임 처리 중 예기치 않은 오류가 발생했습니다.") from e
+        encoded.append((i, timestamp, mediapipe_feedback, img_b64_str))
+
+    if not encoded:
+        return problematic_frames, feedbacks
+
+    # 캐시에 있는 프레임은 VLM 요청에서 제외 (키: 모델, 프롬프트 해시, 프레임 perceptual hash, 구간화한 점수)
+    frame_results = {}
+    cache_keys = {}
+    if vlm_cache is not None:
+        prompt_digest = prompt_hash(VLM_MODEL, system_instruction, user_prompt, VLM_IMAGE_DETAIL)
+        pending = []
+        for item in encoded:
+            i, _, mediapipe_feedback, _ = item
+            cache_keys[i] = cache_key(VLM_MODEL, prompt_digest, frames[i], mediapipe_feedback)
+            cached_text = vlm_cache.get(cache_keys[i])
+            if cached_text is None:
+                pending.append(item)
+            else:
+                frame_results[i] = (cached_text, _problem_detected(i, cached_text))
+        if len(pending) < len(encoded):
+            logger.info(f"세그먼트 {segment_idx + 1} VLM 캐시 적중: {len(encoded) - len(pending)}/{len(encoded)}개 프레임")
+    else:
+        pending = encoded
+
+    # 사용자 메시지 구성 (VLM_BATCH_SIZE개 프레임씩 묶어 프롬프트를 한 번만 보냄, 1이면 프레임마다 요청)
+    batch_size = max(1, VLM_BATCH_SIZE)
+    requests = []
+    for start in range(0, len(pending), batch_size):
+        batch = pending[start:start + batch_size]
+        if len(batch) == 1:
+            i, _, mediapipe_feedback, img_b64_str = batch[0]
+            requests.append(([i], build_user_content(user_prompt, mediapipe_feedback, img_b64_str), None))
+        else:
+            # 묶음 응답을 나누지 못하면 프레임마다 다시 요청할 수 있도록 프레임별 메시지도 함께 전달
+            requests.append((
+                [i for i, _, _, _ in batch],
+                build_batch_user_content(user_prompt, [(timestamp, mediapipe_feedback, img_b64_str) for _, timestamp, mediapipe_feedback, img_b64_str in batch]),
+                [build_user_content(user_prompt, mediapipe_feedback, img_b64_str) for _, _, mediapipe_feedback, img_b64_str in batch]
+            ))
+
+    if requests:
+        # 전체 지연 시간은 요청 시간의 합이 아니라 가장 느린 요청 시간에 가까워짐 (동시 요청 수는 VLM_CONCURRENCY로 제한)
+        future = asyncio.run_coroutine_threadsafe(_gather_in_order(requests, system_instruction, flow_id or uuid.uuid4().hex), _get_vlm_loop())
+        results = future.result()
+
+        for (indices, _, _), (request_results, _) in zip(requests, results):
+            for i, result in zip(indices, request_results):
+                frame_results[i] = result
+                if i in cache_keys:
+                    vlm_cache.put(cache_keys[i], result[0])
+
+        # 세그먼트 전체 토큰 사용량 기록 (프레임당 평균으로 설정 변경 효과를 비교)
+        total_tokens = sum(usage["total_tokens"] for _, usage in results)
+        prompt_tokens = sum(usage["prompt_tokens"] for _, usage in results)
+        logger.info(f"세그먼트 {segment_idx + 1} 토큰 사용량: 요청 {len(results)}건, 입력 {prompt_tokens}, 합계 {total_tokens} (프레임당 평균 {total_tokens / len(pending):.0f}, detail={VLM_IMAGE_DETAIL}, batch={batch_size})")
+
+    for i in sorted(frame_results):
+        generated_text, problem_detected = frame_results[i]
+        if problem_detected:
+            # 프레임과 세그먼트 정보를 저장
+            problematic_frames.append((frames[i], segment_idx + 1, i + 1, timestamps[i]))
+            feedbacks.append(generated_text)
 
     return problematic_frames, feedbacks
@@ -1,15 +1,13 @@
 # vlm_model/utils/cv_mediapipe_analysis/analyze_mediapipe_main.py
 
 # Mediapipe 초기화
-from vlm_model.utils.cv_mediapipe_analysis.mediapipe_initializer import pose, face_mesh, hands
+from vlm_model.utils.cv_mediapipe_analysis.mediapipe_initializer import pose, face_mesh, hands, holistic
 
-from vlm_model.utils.cv_mediapipe_analysis.posture_analysis import calculate_head_position_score
-from vlm_model.utils.cv_mediapipe_analysis.movement_analysis import calculate_sudden_movement_score
-from vlm_model.utils.cv_mediapipe_analysis.gaze_analysis import calculate_lack_of_eye_contact_score
-from vlm_model.utils.cv_mediapipe_analysis.gesture_analysis import calculate_excessive_gestures_score
-from vlm_model.utils.cv_mediapipe_analysis.calculate_hand_move import calculate_hand_movement_score
-from vlm_model.utils.cv_mediapipe_analysis.calculate_gesture import calculate_gestures_score
-import mediapipe as mp
+from vlm_model.utils.cv_mediapipe_analysis.segment_scoring import score_segment
+from vlm_model.utils.cv_mediapipe_analysis.graph_pool import GraphBundle
+from vlm_model.utils.cv_mediapipe_analysis.cascade import GraphCascade
+from vlm_model.utils.cv_mediapipe_analysis.landmark_arrays import FrameLandmarks, POSE_LANDMARK_COUNT, landmarks_to_array, to_frame_landmarks, empty_frame_landmarks
+from vlm_model.utils.cv_mediapipe_analysis.roi import FACE_ROI_SIZE, HAND_ROI_SIZE, face_roi, hands_roi, crop_roi, roi_to_frame
 
 import logging
 import cv2
@@ -18,88 +16,112 @@ from typing import Tuple, Dict, Optional
 # 모듈별 로거 생성
 logger = logging.getLogger(__name__)
 
-def analyze_frame(frame: cv2.Mat, previous_pose_landmarks: Optional[object] = None, previous_hand_landmarks: Optional[object] = None) -> Tuple[Dict[str, float], Optional[object], Optional[object]]:
+def _process_roi(graph, rgb_frame, box, size: int, run: bool = True):
     """
-    단일 프레임을 분석하여 자세, 시선, 손동작 등의 피드백 정보를 반환합니다.
+    box 영역을 잘라 확대한 이미지를 graph로 처리하고, (결과, 좌표 변환에 사용할 영역)을 반환합니다. box가 None이면 전체 프레임을 처리합니다.
+    run이 False이면 graph를 실행하지 않고 결과로 None을 반환합니다.
+    """
+    if not run:
+        return None, None
+    if box is None:
+        height, width = rgb_frame.shape[:2]
+        return graph.process(rgb_frame), (0, 0, width, height)
+    return graph.process(crop_roi(rgb_frame, box, size)), box
+
+def _detect_with_roi(rgb_frame, pose_landmarks, graphs: GraphBundle, run_face: bool = True, run_hands: bool = True) -> FrameLandmarks:
+    """
+    포즈 결과로 얼굴과 양손 영역을 계산하여 잘라낸 이미지에서 FaceMesh/Hands를 실행하고, 랜드마크를 프레임 좌표로 되돌립니다.
+    """
+    height, width = rgb_frame.shape[:2]
+    pose_array = landmarks_to_array(pose_landmarks, POSE_LANDMARK_COUNT)
+
+    face_results, face_box = _process_roi(graphs.face_mesh, rgb_frame, face_roi(pose_array, width, height), FACE_ROI_SIZE, run_face)
+    hand_results, hand_box = _process_roi(graphs.hands, rgb_frame, hands_roi(pose_array, width, height), HAND_ROI_SIZE, run_hands)
+
+    cropped = to_frame_landmarks(
+        None,
+        face_results.multi_face_landmarks[0] if face_results and face_results.multi_face_landmarks else None,
+        hand_results.multi_hand_landmarks if hand_results else None
+    )
+    return FrameLandmarks(
+        pose=pose_array,
+        face=roi_to_frame(cropped.face, face_box, width, height) if face_box else cropped.face,
+        hands=roi_to_frame(cropped.hands, hand_box, width, height) if hand_box else cropped.hands
+    )
+
+def detect_landmarks(frame: cv2.Mat, graphs: Optional[GraphBundle] = None, cascade: Optional[GraphCascade] = None) -> FrameLandmarks:
+    """
+    단일 프레임에서 Mediapipe로 포즈, 얼굴, 손 랜드마크를 검출하여 배열로 변환합니다.
+    MEDIAPIPE_ENGINE=holistic이면 Holistic 그래프 하나로, 아니면 Pose/FaceMesh/Hands 그래프를 각각 실행합니다.
+    그래프 묶음이 roi_crop이면 포즈를 먼저 실행하고 얼굴/손 영역만 잘라 FaceMesh/Hands에 입력합니다.
+    cascade가 주어지면 포즈 결과와 직전 프레임 검출 결과로 FaceMesh/Hands 실행 여부를 결정합니다 (holistic 엔진에서는 무시).
+    점수 계산은 segment_scoring.score_segment로 세그먼트 단위로 수행합니다.
 
     Args:
         frame: 분석할 OpenCV 프레임.
-        previous_pose_landmarks: 이전 프레임의 포즈 랜드마크 - gestures.
-        previous_hand_landmarks: 이전 프레임의 손 랜드마크 - gestures.
+        graphs: 비디오별로 빌린 그래프 묶음 (graph_pool.checkout_graphs). None이면 전역 그래프를 사용합니다.
+        cascade: 세그먼트별 GraphCascade. None이면 항상 모든 그래프를 실행합니다.
 
     Returns:
-        feedback: 분석 결과를 담은 딕셔너리.
-        current_pose_landmarks: 현재 포즈 랜드마크.
-        current_hand_landmarks: 현재 손 랜드마크.
+        FrameLandmarks: 랜드마크 배열. 오류가 발생하면 아무것도 감지되지 않은 것으로 처리합니다.
     """
     try:
-        frame_height, frame_width, _ = frame.shape
         rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-
-        # Mediapipe 결과 처리
-        pose_results = pose.process(rgb_frame)
-        face_results = face_mesh.process(rgb_frame)
-        hand_results = hands.process(rgb_frame)
-
-        logger.debug(f"Pose results: {pose_results.pose_landmarks if pose_results.pose_landmarks else 'None'}")
-        logger.debug(f"Face results: {face_results.multi_face_landmarks if face_results.multi_face_landmarks else 'None'}")
-        logger.debug(f"Hand results: {hand_results.multi_hand_landmarks if hand_results.multi_hand_landmarks else 'None'}")
-
-        # 초기 점수들
-        posture_score = 0.0
-        gaze_score = 0.0
-        excessive_gestures_score = 0.0
-        sudden_movement_score = 0.0
-        hand_movement_score = 0.0
-
-        current_pose_landmarks = None
-        current_hand_landmarks = None
-
-        # 포즈 분석
-        if pose_results.pose_landmarks:
-            current_pose_landmarks = pose_results.pose_landmarks
-            posture_score = calculate_head_position_score(current_pose_landmarks, frame_width, frame_height)
-            sudden_movement_score = calculate_sudden_movement_score(current_pose_landmarks, previous_pose_landmarks)
-
-        # 얼굴(시선) 분석
-        if face_results.multi_face_landmarks:
-            gaze_score = calculate_lack_of_eye_contact_score(face_results.multi_face_landmarks[0], frame_width)
-
-        # 손 분석
-        if hand_results.multi_hand_landmarks:
-            current_hand_landmarks = hand_results.multi_hand_landmarks[0]
-            for hl in hand_results.multi_hand_landmarks:
-                g_score = calculate_excessive_gestures_score(hl)
-                if g_score > excessive_gestures_score:
-                    excessive_gestures_score = g_score
-
-                if previous_hand_landmarks is not None:
-                    m_score = calculate_hand_movement_score(hl, previous_hand_landmarks)
-                    if m_score > hand_movement_score:
-                        hand_movement_score = m_score
-
-        # gestures 평균 점수 계산
-        gestures_score = calculate_gestures_score(excessive_gestures_score, hand_movement_score)
-
-        # 피드백 딕셔너리
-        feedback = {
-            "posture_score": round(posture_score, 2),
-            "gaze_score": round(gaze_score, 2),
-            "gestures_score": round(gestures_score, 2),
-            "sudden_movement_score": round(sudden_movement_score, 2)
-        }
-
-        return feedback, current_pose_landmarks, current_hand_landmarks
+        if graphs is not None:
+            holistic_graph, pose_graph, face_graph, hands_graph = graphs.holistic, graphs.pose, graphs.face_mesh, graphs.hands
+        else:
+            holistic_graph, pose_graph, face_graph, hands_graph = holistic, pose, face_mesh, hands
+
+        if holistic_graph is not None:
+            # 단일 그래프: 포즈 검출 결과로 얼굴/손 영역을 잘라 같은 프레임에서 한 번에 처리
+            holistic_results = holistic_graph.process(rgb_frame)
+            hand_landmarks = [
+                landmarks for landmarks in (holistic_results.left_hand_landmarks, holistic_results.right_hand_landmarks)
+                if landmarks is not None
+            ]
+            return to_frame_landmarks(holistic_results.pose_landmarks, holistic_results.face_landmarks, hand_landmarks)
+
+        pose_results = pose_graph.process(rgb_frame)
+        # 포즈 결과로 FaceMesh/Hands가 필요한 프레임인지 판단
+        run_face, run_hands = cascade.plan(pose_results.pose_landmarks) if cascade is not None else (True, True)
+
+        if graphs is not None and graphs.roi_crop:
+            # 포즈에서 얼굴/손 위치를 구해 해당 영역만 확대하여 분석
+            landmarks = _detect_with_roi(rgb_frame, pose_results.pose_landmarks, graphs, run_face, run_hands)
+        else:
+            face_results = face_graph.process(rgb_frame) if run_face else None
+            hand_results = hands_graph.process(rgb_frame) if run_hands else None
+            landmarks = to_frame_landmarks(
+                pose_results.pose_landmarks,
+                face_results.multi_face_landmarks[0] if face_results and face_results.multi_face_landmarks else None,
+                hand_results.multi_hand_landmarks if hand_results else None
+            )
+
+        if cascade is not None:
+            cascade.update(landmarks)
+        return landmarks
 
     except Exception as e:
-        logger.error(f"Mediapipe로 CV 분석 중 오류 발생: {str(e)}", extra={
+        logger.error(f"Mediapipe로 랜드마크 검출 중 오류 발생: {str(e)}", extra={
             "errorType": type(e).__name__,
             "error_message": str(e)
         })
-        # 기본값 반환
-        return {
-            "posture_score": 0.0,
-            "gaze_score": 0.0,
-            "gestures_score": 0.0,
-            "sudden_movement_score": 0.0
-        }, None, None
+        return empty_frame_landmarks()
+
+def analyze_frame(frame: cv2.Mat, previous_landmarks: Optional[FrameLandmarks] = None, graphs: Optional[GraphBundle] = None) -> Tuple[Dict[str, float], FrameLandmarks]:
+    """
+    단일 프레임의 Mediapipe 점수를 계산합니다.
+    detect_landmarks로 랜드마크를 검출한 뒤 비디오 분석과 같은 segment_scoring.score_segment로 점수를 계산합니다.
+
+    Args:
+        frame: 분석할 OpenCV 프레임.
+        previous_landmarks: 이전 프레임의 랜드마크 (갑작스러운 움직임, 손 움직임 비교용). 이전 호출이 반환한 랜드마크를 전달합니다.
+        graphs: 사용할 그래프 묶음. None이면 전역 그래프를 사용합니다.
+
+    Returns:
+        Tuple[Dict[str, float], FrameLandmarks]: SCORE_KEYS별 점수와 현재 프레임의 랜드마크.
+    """
+    landmarks = detect_landmarks(frame, graphs)
+    frames = [previous_landmarks, landmarks] if previous_landmarks is not None else [landmarks]
+    scores = score_segment(frames)
+    return {key: float(values[-1]) for key, values in scores.items()}, landmarks
@@ -0,0 +1,69 @@
+# vlm_model/utils/cv_mediapipe_analysis/cascade.py
+
+import logging
+from typing import Dict, Tuple
+
+import numpy as np
+
+from vlm_model.utils.cv_mediapipe_analysis.landmark_arrays import FrameLandmarks
+
+logger = logging.getLogger(__name__) # 로거 사용
+
+# 포즈 랜드마크 인덱스 (mp_pose.PoseLandmark 값과 동일)
+FACE_POINTS = [0, 2, 5, 7, 8]  # 코, 양 눈, 양 귀
+WRIST_POINTS = [15, 16]  # 양 손목
+
+class GraphCascade:
+    """
+    포즈 결과와 직전 프레임의 검출 결과로 FaceMesh/Hands 실행 여부를 프레임마다 결정합니다.
+
+    규칙:
+        - 포즈가 감지되면, 얼굴 점(코/눈/귀) 중 하나라도 보이고(visibility) 화면 안에 있을 때만 FaceMesh를 실행하고,
+          손목 중 하나라도 보이고 화면 안에 있을 때만 Hands를 실행합니다.
+        - 포즈가 감지되지 않으면(예: 얼굴만 크게 나온 화면) 직전 프레임에서 검출된 모델만 실행합니다.
+
+    세그먼트마다 새로 만들며, 생략한 모델 호출 수를 skipped에 기록합니다.
+    """
+
+    def __init__(self, visibility_threshold: float = 0.5):
+        self.visibility_threshold = visibility_threshold
+        # 첫 프레임은 포즈가 없어도 모든 모델을 실행
+        self.previous_face = True
+        self.previous_hands = True
+        self.skipped: Dict[str, int] = {"face_mesh": 0, "hands": 0}
+
+    def _visible(self, pose_landmarks, points) -> bool:
+        for index in points:
+            point = pose_landmarks.landmark[index]
+            if point.visibility >= self.visibility_threshold and 0.0 <= point.x <= 1.0 and 0.0 <= point.y <= 1.0:
+                return True
+        return False
+
+    def plan(self, pose_landmarks) -> Tuple[bool, bool]:
+        """
+        이번 프레임에서 FaceMesh와 Hands를 실행할지 결정합니다.
+
+        Args:
+            pose_landmarks: 이번 프레임의 Pose 결과 (pose_landmarks). 감지되지 않았으면 None.
+
+        Returns:
+            Tuple[bool, bool]: (FaceMesh 실행 여부, Hands 실행 여부)
+        """
+        if pose_landmarks is None:
+            run_face, run_hands = self.previous_face, self.previous_hands
+        else:
+            run_face = self._visible(pose_landmarks, FACE_POINTS)
+            run_hands = self._visible(pose_landmarks, WRIST_POINTS)
+
+        if not run_face:
+            self.skipped["face_mesh"] += 1
+        if not run_hands:
+            self.skipped["hands"] += 1
+        return run_face, run_hands
+
+    def update(self, landmarks: FrameLandmarks) -> None:
+        """
+        이번 프레임의 검출 결과를 다음 프레임의 판단에 사용하도록 기록합니다.
+        """
+        self.previous_face = not np.isnan(landmarks.face[0, 0])
+        self.previous_hands = not np.isnan(landmarks.hands[:, 0, 0]).all()
@@ -0,0 +1,109 @@
+# vlm_model/utils/cv_mediapipe_analysis/event_detection.py
+
+from typing import Dict, List, NamedTuple
+
+import numpy as np
+
+from vlm_model.config import EVENT_SMOOTHING_WINDOW, EVENT_HYSTERESIS, EVENT_MAX_GAP
+
+# 점수별 문제 프레임 기준 (이 값을 초과하면 문제 행동)
+SCORE_THRESHOLDS = {
+    "posture_score": 0.8,
+    "gaze_score": 0.7,
+    "gestures_score": 0.7,
+    "sudden_movement_score": 0.7,
+    "facial_expression_score": 0.7
+}
+
+class ScoreEvent(NamedTuple):
+    """
+    연속된 문제 프레임 구간입니다. 인덱스는 세그먼트 내 프레임 위치이며 end를 포함합니다.
+    """
+    start: int
+    end: int
+    peak: int  # 구간에서 기준 대비 점수가 가장 높은 대표 프레임
+
+    @property
+    def length(self) -> int:
+        return self.end - self.start + 1
+
+def _thresholds(scores: Dict[str, np.ndarray]):
+    # 점수에 포함된 항목의 기준만 사용 (예: 얼굴 표정 점수 없이 저장된 결과)
+    return [(key, threshold) for key, threshold in SCORE_THRESHOLDS.items() if key in scores]
+
+def problem_mask(scores: Dict[str, np.ndarray]) -> np.ndarray:
+    """
+    점수 중 하나라도 기준을 초과하는 프레임의 마스크를 반환합니다.
+    """
+    return np.logical_or.reduce([np.asarray(scores[key]) > threshold for key, threshold in _thresholds(scores)])
+
+def smooth(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    중앙 이동 평균으로 점수 시계열을 평활화합니다. 양 끝은 가장자리 값으로 채웁니다. window가 1 이하이면 그대로 반환합니다.
+    """
+    if window <= 1 or len(values) == 0:
+        return values
+    padded = np.pad(values, (window // 2, window - 1 - window // 2), mode="edge")
+    return np.convolve(padded, np.ones(window) / window, mode="valid")
+
+def hysteresis(values: np.ndarray, enter: float, exit: float) -> np.ndarray:
+    """
+    enter를 초과하면 문제 상태로 들어가고, exit 이하로 내려갈 때까지 상태를 유지합니다.
+    기준 근처에서 점수가 흔들려도 하나의 구간으로 유지됩니다.
+    """
+    active = np.zeros(len(values), dtype=bool)
+    state = False
+    for index, value in enumerate(values):
+        state = value > enter or (state and value > exit)
+        active[index] = state
+    return active
+
+def _runs(active: np.ndarray) -> List[List[int]]:
+    # 연속된 True 구간의 [start, end] 목록
+    edges = np.diff(np.concatenate(([0], active.astype(np.int8), [0])))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1) - 1
+    return [[int(start), int(end)] for start, end in zip(starts, ends)]
+
+def detect_events(scores: Dict[str, np.ndarray], window: int = EVENT_SMOOTHING_WINDOW, hysteresis_margin: float = EVENT_HYSTERESIS, max_gap: int = EVENT_MAX_GAP) -> List[ScoreEvent]:
+    """
+    세그먼트의 점수 시계열에서 문제 행동 구간을 찾습니다.
+
+    1. 점수별로 window 크기의 이동 평균을 적용합니다.
+    2. 점수별 기준(SCORE_THRESHOLDS)을 초과하면 시작하고 (기준 - hysteresis_margin) 이하가 되면 끝나는 구간을 찾아 합칩니다.
+    3. max_gap 프레임 이하로 떨어진 구간은 하나로 합칩니다.
+    4. 구간마다 원래 점수의 기준 대비 비율이 가장 높은 프레임을 대표 프레임으로 고릅니다.
+
+    Args:
+        scores (Dict[str, np.ndarray]): SCORE_THRESHOLDS 키별 (T,) 점수 배열.
+        window (int): 이동 평균 프레임 수 (1이면 평활화하지 않음).
+        hysteresis_margin (float): 구간 종료 기준을 시작 기준보다 낮출 값.
+        max_gap (int): 하나로 합칠 구간 사이의 최대 프레임 수.
+
+    Returns:
+        List[ScoreEvent]: 시간 순서의 문제 구간 목록.
+    """
+    active = np.logical_or.reduce([
+        hysteresis(smooth(np.asarray(scores[key], dtype=np.float64), window), threshold, threshold - hysteresis_margin)
+        for key, threshold in _thresholds(scores)
+    ])
+
+    merged: List[List[int]] = []
+    for start, end in _runs(active):
+        if merged and start - merged[-1][1] - 1 <= max_gap:
+            merged[-1][1] = end
+        else:
+            merged.append([start, end])
+
+    # 기준 대비 비율이 가장 높은 점수로 프레임별 심각도 계산
+    severity = np.max([np.asarray(scores[key], dtype=np.float64) / threshold for key, threshold in _thresholds(scores)], axis=0)
+    return [ScoreEvent(start, end, start + int(np.argmax(severity[start:end + 1]))) for start, end in merged]
+
+def select_problem_events(scores: Dict[str, np.ndarray], merge: bool, window: int = EVENT_SMOOTHING_WINDOW, hysteresis_margin: float = EVENT_HYSTERESIS, max_gap: int = EVENT_MAX_GAP) -> List[ScoreEvent]:
+    """
+    VLM으로 분석할 문제 프레임을 고릅니다. merge이면 detect_events의 구간별 대표 프레임을,
+    아니면 기준을 초과한 모든 프레임을 각각 길이 1인 구간으로 반환합니다.
+    """
+    if merge:
+        return detect_events(scores, window, hysteresis_margin, max_gap)
+    return [ScoreEvent(idx, idx, idx) for idx in np.flatnonzero(problem_mask(scores)).tolist()]
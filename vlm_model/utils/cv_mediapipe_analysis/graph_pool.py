@@ -0,0 +1,177 @@
+# vlm_model/utils/cv_mediapipe_analysis/graph_pool.py
+
+import time
+import logging
+import threading
+from contextlib import ExitStack, contextmanager
+from typing import Dict, Iterator, List, Optional
+
+import numpy as np
+
+from vlm_model.config import MEDIAPIPE_ENGINE, MEDIAPIPE_ROI_CROP, MEDIAPIPE_GRAPH_POOL_SIZE, MEDIAPIPE_WARMUP, MEDIAPIPE_WARMUP_PROFILES, ANALYSIS_PROFILE
+from vlm_model.utils.cv_mediapipe_analysis.mediapipe_initializer import create_holistic, create_pose, create_face_mesh, create_hands
+from vlm_model.utils.cv_mediapipe_analysis.profiles import ANALYSIS_PROFILES, AnalysisProfile
+
+logger = logging.getLogger(__name__) # 로거 사용
+
+class GraphBundle:
+    """
+    한 비디오의 랜드마크 검출에 사용하는 Mediapipe 그래프 묶음입니다.
+    static_image_mode=False 그래프는 프레임 간 추적 상태를 가지므로, 한 번에 한 비디오만 사용해야 합니다.
+
+    roi_crop이면 포즈 결과로 얼굴/손 영역을 잘라 FaceMesh/Hands에 입력하며, 잘라낸 위치가 매 프레임 달라지므로
+    두 그래프는 추적 없이(static_image_mode=True) 생성합니다. holistic 엔진은 내부에서 같은 방식으로 동작하므로 무시됩니다.
+    """
+
+    def __init__(self, engine: str = MEDIAPIPE_ENGINE, roi_crop: bool = MEDIAPIPE_ROI_CROP, profile: AnalysisProfile = ANALYSIS_PROFILES["balanced"]):
+        self.engine = engine
+        self.roi_crop = roi_crop and engine != "holistic"
+        self.profile = profile
+        self.holistic = None
+        self.pose = None
+        self.face_mesh = None
+        self.hands = None
+        if engine == "holistic":
+            self.holistic = create_holistic(model_complexity=profile.model_complexity, refine_face_landmarks=profile.refine_face_landmarks)
+        else:
+            self.pose = create_pose(model_complexity=profile.model_complexity)
+            self.face_mesh = create_face_mesh(static_image_mode=self.roi_crop, refine_landmarks=profile.refine_face_landmarks)
+            self.hands = create_hands(static_image_mode=self.roi_crop, max_num_hands=profile.max_num_hands)
+
+    @property
+    def graphs(self) -> List[object]:
+        return [graph for graph in (self.holistic, self.pose, self.face_mesh, self.hands) if graph is not None]
+
+    def reset(self) -> None:
+        """
+        이전 비디오의 추적 상태를 버리고, 다음 프레임에서 처음부터 검출하도록 합니다.
+        """
+        for graph in self.graphs:
+            graph.reset()
+
+    def close(self) -> None:
+        for graph in self.graphs:
+            graph.close()
+
+    def warm_up(self, size: Optional[int] = None) -> None:
+        """
+        검은 프레임을 각 그래프에 한 번씩 통과시켜 모델 로딩과 첫 추론 비용을 요청 전에 미리 처리합니다.
+        size를 지정하지 않으면 프로필의 샘플 프레임 크기를 사용합니다.
+        """
+        size = size or self.profile.frame_size
+        dummy_frame = np.zeros((size, size, 3), dtype=np.uint8)
+        for graph in self.graphs:
+            graph.process(dummy_frame)
+        self.reset()
+
+class GraphPool:
+    """
+    GraphBundle을 빌려주고 돌려받는 풀입니다. 최대 size개의 묶음을 필요할 때 만들어 재사용하며,
+    모든 묶음이 사용 중이면 다른 비디오의 분석이 끝나 묶음이 반환될 때까지 대기합니다.
+    풀의 묶음은 모두 같은 분석 프로필로 생성합니다.
+    """
+
+    def __init__(self, size: int, profile: AnalysisProfile = ANALYSIS_PROFILES["balanced"]):
+        self.size = max(1, size)
+        self.profile = profile
+        self._available = threading.Semaphore(self.size)
+        self._lock = threading.Lock()
+        self._idle: List[GraphBundle] = []
+        self._created = 0
+
+    @contextmanager
+    def checkout(self) -> Iterator[GraphBundle]:
+        """
+        한 비디오(또는 세그먼트)를 분석하는 동안 독점적으로 사용할 GraphBundle을 빌립니다.
+        재사용하는 묶음은 이전 비디오의 추적 상태를 초기화한 뒤 반환합니다.
+
+        Yields:
+            GraphBundle: 사용할 그래프 묶음. with 블록이 끝나면 풀에 반환됩니다.
+        """
+        self._available.acquire()
+        bundle: Optional[GraphBundle] = None
+        try:
+            with self._lock:
+                if self._idle:
+                    bundle = self._idle.pop()
+            if bundle is None:
+                bundle = GraphBundle(profile=self.profile)
+                with self._lock:
+                    self._created += 1
+                    logger.info(f"Mediapipe 그래프 묶음 생성: {self._created}/{self.size} (engine={bundle.engine}, profile={self.profile.name})")
+            else:
+                bundle.reset()
+        except BaseException:
+            self._available.release()
+            raise
+
+        try:
+            yield bundle
+        finally:
+            with self._lock:
+                self._idle.append(bundle)
+            self._available.release()
+
+    def warm_up(self) -> None:
+        """
+        풀 크기만큼 묶음을 모두 만들어 예열합니다. 사용 중인 묶음이 있으면 반환될 때까지 대기합니다.
+        """
+        with ExitStack() as stack:
+            bundles = [stack.enter_context(self.checkout()) for _ in range(self.size)]
+            for bundle in bundles:
+                bundle.warm_up()
+
+# 분석 프로필별 프로세스 전역 그래프 풀 (세그먼트 병렬 분석 작업자 프로세스는 각자의 풀을 가짐)
+# 풀은 묶음을 필요할 때 만들므로, 사용하지 않는 프로필은 그래프를 생성하지 않음
+graph_pools: Dict[str, GraphPool] = {name: GraphPool(MEDIAPIPE_GRAPH_POOL_SIZE, profile) for name, profile in ANALYSIS_PROFILES.items()}
+graph_pool = graph_pools[ANALYSIS_PROFILE]  # 기본 프로필의 풀
+
+def checkout_graphs(profile: str = ANALYSIS_PROFILE):
+    """
+    프로세스 전역 그래프 풀에서 분석 프로필에 맞는 GraphBundle을 빌립니다. with 문과 함께 사용합니다.
+    """
+    return graph_pools[profile].checkout()
+
+# 그래프 예열 상태: "pending"(시작 전), "warming_up", "ready", "failed"
+_warm_up_state = "pending"
+_warm_up_lock = threading.Lock()
+
+def warm_up_state() -> str:
+    return _warm_up_state
+
+def warm_up_graphs() -> None:
+    """
+    MEDIAPIPE_WARMUP_PROFILES 프로필의 그래프 풀 묶음을 모두 생성하고 예열합니다.
+    실패해도 요청 처리 시 그래프를 다시 만들 수 있으므로 예외를 던지지 않습니다.
+    """
+    global _warm_up_state
+    with _warm_up_lock:
+        _warm_up_state = "warming_up"
+        started = time.perf_counter()
+        try:
+            for profile in MEDIAPIPE_WARMUP_PROFILES:
+                graph_pools[profile].warm_up()
+        except Exception as e:
+            _warm_up_state = "failed"
+            logger.error(f"Mediapipe 그래프 예열 실패: {e}", extra={
+                "errorType": type(e).__name__,
+                "error_message": str(e)
+            })
+            return
+        _warm_up_state = "ready"
+        logger.info(f"Mediapipe 그래프 예열 완료: 프로필 {', '.join(MEDIAPIPE_WARMUP_PROFILES)} ({(time.perf_counter() - started) * 1000:.0f}ms)")
+
+def start_warm_up(enabled: bool = MEDIAPIPE_WARMUP) -> Optional[threading.Thread]:
+    """
+    앱 시작 시 호출합니다. enabled이면 백그라운드 스레드에서 그래프를 예열하고, 아니면 첫 요청에서 그래프를 만들도록 바로 준비 완료로 표시합니다.
+
+    Returns:
+        Optional[threading.Thread]: 예열 스레드. 예열하지 않으면 None.
+    """
+    global _warm_up_state
+    if not enabled:
+        _warm_up_state = "ready"
+        return None
+    thread = threading.Thread(target=warm_up_graphs, name="mediapipe-warm-up", daemon=True)
+    thread.start()
+    return thread
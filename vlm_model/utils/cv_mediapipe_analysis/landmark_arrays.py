@@ -0,0 +1,98 @@
+# vlm_model/utils/cv_mediapipe_analysis/landmark_arrays.py
+
+from typing import NamedTuple, Optional, Sequence
+
+import numpy as np
+
+# 랜드마크 개수 (Mediapipe Pose, FaceMesh, Hands)
+POSE_LANDMARK_COUNT = 33
+FACE_LANDMARK_COUNT = 468
+HAND_LANDMARK_COUNT = 21
+MAX_HANDS = 2
+
+class FrameLandmarks(NamedTuple):
+    """
+    한 프레임의 랜드마크를 정규화 좌표 (x, y, z) float32 배열로 담습니다. 감지되지 않은 부위는 NaN으로 채워집니다.
+
+    - pose: (33, 3)
+    - face: (468, 3)
+    - hands: (2, 21, 3), 감지된 순서대로 채우며 손이 하나면 두 번째 손은 NaN
+    """
+    pose: np.ndarray
+    face: np.ndarray
+    hands: np.ndarray
+
+class LandmarkSeries(NamedTuple):
+    """
+    세그먼트 전체의 랜드마크를 프레임 축(T)으로 쌓은 배열입니다.
+
+    - pose: (T, 33, 3)
+    - face: (T, 468, 3)
+    - hands: (T, 2, 21, 3)
+    """
+    pose: np.ndarray
+    face: np.ndarray
+    hands: np.ndarray
+
+    def __len__(self) -> int:
+        return self.pose.shape[0]
+
+def _empty(shape) -> np.ndarray:
+    return np.full(shape, np.nan, dtype=np.float32)
+
+def landmarks_to_array(landmarks, count: int) -> np.ndarray:
+    """
+    Mediapipe NormalizedLandmarkList를 (count, 3) float32 배열로 변환합니다. landmarks가 None이면 NaN 배열을 반환합니다.
+    """
+    if landmarks is None:
+        return _empty((count, 3))
+    array = np.array([(point.x, point.y, point.z) for point in landmarks.landmark], dtype=np.float32)
+    if array.shape != (count, 3):
+        # 모델에 따라 랜드마크 수가 다를 수 있으므로 (예: 홍채 포함 478개) 앞의 count개만 사용
+        padded = _empty((count, 3))
+        padded[:min(count, len(array))] = array[:count]
+        return padded
+    return array
+
+def to_frame_landmarks(pose_landmarks=None, face_landmarks=None, multi_hand_landmarks: Optional[Sequence] = None) -> FrameLandmarks:
+    """
+    Mediapipe 결과를 FrameLandmarks로 변환합니다. 프레임마다 한 번만 호출하며, 이후 점수 계산은 배열로만 수행합니다.
+
+    Args:
+        pose_landmarks: Pose 결과의 pose_landmarks.
+        face_landmarks: FaceMesh 결과의 첫 번째 얼굴 랜드마크.
+        multi_hand_landmarks: Hands 결과의 multi_hand_landmarks.
+
+    Returns:
+        FrameLandmarks: 프레임 랜드마크 배열.
+    """
+    hands = _empty((MAX_HANDS, HAND_LANDMARK_COUNT, 3))
+    for slot, hand_landmarks in enumerate((multi_hand_landmarks or [])[:MAX_HANDS]):
+        hands[slot] = landmarks_to_array(hand_landmarks, HAND_LANDMARK_COUNT)
+    return FrameLandmarks(
+        pose=landmarks_to_array(pose_landmarks, POSE_LANDMARK_COUNT),
+        face=landmarks_to_array(face_landmarks, FACE_LANDMARK_COUNT),
+        hands=hands
+    )
+
+def empty_frame_landmarks() -> FrameLandmarks:
+    """
+    아무것도 감지되지 않은 프레임의 FrameLandmarks를 반환합니다.
+    """
+    return to_frame_landmarks()
+
+def stack_landmarks(frames: Sequence[FrameLandmarks]) -> LandmarkSeries:
+    """
+    프레임별 랜드마크를 프레임 축으로 쌓아 LandmarkSeries를 만듭니다.
+    """
+    if not frames:
+        return LandmarkSeries(
+            pose=_empty((0, POSE_LANDMARK_COUNT, 3)),
+            face=_empty((0, FACE_LANDMARK_COUNT, 3)),
+            hands=_empty((0, MAX_HANDS, HAND_LANDMARK_COUNT, 3))
+        )
+    return LandmarkSeries(
+        pose=np.stack([frame.pose for frame in frames]),
+        face=np.stack([frame.face for frame in frames]),
+        hands=np.stack([frame.hands for frame in frames])
+    )
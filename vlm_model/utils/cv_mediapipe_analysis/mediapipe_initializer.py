@@ -1,38 +1,103 @@
 # vlm_model/utils/cv_mediapipe_analysis/mediapipe_initializer.py
 
+import threading
+
 import mediapipe as mp
 
+from vlm_model.config import MEDIAPIPE_ENGINE
+
 # Mediapipe 솔루션 초기화
 mp_pose = mp.solutions.pose
 mp_face = mp.solutions.face_mesh
 mp_hands = mp.solutions.hands
+mp_holistic = mp.solutions.holistic
+
+def create_holistic(model_complexity: int = 1, refine_face_landmarks: bool = False):
+    """
+    Holistic: 포즈, 얼굴, 양손 랜드마크를 하나의 그래프로 검출하는 Mediapipe 솔루션
+    이미지 변환과 사람 검출을 프레임당 한 번만 수행합니다.
+    """
+    return mp_holistic.Holistic(
+        static_image_mode=False,           # False: 비디오 스트림에서 포즈 영역을 추적하여 얼굴/손 영역을 잘라냄
+        model_complexity=model_complexity, # 포즈 모델 복잡도 (0, 1, 2)
+        refine_face_landmarks=refine_face_landmarks,  # False: 홍채 랜드마크 없이 468개 얼굴 랜드마크만 검출
+        min_detection_confidence=0.5,      # 사람 감지의 최소 신뢰도
+        min_tracking_confidence=0.5        # 랜드마크 추적의 최소 신뢰도
+    )
+
+def create_pose(model_complexity: int = 1):
+    """
+    Pose: 사람의 자세(관절 위치) 분석을 위한 Mediapipe 솔루션
+    """
+    return mp_pose.Pose(
+        static_image_mode=False,           # False: 비디오 스트림에서 여러 프레임을 처리할 때 사용 (트래킹 가능)
+        model_complexity=model_complexity, # 포즈 모델 복잡도 (0: 가장 빠름, 1: 기본값, 2: 가장 정확)
+        min_detection_confidence=0.5,      # 포즈 감지의 최소 신뢰도 (0.5 이상일 때만 랜드마크 감지)
+        min_tracking_confidence=0.5        # 랜드마크 추적의 최소 신뢰도 (트래킹 실패 시 재감지 수행)
+    )
+
+def create_face_mesh(static_image_mode: bool = False, refine_landmarks: bool = False):
+    """
+    FaceMesh: 얼굴의 세부적인 랜드마크(468개 점)를 검출하는 Mediapipe 솔루션
+    포즈 기반 영역 잘라내기(MEDIAPIPE_ROI_CROP)에서는 매 프레임 잘라낸 위치가 달라지므로 static_image_mode=True로 생성합니다.
+    """
+    return mp_face.FaceMesh(
+        static_image_mode=static_image_mode,  # False: 비디오 스트림에서 실시간으로 얼굴 랜드마크를 감지
+        max_num_faces=1,                   # 최대 감지할 얼굴의 수 (여기서는 1명으로 제한)
+        refine_landmarks=refine_landmarks, # True: 눈/입술 주변을 정밀하게 검출하고 홍채 랜드마크 10개 추가
+        min_detection_confidence=0.5,      # 얼굴 감지의 최소 신뢰도
+        min_tracking_confidence=0.5        # 랜드마크 추적의 최소 신뢰도
+    )
+
+def create_hands(static_image_mode: bool = False, max_num_hands: int = 2):
+    """
+    Hands: 손의 랜드마크(21개 점)를 검출하는 Mediapipe 솔루션
+    """
+    return mp_hands.Hands(
+        static_image_mode=static_image_mode,  # False: 비디오 스트림에서 실시간으로 손 랜드마크 감지
+        max_num_hands=max_num_hands,       # 최대 감지할 손의 수 (기본값: 양손)
+        min_detection_confidence=0.3,      # 손 감지의 최소 신뢰도 (낮출수록 더 많이 감지하지만 정확도 감소)
+        min_tracking_confidence=0.3        # 랜드마크 추적의 최소 신뢰도
+    )
+
+class LazyGraph:
+    """
+    처음 사용할 때 factory로 Mediapipe 그래프를 생성하는 프록시입니다.
+    모듈을 import하는 것만으로 그래프가 생성되지 않도록 하여, 앱 시작과 테스트 수집, 작업자 프로세스 시작 시간을 줄입니다.
+    """
+
+    def __init__(self, factory):
+        self._factory = factory
+        self._graph = None
+        self._lock = threading.Lock()
+
+    @property
+    def created(self) -> bool:
+        return self._graph is not None
+
+    def get(self):
+        if self._graph is None:
+            with self._lock:
+                if self._graph is None:
+                    self._graph = self._factory()
+        return self._graph
+
+    def process(self, image):
+        return self.get().process(image)
+
+    def reset(self) -> None:
+        if self._graph is not None:
+            self._graph.reset()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._graph is not None:
+                self._graph.close()
+                self._graph = None
 
-# Mediapipe 객체 생성 (전역 한 번만 실행)
-
-# Pose: 사람의 자세(관절 위치) 분석을 위한 Mediapipe 솔루션
-pose = mp_pose.Pose(
-    static_image_mode=False,           # False: 비디오 스트림에서 여러 프레임을 처리할 때 사용 (트래킹 가능)
-    min_detection_confidence=0.5,      # 포즈 감지의 최소 신뢰도 (0.5 이상일 때만 랜드마크 감지)
-    min_tracking_confidence=0.5        # 랜드마크 추적의 최소 신뢰도 (트래킹 실패 시 재감지 수행)
-)
-
-# FaceMesh: 얼굴의 세부적인 랜드마크(468개 점)를 검출하는 Mediapipe 솔루션
-face_mesh = mp_face.FaceMesh(
-    static_image_mode=False,           # False: 비디오 스트림에서 실시간으로 얼굴 랜드마크를 감지
-    max_num_faces=1,                   # 최대 감지할 얼굴의 수 (여기서는 1명으로 제한)
-    min_detection_confidence=0.5,      # 얼굴 감지의 최소 신뢰도
-    min_tracking_confidence=0.5        # 랜드마크 추적의 최소 신뢰도
-)
-
-# Hands: 손의 랜드마크(21개 점)를 검출하는 Mediapipe 솔루션
-hands = mp_hands.Hands(
-    static_image_mode=False,           # False: 비디오 스트림에서 실시간으로 손 랜드마크 감지
-    max_num_hands=2,                   # 최대 감지할 손의 수 (여기서는 양손까지 지원)
-    min_detection_confidence=0.3,      # 손 감지의 최소 신뢰도 (낮출수록 더 많이 감지하지만 정확도 감소)
-    min_tracking_confidence=0.3        # 랜드마크 추적의 최소 신뢰도
-)
-
-
-# Mediapipe 초기화
-# hands = mp_hands.Hands(static_image_mode=False, max_num_hands=2, min_detection_confidence=0.5)
-# face_mesh = mp_face_mesh.FaceMesh(static_image_mode=False, max_num_faces=1, min_detection_confidence=0.5)
\ No newline at end of file
+# 단일 프레임 분석용 전역 그래프 (graphs 없이 호출한 analyze_frame, detect_landmarks)
+# 첫 호출 시 생성되며, 비디오 분석은 graph_pool에서 비디오별로 빌려주는 그래프를 사용
+holistic = LazyGraph(create_holistic) if MEDIAPIPE_ENGINE == "holistic" else None
+pose = LazyGraph(create_pose)
+face_mesh = LazyGraph(create_face_mesh)
+hands = LazyGraph(create_hands)
@@ -0,0 +1,29 @@
+# vlm_model/utils/cv_mediapipe_analysis/profiles.py
+
+from typing import Dict, NamedTuple
+
+from vlm_model.config import SAMPLE_FRAME_SIZE
+
+class AnalysisProfile(NamedTuple):
+    """
+    속도와 정확도를 맞바꾸는 Mediapipe 분석 설정입니다. 프로필마다 별도의 그래프 풀을 사용합니다.
+
+    - model_complexity: 포즈 모델 복잡도 (0: 가장 빠름 ~ 2: 가장 정확)
+    - refine_face_landmarks: 눈/입술 주변 랜드마크를 정밀하게 검출할지 여부 (시선 점수의 눈 위치가 정확해짐)
+    - max_num_hands: 검출할 최대 손 수
+    - frame_size: 분석용 샘플 프레임 크기 (정사각형 한 변)
+    - frame_interval: 샘플링 간격 (초)
+    """
+    name: str
+    model_complexity: int
+    refine_face_landmarks: bool
+    max_num_hands: int
+    frame_size: int
+    frame_interval: int
+
+ANALYSIS_PROFILES: Dict[str, AnalysisProfile] = {
+    "fast": AnalysisProfile("fast", model_complexity=0, refine_face_landmarks=False, max_num_hands=1, frame_size=192, frame_interval=2),
+    # 기존 고정 설정과 동일
+    "balanced": AnalysisProfile("balanced", model_complexity=1, refine_face_landmarks=False, max_num_hands=2, frame_size=SAMPLE_FRAME_SIZE, frame_interval=1),
+    "accurate": AnalysisProfile("accurate", model_complexity=2, refine_face_landmarks=True, max_num_hands=2, frame_size=384, frame_interval=1),
+}
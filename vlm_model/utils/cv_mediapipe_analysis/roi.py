@@ -0,0 +1,93 @@
+# vlm_model/utils/cv_mediapipe_analysis/roi.py
+
+from typing import Optional, Tuple
+
+import cv2
+import numpy as np
+
+# 관심 영역 (x0, y0, x1, y1), 프레임 픽셀 좌표
+Box = Tuple[int, int, int, int]
+
+# 포즈 랜드마크 인덱스 (mp_pose.PoseLandmark 값과 동일)
+FACE_POINTS = [0, 2, 5, 7, 8, 9, 10]  # 코, 양 눈, 양 귀, 입 양끝
+HAND_POINTS = [15, 16, 17, 18, 19, 20, 21, 22]  # 양 손목, 새끼/검지/엄지
+SHOULDERS = [11, 12]
+
+# 잘라낸 영역을 확대할 긴 변의 크기 (FaceMesh 입력 192, Hands 입력 224와 맞춤)
+FACE_ROI_SIZE = 192
+HAND_ROI_SIZE = 224
+
+# 이보다 작은 영역은 랜드마크를 찾기 어려우므로 전체 프레임을 사용
+MIN_ROI_PIXELS = 8
+
+def _square_box(center: np.ndarray, side: float, width: int, height: int) -> Optional[Box]:
+    side = int(np.ceil(side))
+    left, top = int(round(center[0] - side / 2)), int(round(center[1] - side / 2))
+    # 프레임 경계에서는 잘려서 정사각형이 아닐 수 있음
+    x0, y0 = max(0, left), max(0, top)
+    x1, y1 = min(width, left + side), min(height, top + side)
+    if x1 - x0 < MIN_ROI_PIXELS or y1 - y0 < MIN_ROI_PIXELS:
+        return None
+    return x0, y0, x1, y1
+
+def face_roi(pose: np.ndarray, width: int, height: int, scale: float = 2.2) -> Optional[Box]:
+    """
+    포즈의 코, 눈, 귀, 입 위치로 얼굴 영역을 계산합니다.
+
+    Args:
+        pose (np.ndarray): (33, 3) 정규화 포즈 랜드마크.
+        width (int): 프레임 너비.
+        height (int): 프레임 높이.
+        scale (float): 얼굴 랜드마크 범위 대비 영역 크기 배율 (이마와 턱 포함).
+
+    Returns:
+        Optional[Box]: 정사각형 얼굴 영역. 포즈가 없거나 영역이 너무 작으면 None.
+    """
+    points = pose[FACE_POINTS, :2] * (width, height)
+    if np.isnan(points).any():
+        return None
+    extent = (points.max(axis=0) - points.min(axis=0)).max()
+    return _square_box(points.mean(axis=0), extent * scale, width, height)
+
+def hands_roi(pose: np.ndarray, width: int, height: int, margin: float = 0.4) -> Optional[Box]:
+    """
+    포즈의 양 손목과 손가락 위치로 두 손을 모두 포함하는 영역을 계산합니다.
+    Hands 그래프 한 번에 두 손을 검출하도록 양손을 한 영역으로 묶습니다.
+
+    Args:
+        pose (np.ndarray): (33, 3) 정규화 포즈 랜드마크.
+        width (int): 프레임 너비.
+        height (int): 프레임 높이.
+        margin (float): 어깨 너비 대비 여백 (손바닥과 손가락 끝 포함).
+
+    Returns:
+        Optional[Box]: 정사각형 손 영역. 포즈가 없거나 영역이 너무 작으면 None.
+    """
+    points = pose[HAND_POINTS, :2] * (width, height)
+    shoulders = pose[SHOULDERS, :2] * (width, height)
+    if np.isnan(points).any() or np.isnan(shoulders).any():
+        return None
+    padding = max(np.linalg.norm(shoulders[0] - shoulders[1]) * margin, MIN_ROI_PIXELS)
+    lower, upper = points.min(axis=0) - padding, points.max(axis=0) + padding
+    return _square_box((lower + upper) / 2, (upper - lower).max(), width, height)
+
+def crop_roi(rgb_frame: np.ndarray, box: Box, size: int) -> np.ndarray:
+    """
+    프레임에서 영역을 잘라 긴 변이 size가 되도록 비율을 유지하며 확대합니다.
+    """
+    x0, y0, x1, y1 = box
+    patch = rgb_frame[y0:y1, x0:x1]
+    scale = size / max(x1 - x0, y1 - y0)
+    return cv2.resize(patch, (max(1, round((x1 - x0) * scale)), max(1, round((y1 - y0) * scale))), interpolation=cv2.INTER_LINEAR)
+
+def roi_to_frame(landmarks: np.ndarray, box: Box, width: int, height: int) -> np.ndarray:
+    """
+    잘라낸 영역 기준의 정규화 랜드마크 (..., 3)을 프레임 기준 정규화 좌표로 변환합니다.
+    z는 이미지 너비 기준이므로 영역 너비 비율로 조정합니다. NaN(미검출)은 그대로 유지됩니다.
+    """
+    x0, y0, x1, y1 = box
+    mapped = landmarks.copy()
+    mapped[..., 0] = (x0 + landmarks[..., 0] * (x1 - x0)) / width
+    mapped[..., 1] = (y0 + landmarks[..., 1] * (y1 - y0)) / height
+    mapped[..., 2] = landmarks[..., 2] * (x1 - x0) / width
+    return mapped
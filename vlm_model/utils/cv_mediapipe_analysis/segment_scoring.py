@@ -0,0 +1,237 @@
+# vlm_model/utils/cv_mediapipe_analysis/segment_scoring.py
+
+from typing import Dict, Sequence, Union
+
+import numpy as np
+
+from vlm_model.utils.cv_mediapipe_analysis.landmark_arrays import FrameLandmarks, LandmarkSeries, stack_landmarks
+
+# 랜드마크 인덱스 (mp_pose.PoseLandmark, mp_hands.HandLandmark 값과 동일)
+NOSE = 0
+LEFT_SHOULDER = 11
+RIGHT_SHOULDER = 12
+LEFT_EYE = 33
+RIGHT_EYE = 263
+WRIST = 0
+THUMB_TIP = 4
+INDEX_FINGER_TIP = 8
+
+# 얼굴 표정 랜드마크 인덱스 (FaceMesh 468점)
+UPPER_LIP = 13
+LOWER_LIP = 14
+MOUTH_LEFT = 61
+MOUTH_RIGHT = 291
+LEFT_BROW = 105
+LEFT_UPPER_EYELID = 159
+RIGHT_BROW = 334
+RIGHT_UPPER_EYELID = 386
+
+SCORE_KEYS = ("posture_score", "gaze_score", "gestures_score", "sudden_movement_score", "facial_expression_score")
+
+def _detected(points: np.ndarray) -> np.ndarray:
+    # 랜드마크가 감지된 프레임(또는 손) 마스크: 첫 번째 점의 x가 NaN이 아니면 감지된 것으로 간주
+    return ~np.isnan(points[..., 0, 0])
+
+def _last_detected_index(detected: np.ndarray) -> np.ndarray:
+    """
+    각 프레임 위치에서 그 프레임까지(포함) 마지막으로 감지된 프레임의 인덱스를 반환합니다. 없으면 -1.
+    """
+    indices = np.where(detected, np.arange(len(detected)), -1)
+    return np.maximum.accumulate(indices) if len(indices) else indices
+
+def _previous_detected(values: np.ndarray, detected: np.ndarray):
+    """
+    각 프레임의 "이전 감지 프레임" 값과 그 존재 여부를 반환합니다.
+    감지되지 않은 프레임은 직전 값을 이어서 사용하는(forward fill) 기존 프레임별 분석의 이전 랜드마크 규칙과 같습니다.
+    """
+    last = _last_detected_index(detected)
+    previous = np.concatenate(([-1], last[:-1])) if len(last) else last
+    filled = values[np.maximum(previous, 0)]
+    return filled, previous >= 0
+
+def head_position_scores(pose: np.ndarray) -> np.ndarray:
+    """
+    코 위치가 화면 중앙에서 벗어난 정도로 자세 점수를 계산합니다 (0: 좋음 ~ 1: 나쁨).
+    X축은 프레임 너비의 10%, Y축은 높이의 20%를 허용 범위로 정규화합니다. 포즈가 없는 프레임은 0입니다.
+
+    Args:
+        pose (np.ndarray): (T, 33, 3) 포즈 랜드마크.
+
+    Returns:
+        np.ndarray: (T,) 자세 점수.
+    """
+    nose = pose[:, NOSE, :2].astype(np.float64)
+    x_score = np.minimum(np.abs(nose[:, 0] - 0.5) / 0.1, 1.0)
+    y_score = np.minimum(np.abs(nose[:, 1] - 0.5) / 0.2, 1.0)
+    scores = np.round((x_score + y_score) / 2, 2)
+    return np.where(_detected(pose), scores, 0.0)
+
+def sudden_movement_scores(pose: np.ndarray, threshold: float = 0.1) -> np.ndarray:
+    """
+    양 어깨 중심점의 프레임 간 이동 거리로 갑작스러운 움직임 점수를 계산합니다.
+    이전 포즈가 없는 첫 감지 프레임은 0.1, 포즈가 없는 프레임은 0입니다.
+
+    Args:
+        pose (np.ndarray): (T, 33, 3) 포즈 랜드마크.
+        threshold (float): 점수 1에 해당하는 이동 거리.
+
+    Returns:
+        np.ndarray: (T,) 움직임 점수.
+    """
+    detected = _detected(pose)
+    centers = pose[:, [LEFT_SHOULDER, RIGHT_SHOULDER], :2].astype(np.float64).mean(axis=1)
+    # 감지되지 않은 프레임을 직전 중심점으로 채운 뒤 프레임 간 차이를 계산
+    last = _last_detected_index(detected)
+    filled = centers[np.maximum(last, 0)]
+    movement = np.zeros(len(pose))
+    if len(pose) > 1:
+        movement[1:] = np.linalg.norm(np.diff(filled, axis=0), axis=1)
+    has_previous = np.concatenate(([False], last[:-1] >= 0)) if len(last) else last >= 0
+    scores = np.where(has_previous, np.round(np.minimum(movement / threshold, 1.0), 2), 0.1)
+    return np.where(detected, scores, 0.0)
+
+def lack_of_eye_contact_scores(face: np.ndarray) -> np.ndarray:
+    """
+    양쪽 눈의 x좌표가 화면 중앙(너비 40%~60%)에서 벗어난 정도로 시선 부족 점수를 계산합니다. 얼굴이 없는 프레임은 0입니다.
+
+    Args:
+        face (np.ndarray): (T, 468, 3) 얼굴 랜드마크.
+
+    Returns:
+        np.ndarray: (T,) 시선 부족 점수.
+    """
+    eyes_x = face[:, [LEFT_EYE, RIGHT_EYE], 0].astype(np.float64)
+    deviation = np.maximum(np.maximum(0.4 - eyes_x, eyes_x - 0.6), 0.0).sum(axis=1)
+    scores = np.round(np.minimum(deviation / 0.1, 1.0), 2)
+    return np.where(_detected(face), scores, 0.0)
+
+def gestures_scores(hands: np.ndarray, gesture_threshold: float = 0.2, movement_threshold: float = 0.1) -> np.ndarray:
+    """
+    과도한 제스처 점수(엄지-검지 끝 거리)와 손 움직임 점수(이전 프레임 대비 손목 이동 거리)의 평균을 계산합니다.
+    각 점수는 감지된 손 중 최댓값을 사용하며, 둘 중 하나라도 0이면(손이 없거나 이전 손이 없는 경우) 0.1입니다.
+
+    Args:
+        hands (np.ndarray): (T, 2, 21, 3) 손 랜드마크.
+        gesture_threshold (float): 제스처 점수 1에 해당하는 엄지-검지 거리.
+        movement_threshold (float): 움직임 점수 1에 해당하는 손목 이동 거리.
+
+    Returns:
+        np.ndarray: (T,) gestures 점수.
+    """
+    points = hands[..., :2].astype(np.float64)
+
+    # 과도한 제스처: 손별 엄지-검지 끝 거리 → 감지된 손 중 최댓값
+    spread = np.linalg.norm(points[:, :, THUMB_TIP] - points[:, :, INDEX_FINGER_TIP], axis=-1)
+    excessive = np.nan_to_num(np.fmax.reduce(np.round(np.minimum(spread / gesture_threshold, 1.0), 2), axis=1))
+
+    # 손 움직임: 이전 감지 프레임의 첫 번째 손 손목과 현재 각 손 손목의 거리 → 최댓값
+    previous_wrist, has_previous = _previous_detected(points[:, 0, WRIST], _detected(hands[:, 0]))
+    travel = np.linalg.norm(points[:, :, WRIST] - previous_wrist[:, None, :], axis=-1)
+    movement = np.nan_to_num(np.fmax.reduce(np.round(np.minimum(travel / movement_threshold, 1.0), 2), axis=1))
+    movement = np.where(has_previous, movement, 0.0)
+
+    return np.where((excessive <= 0.0) | (movement <= 0.0), 0.1, np.round((excessive + movement) / 2, 2))
+
+def _window_std(values: np.ndarray, window: int):
+    """
+    NaN을 제외하고 각 프레임을 중심으로 한 window 프레임의 표준편차와 유효 프레임 수를 반환합니다.
+    """
+    valid = ~np.isnan(values)
+    filled = np.where(valid, values, 0.0)
+    padding = (window // 2, window - 1 - window // 2)
+
+    def window_sum(array):
+        cumulative = np.concatenate(([0.0], np.cumsum(np.pad(array, padding))))
+        return cumulative[window:] - cumulative[:-window]
+
+    count = window_sum(valid.astype(np.float64))
+    mean = window_sum(filled) / np.maximum(count, 1)
+    variance = np.maximum(window_sum(filled * filled) / np.maximum(count, 1) - mean * mean, 0.0)
+    return np.sqrt(variance), count
+
+def expression_features(face: np.ndarray) -> np.ndarray:
+    """
+    얼굴 크기(양 눈 사이 거리)로 정규화한 입 벌림, 입 너비, 눈썹 높이를 계산합니다.
+
+    Args:
+        face (np.ndarray): (T, 468, 3) 얼굴 랜드마크.
+
+    Returns:
+        np.ndarray: (T, 3) 표정 특징. 얼굴이 없는 프레임은 NaN.
+    """
+    points = face[..., :2].astype(np.float64)
+
+    def distance(a, b):
+        return np.linalg.norm(points[:, a] - points[:, b], axis=-1)
+
+    eye_distance = distance(LEFT_EYE, RIGHT_EYE)
+    eye_distance = np.where(eye_distance > 0, eye_distance, np.nan)
+    brow_height = (distance(LEFT_BROW, LEFT_UPPER_EYELID) + distance(RIGHT_BROW, RIGHT_UPPER_EYELID)) / 2
+    features = np.stack([distance(UPPER_LIP, LOWER_LIP), distance(MOUTH_LEFT, MOUTH_RIGHT), brow_height], axis=1)
+    return features / eye_distance[:, None]
+
+def facial_expression_scores(face: np.ndarray, window: int = 10, flat_level: float = 0.01, excessive_level: float = 0.15) -> np.ndarray:
+    """
+    입과 눈썹 움직임의 변화량으로 얼굴 표정 점수를 계산합니다 (0: 좋음 ~ 1: 나쁨).
+    프레임을 중심으로 window 프레임 동안 표정 특징의 표준편차 평균(표정 변화량)을 구해
+    무표정(변화량이 flat_level 근처 이하)과 과도한 표정 변화(변화량이 excessive_level에 가까움)를 모두 점수로 나타냅니다.
+    얼굴이 없는 프레임과 window 안에 얼굴이 감지된 프레임이 2개 미만이면 0입니다.
+
+    Args:
+        face (np.ndarray): (T, 468, 3) 얼굴 랜드마크.
+        window (int): 변화량을 계산할 프레임 수.
+        flat_level (float): 무표정으로 판단하는 변화량 (이 값의 2배 이상이면 무표정 점수 0).
+        excessive_level (float): 과도한 표정 변화 점수 1에 해당하는 변화량.
+
+    Returns:
+        np.ndarray: (T,) 얼굴 표정 점수.
+    """
+    if len(face) == 0:
+        return np.zeros(0)
+    features = expression_features(face)
+    deviations, counts = zip(*(_window_std(features[:, column], window) for column in range(features.shape[1])))
+    activity = np.mean(deviations, axis=0)
+
+    flat = np.clip((2 * flat_level - activity) / flat_level, 0.0, 1.0)
+    excessive = np.clip(activity / excessive_level, 0.0, 1.0)
+    scores = np.round(np.maximum(flat, excessive), 2)
+    judged = ~np.isnan(features).any(axis=1) & (np.min(counts, axis=0) >= 2)
+    return np.where(judged, scores, 0.0)
+
+def score_segment(landmarks: Union[LandmarkSeries, Sequence[FrameLandmarks]]) -> Dict[str, np.ndarray]:
+    """
+    세그먼트 전체 프레임의 Mediapipe 점수를 한 번에 계산합니다.
+    이전 프레임과 비교하는 점수는 세그먼트 안에서만 비교하며, 랜드마크가 감지되지 않은 프레임은 건너뛰고 직전 감지 프레임과 비교합니다.
+
+    Args:
+        landmarks (Union[LandmarkSeries, Sequence[FrameLandmarks]]): 프레임 순서대로의 랜드마크.
+
+    Returns:
+        Dict[str, np.ndarray]: SCORE_KEYS별 (T,) 점수 배열 (소수점 두 자리).
+    """
+    if not isinstance(landmarks, LandmarkSeries):
+        landmarks = stack_landmarks(landmarks)
+    return {
+        "posture_score": head_position_scores(landmarks.pose),
+        "gaze_score": lack_of_eye_contact_scores(landmarks.face),
+        "gestures_score": gestures_scores(landmarks.hands),
+        "sudden_movement_score": sudden_movement_scores(landmarks.pose),
+        "facial_expression_score": facial_expression_scores(landmarks.face)
+    }
+
+def score_sampled_frames(landmarks: Union[LandmarkSeries, Sequence[FrameLandmarks]], score_rows: Sequence[int], skipped: Sequence[bool]) -> Dict[str, np.ndarray]:
+    """
+    랜드마크를 검출한 프레임의 점수를 계산한 뒤 세그먼트의 모든 샘플 프레임으로 펼칩니다.
+    움직임 게이트로 검출을 생략한 프레임은 직전 검출 프레임의 점수를 사용하되, 움직임이 없으므로 sudden_movement_score는 0입니다.
+
+    Args:
+        landmarks (Union[LandmarkSeries, Sequence[FrameLandmarks]]): 검출한 프레임의 랜드마크.
+        score_rows (Sequence[int]): 샘플 프레임별로 사용할 landmarks의 위치.
+        skipped (Sequence[bool]): 샘플 프레임별 검출 생략 여부.
+
+    Returns:
+        Dict[str, np.ndarray]: SCORE_KEYS별 샘플 프레임 수 길이의 점수 배열.
+    """
+    scores = {key: np.asarray(values, dtype=np.float64)[np.asarray(score_rows, dtype=np.intp)] for key, values in score_segment(landmarks).items()}
+    scores["sudden_movement_score"][np.asarray(skipped, dtype=bool)] = 0.0
+    return scores
@@ -1,10 +1,14 @@
 # utils/download_video.py
 
 import cv2
+import math
 import numpy as np
-from typing import Optional
+from typing import Iterator, List, Optional, Tuple
 import logging
 from vlm_model.exceptions import VideoProcessingError
+from vlm_model.utils.media_probe import load_media_info
+from vlm_model.utils.seek_video import get_keyframe_index, read_frames_with_seek
+from vlm_model.utils.ffmpeg_decoder import use_ffmpeg_backend, probe_video_stream, iter_sampled_frames_ffmpeg
 import traceback
 
 # 모듈별 로거 생성
@@ -13,6 +17,7 @@ logger = logging.getLogger(__name__)
 def download_and_sample_video_local(video_path: str, start_time: int = 0, duration: int = 60, frame_interval: int = 1, target_size=(256, 256)) -> Optional[np.ndarray]:
     """
     지정된 비디오 파일에서 특정 시작 시간과 지속 시간 내에서 일정 간격으로 프레임을 추출합니다.
+    VIDEO_DECODER_BACKEND가 "ffmpeg"이면 ffmpeg 파이프 디코더를 사용하고, 실패하면 OpenCV로 대체합니다.
     
     Args:
         video_path (str): 추출할 비디오 파일의 경로.
@@ -24,6 +29,51 @@ def download_and_sample_video_local(video_path: str, start_time: int = 0, durati
     Returns:
         Optional[np.ndarray]: 추출된 프레임들의 NumPy 배열. 추출에 실패하면 None 반환.
     
+    Raises:
+        VideoProcessingError: 비디오 파일을 열거나 프레임을 추출하는 과정에서 오류가 발생한 경우.
+    """
+    _, frames = sample_segment_frames(video_path, start_time, duration, frame_interval, target_size)
+    return frames
+
+def sample_segment_frames(video_path: str, start_time: int = 0, duration: int = 60, frame_interval: int = 1, target_size=(256, 256)) -> Tuple[List[int], np.ndarray]:
+    """
+    download_and_sample_video_local과 같이 프레임을 추출하고, 각 프레임의 원본 비디오 프레임 인덱스를 함께 반환합니다.
+    OpenCV 경로는 실제로 읽은 프레임 인덱스를, ffmpeg 경로는 stream_sampled_frames와 같은 방식으로 계산한 인덱스를 사용합니다.
+
+    Returns:
+        Tuple[List[int], np.ndarray]: (프레임 인덱스 리스트, 추출된 프레임들의 NumPy 배열)
+
+    Raises:
+        VideoProcessingError: 비디오 파일을 열거나 프레임을 추출하는 과정에서 오류가 발생한 경우.
+    """
+    if use_ffmpeg_backend():
+        try:
+            frames = list(iter_sampled_frames_ffmpeg(video_path, frame_interval, target_size, start_time, duration))
+            if not frames:
+                raise VideoProcessingError("FFmpeg로 추출된 프레임이 없습니다.")
+            logger.debug(f"FFmpeg로 추출된 프레임 수: {len(frames)}")
+            fps = probe_video_stream(video_path)["fps"] or 30.0
+            frame_indices = [int(round((start_time + i * frame_interval) * fps)) for i in range(len(frames))]
+            return frame_indices, np.stack(frames)
+        except VideoProcessingError as e:
+            logger.info(f"FFmpeg 디코더 사용에 실패하여 OpenCV로 대체합니다: {e.message}")
+
+    return _download_and_sample_opencv(video_path, start_time, duration, frame_interval, target_size)
+
+def _download_and_sample_opencv(video_path: str, start_time: int = 0, duration: int = 60, frame_interval: int = 1, target_size=(256, 256)) -> Tuple[List[int], np.ndarray]:
+    """
+    OpenCV로 지정된 비디오 파일에서 특정 시작 시간과 지속 시간 내에서 일정 간격으로 프레임을 추출합니다.
+    
+    Args:
+        video_path (str): 추출할 비디오 파일의 경로.
+        start_time (int, optional): 프레임 추출을 시작할 시간(초). 기본값은 0초.
+        duration (int, optional): 프레임을 추출할 지속 시간(초). 기본값은 60초.
+        frame_interval (int, optional): 프레임을 추출할 간격(초). 기본값은 1초.
+        target_size (tuple, optional): 추출된 프레임의 크기 (가로, 세로).
+    
+    Returns:
+        Tuple[List[int], np.ndarray]: (읽은 프레임의 원본 인덱스 리스트, 추출된 프레임들의 NumPy 배열)
+    
     Raises:
         VideoProcessingError: 비디오 파일을 열거나 프레임을 추출하는 과정에서 오류가 발생한 경우.
     """
@@ -38,7 +88,9 @@ def download_and_sample_video_local(video_path: str, start_time: int = 0, durati
                 })
             raise VideoProcessingError(f"비디오 파일을 열 수 없습니다: {video_path}")
 
-        fps = cap.get(cv2.CAP_PROP_FPS)
+        # 업로드 시 저장된 메타데이터의 평균 FPS를 우선 사용 (webm 등에서 컨테이너 FPS가 부정확한 경우 대비)
+        media_info = load_media_info(video_path)
+        fps = media_info["fps"] if media_info and media_info.get("fps") else cap.get(cv2.CAP_PROP_FPS)
         if fps == 0:
             logger.info(f"FPS 값을 불러올 수 없어 기본값(30.0)을 사용합니다.")
             fps = 30.0  # 기본 FPS 설정
@@ -54,25 +106,31 @@ def download_and_sample_video_local(video_path: str, start_time: int = 0, durati
         logger.debug(f"추출할 프레임 인덱스: {frame_indices}")
 
         frames = []
-        frame_counter = 0
+        keyframes = get_keyframe_index(video_path)
 
-        while True:
-            ret, frame = cap.read()
-            if not ret:
-                logger.error(f"프레임 {frame_counter} 읽기 실패", extra={
-                    "errorType": "FrameReadError",
-                    "error_message": f"프레임 {frame_counter} 읽기 실패 - 비디오가 예상보다 짧을 수 있습니다."})
-                break
+        if len(keyframes) > 1:
+            # 시작 프레임 직전 키프레임으로 이동하여 앞부분 디코딩을 생략
+            frames = [cv2.resize(frame, target_size) for frame in read_frames_with_seek(cap, frame_indices, keyframes)]
+        else:
+            frame_counter = 0
 
-            if frame_counter in frame_indices:
-                # 이미지 크기 조정
-                frame = cv2.resize(frame, target_size)  # 지정된 크기로 리사이즈
-                frames.append(frame)
-                logger.debug(f"프레임 {frame_counter} 추가")
-                if len(frames) == len(frame_indices):
+            while True:
+                ret, frame = cap.read()
+                if not ret:
+                    logger.error(f"프레임 {frame_counter} 읽기 실패", extra={
+                        "errorType": "FrameReadError",
+                        "error_message": f"프레임 {frame_counter} 읽기 실패 - 비디오가 예상보다 짧을 수 있습니다."})
                     break
 
-            frame_counter += 1
+                if frame_counter in frame_indices:
+                    # 이미지 크기 조정
+                    frame = cv2.resize(frame, target_size)  # 지정된 크기로 리사이즈
+                    frames.append(frame)
+                    logger.debug(f"프레임 {frame_counter} 추가")
+                    if len(frames) == len(frame_indices):
+                        break
+
+                frame_counter += 1
 
         cap.release()
 
@@ -84,7 +142,163 @@ def download_and_sample_video_local(video_path: str, start_time: int = 0, durati
             raise VideoProcessingError("지정된 프레임 인덱스에 해당하는 프레임을 찾을 수 없습니다.")
 
         logger.debug(f"총 추출된 프레임 수: {len(frames)}")
-        return np.array(frames)
+        # 비디오 끝에서 읽기가 끝나면 앞쪽 인덱스의 프레임만 추출됨
+        return frame_indices[:len(frames)], np.array(frames)
+
+    except VideoProcessingError as e:
+        logger.error("비디오 처리 중 오류 발생", extra={
+            "errorType": "VideoProcessingError",
+            "error_message": e.message
+        })
+        raise VideoProcessingError("비디오에서 처리 중 오류가 발생했습니다.") from e
+    except Exception as e:
+        logger.error(f"비디오에서 프레임 추출 중 오류 발생: {e}", extra={
+            "errorType": type(e).__name__,
+            "error_message": str(e)
+        })
+        raise VideoProcessingError("비디오에서 프레임 추출 중 서버 오류가 발생했습니다.") from e
+
+def stream_sampled_frames(video_path: str, segment_length: int = 60, frame_interval: int = 1, target_size=(256, 256), end_time: Optional[float] = None) -> Iterator[Tuple[int, int, float, np.ndarray]]:
+    """
+    비디오를 한 번만 디코딩하면서 세그먼트별로 일정 간격의 프레임을 지연(lazy) 방식으로 반환합니다.
+    VIDEO_DECODER_BACKEND가 "ffmpeg"이면 ffmpeg 파이프 디코더를 사용하고, 첫 프레임 전에 실패하면 OpenCV로 대체합니다.
+
+    Args:
+        video_path (str): 추출할 비디오 파일의 경로.
+        segment_length (int, optional): 세그먼트 길이(초). 기본값은 60초.
+        frame_interval (int, optional): 프레임을 추출할 간격(초). 기본값은 1초.
+        target_size (tuple, optional): 추출된 프레임의 크기 (가로, 세로).
+        end_time (Optional[float], optional): 이 시간(초) 이후에 시작하는 세그먼트는 추출하지 않음. None이면 비디오 끝까지.
+
+    Yields:
+        Tuple[int, int, float, np.ndarray]: (segment_index, frame_idx, timestamp, frame)
+
+    Raises:
+        VideoProcessingError: 비디오 파일을 열거나 프레임을 추출하는 과정에서 오류가 발생한 경우.
+    """
+    if use_ffmpeg_backend():
+        yielded = False
+        try:
+            for item in _stream_sampled_frames_ffmpeg(video_path, segment_length, frame_interval, target_size, end_time):
+                yielded = True
+                yield item
+            return
+        except VideoProcessingError as e:
+            if yielded:
+                raise
+            logger.info(f"FFmpeg 디코더 사용에 실패하여 OpenCV로 대체합니다: {e.message}")
+
+    yield from _stream_sampled_frames_opencv(video_path, segment_length, frame_interval, target_size, end_time)
+
+def _stream_sampled_frames_ffmpeg(video_path: str, segment_length: int, frame_interval: int, target_size, end_time: Optional[float]) -> Iterator[Tuple[int, int, float, np.ndarray]]:
+    """
+    ffmpeg fps/scale 필터로 샘플링된 프레임에 세그먼트 인덱스와 타임스탬프를 붙여 반환합니다.
+    """
+    fps = probe_video_stream(video_path)["fps"] or 30.0
+
+    duration = None
+    if end_time is not None:
+        # end_time 이전에 시작하는 세그먼트까지만 디코딩
+        duration = math.ceil(int(end_time) / segment_length) * segment_length
+        if duration <= 0:
+            return
+
+    for sample_index, frame in enumerate(iter_sampled_frames_ffmpeg(video_path, frame_interval, target_size, duration=duration)):
+        timestamp = sample_index * frame_interval
+        yield int(timestamp // segment_length), int(round(timestamp * fps)), timestamp, frame
+
+def _stream_sampled_frames_opencv(video_path: str, segment_length: int = 60, frame_interval: int = 1, target_size=(256, 256), end_time: Optional[float] = None) -> Iterator[Tuple[int, int, float, np.ndarray]]:
+    """
+    OpenCV로 비디오를 한 번만 열어 처음부터 끝까지 한 번에 디코딩하면서, 세그먼트별로 일정 간격의 프레임을 지연(lazy) 방식으로 반환합니다.
+
+    세그먼트마다 비디오를 다시 열고 0번 프레임부터 디코딩하던 방식과 달리 전체 디코딩 비용이 비디오 길이에 비례합니다.
+    샘플링 대상이 아닌 프레임은 grab()으로 건너뛰어 색 변환 비용도 생략합니다.
+
+    Args:
+        video_path (str): 추출할 비디오 파일의 경로.
+        segment_length (int, optional): 세그먼트 길이(초). 기본값은 60초.
+        frame_interval (int, optional): 프레임을 추출할 간격(초). 기본값은 1초.
+        target_size (tuple, optional): 추출된 프레임의 크기 (가로, 세로).
+        end_time (Optional[float], optional): 이 시간(초) 이후에 시작하는 세그먼트는 추출하지 않음. None이면 비디오 끝까지.
+
+    Yields:
+        Tuple[int, int, float, np.ndarray]: (segment_index, frame_idx, timestamp, frame)
+            - segment_index: 세그먼트 인덱스 (0부터 시작)
+            - frame_idx: 비디오 전체 기준 프레임 인덱스
+            - timestamp: 프레임의 타임스탬프(초)
+            - frame: 리사이즈된 프레임
+
+    Raises:
+        VideoProcessingError: 비디오 파일을 열거나 프레임을 추출하는 과정에서 오류가 발생한 경우.
+    """
+    logger.info("스트리밍 Frame 추출을 시작합니다.")
+
+    cap = None
+    try:
+        cap = cv2.VideoCapture(video_path)
+        if not cap.isOpened():
+            logger.error(f"비디오 파일을 열 수 없습니다: {video_path}", extra={
+                    "errorType": "VideoProcessingError",
+                    "error_message": f"비디오 파일을 열 수 없습니다: {video_path}"
+                })
+            raise VideoProcessingError(f"비디오 파일을 열 수 없습니다: {video_path}")
+
+        # 업로드 시 저장된 메타데이터의 평균 FPS를 우선 사용 (webm 등에서 컨테이너 FPS가 부정확한 경우 대비)
+        media_info = load_media_info(video_path)
+        fps = media_info["fps"] if media_info and media_info.get("fps") else cap.get(cv2.CAP_PROP_FPS)
+        if fps == 0:
+            logger.info(f"FPS 값을 불러올 수 없어 기본값(30.0)을 사용합니다.")
+            fps = 30.0  # 기본 FPS 설정
+        logger.debug(f"비디오 FPS: {fps}")
+
+        # 세그먼트 경계와 샘플 간격은 download_and_sample_video_local과 동일하게 계산
+        step = max(int(frame_interval * fps), 1)
+        segment_limit = int(end_time) if end_time is not None else None
+
+        segment_index = 0
+        start_frame = 0
+        end_frame = int(segment_length * fps)
+        next_frame = start_frame
+        sample_count = 0
+        frame_counter = 0
+        total_yielded = 0
+
+        while True:
+            if segment_limit is not None and segment_index * segment_length >= segment_limit:
+                break
+
+            # 현재 세그먼트를 벗어나면 다음 세그먼트로 이동
+            if frame_counter >= end_frame:
+                segment_index += 1
+                start_frame = int(segment_index * segment_length * fps)
+                end_frame = int((segment_index + 1) * segment_length * fps)
+                next_frame = start_frame
+                sample_count = 0
+                continue
+
+            if not cap.grab():
+                logger.debug(f"프레임 {frame_counter}에서 비디오 스트림이 종료되었습니다.")
+                break
+
+            if frame_counter == next_frame:
+                ret, frame = cap.retrieve()
+                if not ret:
+                    logger.error(f"프레임 {frame_counter} 읽기 실패", extra={
+                        "errorType": "FrameReadError",
+                        "error_message": f"프레임 {frame_counter} 읽기 실패 - 비디오가 손상되었을 수 있습니다."})
+                    break
+
+                frame = cv2.resize(frame, target_size)  # 지정된 크기로 리사이즈
+                timestamp = segment_index * segment_length + sample_count * frame_interval
+                yield segment_index, frame_counter, timestamp, frame
+
+                sample_count += 1
+                total_yielded += 1
+                next_frame += step
+
+            frame_counter += 1
+
+        logger.debug(f"총 추출된 프레임 수: {total_yielded}")
 
     except VideoProcessingError as e:
         logger.error("비디오 처리 중 오류 발생", extra={
@@ -97,4 +311,7 @@ def download_and_sample_video_local(video_path: str, start_time: int = 0, durati
             "errorType": type(e).__name__,
             "error_message": str(e)
         })
-        raise VideoProcessingError("비디오에서 프레임 추출 중 서버 오류가 발생했습니다.") from e
\ No newline at end of file
+        raise VideoProcessingError("비디오에서 프레임 추출 중 서버 오류가 발생했습니다.") from e
+    finally:
+        if cap is not None:
+            cap.release()
@@ -0,0 +1,204 @@
+# vlm_model/utils/ffmpeg_decoder.py
+
+import json
+import shutil
+import logging
+import subprocess
+from functools import lru_cache
+from typing import Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from vlm_model.config import VIDEO_DECODER_BACKEND
+from vlm_model.exceptions import VideoProcessingError
+from vlm_model.utils.media_probe import load_media_info, parse_frame_rate, parse_rotation
+
+logger = logging.getLogger(__name__) # 로거 사용
+
+@lru_cache(maxsize=1)
+def is_ffmpeg_available() -> bool:
+    """
+    ffmpeg와 ffprobe 실행 파일을 사용할 수 있는지 확인합니다.
+    """
+    available = shutil.which("ffmpeg") is not None and shutil.which("ffprobe") is not None
+    if not available:
+        logger.info("ffmpeg/ffprobe를 찾을 수 없어 FFmpeg 디코더를 사용할 수 없습니다.")
+    return available
+
+def use_ffmpeg_backend() -> bool:
+    """
+    설정된 디코더 백엔드가 ffmpeg이고 실제로 사용 가능한지 확인합니다.
+    """
+    return VIDEO_DECODER_BACKEND == "ffmpeg" and is_ffmpeg_available()
+
+def probe_video_stream(video_path: str) -> dict:
+    """
+    첫 번째 비디오 스트림의 해상도, FPS, 회전 정보를 가져옵니다.
+    업로드 시 저장된 메타데이터가 있으면 ffprobe를 실행하지 않고 그 값을 사용합니다.
+
+    Args:
+        video_path (str): 비디오 파일의 경로.
+
+    Returns:
+        dict: {"width": int, "height": int, "fps": float, "rotation": int}
+            rotation이 90도 또는 270도이면 width, height는 회전이 적용된(디코딩 결과) 크기입니다.
+
+    Raises:
+        VideoProcessingError: ffprobe 실행에 실패하거나 비디오 스트림이 없는 경우.
+    """
+    media_info = load_media_info(video_path)
+    if media_info:
+        return {key: media_info[key] for key in ("width", "height", "fps", "rotation")}
+
+    command = [
+        'ffprobe', '-v', 'error',
+        '-select_streams', 'v:0',
+        '-show_entries', 'stream=width,height,avg_frame_rate,r_frame_rate:stream_tags=rotate:stream_side_data=rotation',
+        '-print_format', 'json',
+        video_path
+    ]
+    try:
+        result = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True)
+        streams = json.loads(result.stdout.decode() or "{}").get("streams", [])
+    except FileNotFoundError as e:
+        raise VideoProcessingError("ffprobe 실행 파일을 찾을 수 없습니다.") from e
+    except (subprocess.CalledProcessError, ValueError) as e:
+        raise VideoProcessingError(f"ffprobe로 비디오 정보를 가져올 수 없습니다: {video_path}") from e
+
+    if not streams:
+        raise VideoProcessingError(f"비디오 스트림을 찾을 수 없습니다: {video_path}")
+
+    stream = streams[0]
+    rotation = parse_rotation(stream)
+
+    width, height = int(stream["width"]), int(stream["height"])
+    if rotation in (90, 270):
+        width, height = height, width
+
+    fps = parse_frame_rate(stream.get("avg_frame_rate")) or parse_frame_rate(stream.get("r_frame_rate"))
+    return {"width": width, "height": height, "fps": fps, "rotation": rotation}
+
+def _read_exact(stream, buffer: bytearray) -> int:
+    """
+    파이프에서 buffer 크기만큼 읽어 채웁니다. EOF에 도달하면 읽은 바이트 수를 반환합니다.
+    """
+    view = memoryview(buffer)
+    filled = 0
+    while filled < len(buffer):
+        read = stream.readinto(view[filled:])
+        if not read:
+            break
+        filled += read
+    return filled
+
+def iter_raw_frames(command: List[str], width: int, height: int) -> Iterator[np.ndarray]:
+    """
+    ffmpeg를 실행하여 stdout의 bgr24 rawvideo 스트림을 고정 크기 프레임 단위로 읽어 반환합니다.
+
+    각 프레임은 별도 복사 없이 읽기 버퍼를 그대로 감싼 (height, width, 3) uint8 배열입니다.
+
+    Args:
+        command (List[str]): '-f rawvideo -pix_fmt bgr24 -'로 끝나는 ffmpeg 명령어.
+        width (int): 출력 프레임 너비.
+        height (int): 출력 프레임 높이.
+
+    Yields:
+        np.ndarray: BGR 프레임.
+
+    Raises:
+        VideoProcessingError: ffmpeg 실행에 실패하거나 비정상 종료한 경우.
+    """
+    frame_bytes = width * height * 3
+    logger.debug(f"FFmpeg 명령어: {' '.join(command)}")
+    try:
+        process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, bufsize=frame_bytes)
+    except FileNotFoundError as e:
+        raise VideoProcessingError("ffmpeg 실행 파일을 찾을 수 없습니다.") from e
+
+    finished = False
+    try:
+        while True:
+            buffer = bytearray(frame_bytes)
+            if _read_exact(process.stdout, buffer) < frame_bytes:
+                break
+            yield np.frombuffer(buffer, dtype=np.uint8).reshape(height, width, 3)
+        finished = True
+    finally:
+        if not finished and process.poll() is None:
+            # 소비자가 중간에 멈춘 경우 디코딩을 중단
+            process.kill()
+        stderr = process.stderr.read().decode(errors="replace").strip() if process.stderr else ""
+        return_code = process.wait()
+        process.stdout.close()
+        if process.stderr:
+            process.stderr.close()
+
+    if return_code != 0:
+        logger.error(f"FFmpeg 디코딩 실패: {stderr}", extra={
+            "errorType": "FFmpegDecodeError",
+            "error_message": stderr
+        })
+        raise VideoProcessingError("FFmpeg 디코딩 중 오류가 발생했습니다.")
+
+def _base_command(video_path: str, start_time: Optional[float] = None, duration: Optional[float] = None) -> List[str]:
+    command = ['ffmpeg', '-hide_banner', '-loglevel', 'error', '-nostdin']
+    if start_time:
+        # 입력 옵션 위치의 -ss는 키프레임 탐색 후 정확한 위치까지 디코딩
+        command += ['-ss', str(start_time)]
+    command += ['-i', video_path]
+    if duration is not None:
+        command += ['-t', str(duration)]
+    return command + ['-an', '-sn', '-dn']
+
+def iter_sampled_frames_ffmpeg(video_path: str, frame_interval: float, target_size: Tuple[int, int], start_time: Optional[float] = None, duration: Optional[float] = None) -> Iterator[np.ndarray]:
+    """
+    ffmpeg의 fps/scale 필터로 frame_interval초마다 한 프레임을 target_size 크기로 디코딩합니다.
+    프레임 선택과 리사이즈는 ffmpeg 내부 스레드에서 처리됩니다.
+
+    Args:
+        video_path (str): 비디오 파일의 경로.
+        frame_interval (float): 프레임을 추출할 간격(초).
+        target_size (Tuple[int, int]): 출력 프레임 크기 (가로, 세로).
+        start_time (Optional[float]): 추출 시작 시간(초).
+        duration (Optional[float]): 추출할 지속 시간(초).
+
+    Yields:
+        np.ndarray: (세로, 가로, 3) 크기의 BGR 프레임.
+    """
+    width, height = target_size
+    # round=up: 0, N, 2N... 번째 프레임을 선택하여 OpenCV 샘플링과 같은 위치를 유지
+    command = _base_command(video_path, start_time, duration) + [
+        '-vf', f'fps=1/{frame_interval}:round=up,scale={width}:{height}',
+        '-f', 'rawvideo', '-pix_fmt', 'bgr24', '-'
+    ]
+    yield from iter_raw_frames(command, width, height)
+
+def read_frames_ffmpeg(video_path: str, frame_indices: List[int], frame_size: Tuple[int, int], seek_fps: Optional[float] = None) -> List[np.ndarray]:
+    """
+    ffmpeg의 select 필터로 지정된 인덱스의 프레임만 원본 해상도로 디코딩합니다.
+
+    Args:
+        video_path (str): 비디오 파일의 경로.
+        frame_indices (List[int]): 추출할 프레임 인덱스 리스트.
+        frame_size (Tuple[int, int]): 디코딩된 프레임 크기 (가로, 세로).
+        seek_fps (Optional[float]): 고정 프레임 레이트 비디오의 FPS. 지정하면 첫 프레임 직전 키프레임으로 탐색한 뒤 디코딩합니다.
+
+    Returns:
+        List[np.ndarray]: 인덱스 오름차순으로 정렬된 BGR 프레임 리스트.
+    """
+    width, height = frame_size
+    indices = sorted(set(frame_indices))
+    start_time = None
+    if seek_fps and indices and indices[0] > 0:
+        # 첫 프레임 반 프레임 앞으로 탐색하면 ffmpeg는 그 직전 키프레임부터 디코딩하고 첫 프레임부터 출력 (n=0)
+        start_time = (indices[0] - 0.5) / seek_fps
+        indices = [index - indices[0] for index in indices]
+        indices[0] = 0
+
+    select_expr = "+".join(f"eq(n\\,{index})" for index in indices)
+    command = _base_command(video_path, start_time) + [
+        '-vf', f'select={select_expr}',
+        '-vsync', '0',
+        '-f', 'rawvideo', '-pix_fmt', 'bgr24', '-'
+    ]
+    return list(iter_raw_frames(command, width, height))
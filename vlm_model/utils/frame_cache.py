@@ -0,0 +1,180 @@
+# vlm_model/utils/frame_cache.py
+
+import os
+import json
+import uuid
+import logging
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from vlm_model.config import FRAME_CACHE_ENABLED
+
+logger = logging.getLogger(__name__) # 로거 사용
+
+# 업로드 파일 옆에 저장되는 샘플 프레임 캐시 파일 접미사
+FRAME_CACHE_SUFFIX = ".frames"
+FRAME_CACHE_INDEX_SUFFIX = ".frames.json"
+
+def frame_cache_paths(video_path: str, segment_length: int, frame_interval: int, target_size: Tuple[int, int]) -> Tuple[Path, Path]:
+    """
+    샘플링 파라미터별 프레임 캐시 데이터 파일과 인덱스 파일 경로를 반환합니다.
+    예: {video_id}_original.mp4.256x256_i1_s60.frames, {video_id}_original.mp4.256x256_i1_s60.frames.json
+    """
+    width, height = target_size
+    base = f"{video_path}.{width}x{height}_i{frame_interval}_s{segment_length}"
+    return Path(f"{base}{FRAME_CACHE_SUFFIX}"), Path(f"{base}{FRAME_CACHE_INDEX_SUFFIX}")
+
+def _source_signature(video_path: str) -> dict:
+    stat = os.stat(video_path)
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+class FrameCache:
+    """
+    메모리 맵으로 연 샘플 프레임 캐시입니다. 프레임 데이터는 접근할 때 디스크에서 페이지 단위로 읽힙니다.
+    """
+
+    def __init__(self, frames: np.ndarray, segments: List[int], frame_indices: List[int], timestamps: List[float]):
+        self.frames = frames
+        self.segments = segments
+        self.frame_indices = frame_indices
+        self.timestamps = timestamps
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def __iter__(self) -> Iterator[Tuple[int, int, float, np.ndarray]]:
+        """
+        stream_sampled_frames와 같은 (segment_index, frame_idx, timestamp, frame) 형식으로 프레임을 반환합니다.
+        """
+        for position in range(len(self)):
+            yield self.segments[position], self.frame_indices[position], self.timestamps[position], self.frames[position]
+
+    def segment_frames(self, segment_index: int) -> List[Tuple[int, float, np.ndarray]]:
+        """
+        한 세그먼트의 (frame_idx, timestamp, frame) 목록을 반환합니다.
+        """
+        return [(self.frame_indices[i], self.timestamps[i], self.frames[i]) for i in range(len(self)) if self.segments[i] == segment_index]
+
+def load_frame_cache(video_path: str, segment_length: int, frame_interval: int, target_size: Tuple[int, int]) -> Optional[FrameCache]:
+    """
+    저장된 프레임 캐시를 메모리 맵으로 엽니다.
+
+    Args:
+        video_path (str): 원본 비디오 파일의 경로.
+        segment_length (int): 세그먼트 길이(초).
+        frame_interval (int): 프레임 추출 간격(초).
+        target_size (Tuple[int, int]): 프레임 크기 (가로, 세로).
+
+    Returns:
+        Optional[FrameCache]: 캐시가 없거나, 원본 파일이 바뀌었거나, 손상된 경우 None.
+    """
+    if not FRAME_CACHE_ENABLED:
+        return None
+
+    data_path, index_path = frame_cache_paths(video_path, segment_length, frame_interval, target_size)
+    try:
+        with open(index_path, "r", encoding="utf-8") as f:
+            index = json.load(f)
+        if index["source"] != _source_signature(video_path):
+            logger.info(f"원본 비디오가 변경되어 프레임 캐시를 사용하지 않습니다: {data_path}")
+            return None
+
+        count = len(index["timestamps"])
+        if count == 0:
+            return None
+        width, height = target_size
+        frames = np.memmap(data_path, dtype=np.uint8, mode="r", shape=(count, height, width, 3))
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, KeyError) as e:
+        logger.info(f"프레임 캐시를 읽을 수 없어 무시합니다: {data_path} ({e})")
+        return None
+
+    logger.info(f"프레임 캐시 사용: {data_path} ({count}개 프레임)")
+    return FrameCache(frames, index["segments"], index["frame_indices"], index["timestamps"])
+
+def write_through_frame_cache(video_path: str, segment_length: int, frame_interval: int, target_size: Tuple[int, int], frame_stream: Iterator[Tuple[int, int, float, np.ndarray]]) -> Iterator[Tuple[int, int, float, np.ndarray]]:
+    """
+    frame_stream의 프레임을 그대로 반환하면서 캐시 파일에 기록합니다.
+    스트림을 끝까지 읽은 경우에만 인덱스 파일을 저장하여 캐시를 완성하고, 도중에 중단되거나 오류가 나면 기록 중인 파일을 삭제합니다.
+
+    Args:
+        video_path (str): 원본 비디오 파일의 경로.
+        segment_length (int): 세그먼트 길이(초).
+        frame_interval (int): 프레임 추출 간격(초).
+        target_size (Tuple[int, int]): 프레임 크기 (가로, 세로).
+        frame_stream (Iterator): stream_sampled_frames 형식의 프레임 스트림.
+
+    Yields:
+        Tuple[int, int, float, np.ndarray]: (segment_index, frame_idx, timestamp, frame)
+    """
+    if not FRAME_CACHE_ENABLED:
+        yield from frame_stream
+        return
+
+    try:
+        source = _source_signature(video_path)
+    except OSError:
+        yield from frame_stream
+        return
+
+    data_path, index_path = frame_cache_paths(video_path, segment_length, frame_interval, target_size)
+    # 같은 비디오를 동시에 분석하는 요청끼리 임시 파일이 겹치지 않도록 고유한 이름 사용
+    temp_path = data_path.with_name(f"{data_path.name}.{uuid.uuid4().hex}.tmp")
+    width, height = target_size
+    index = {"source": source, "segments": [], "frame_indices": [], "timestamps": []}
+
+    try:
+        cache_file = open(temp_path, "wb")
+    except OSError as e:
+        logger.info(f"프레임 캐시 파일을 만들 수 없어 캐시 없이 진행합니다: {e}")
+        yield from frame_stream
+        return
+
+    cacheable = True
+    completed = False
+    try:
+        with cache_file:
+            for segment_index, frame_idx, timestamp, frame in frame_stream:
+                if cacheable and frame.shape == (height, width, 3) and frame.dtype == np.uint8:
+                    try:
+                        cache_file.write(np.ascontiguousarray(frame).tobytes())
+                        index["segments"].append(int(segment_index))
+                        index["frame_indices"].append(int(frame_idx))
+                        index["timestamps"].append(float(timestamp))
+                    except OSError as e:
+                        logger.info(f"프레임 캐시 기록 실패로 캐시를 만들지 않습니다: {e}")
+                        cacheable = False
+                else:
+                    # 크기가 다른 프레임이 섞이면 캐시를 만들지 않음
+                    cacheable = False
+                yield segment_index, frame_idx, timestamp, frame
+        completed = cacheable and bool(index["timestamps"])
+    finally:
+        if completed:
+            _finalize_frame_cache(temp_path, data_path, index_path, index)
+        elif temp_path.exists():
+            temp_path.unlink()
+
+def _finalize_frame_cache(temp_path: Path, data_path: Path, index_path: Path, index: dict) -> None:
+    """
+    기록이 끝난 캐시 데이터 파일을 이동하고 인덱스 파일을 저장합니다. 저장에 실패해도 분석은 계속 진행합니다.
+    """
+    temp_index_path = temp_path.with_name(f"{temp_path.name}.json")
+    try:
+        os.replace(temp_path, data_path)
+        with open(temp_index_path, "w", encoding="utf-8") as f:
+            json.dump(index, f)
+        # 인덱스 파일이 존재하면 캐시가 완성된 것으로 간주
+        os.replace(temp_index_path, index_path)
+        logger.info(f"프레임 캐시 저장 완료: {data_path} ({len(index['timestamps'])}개 프레임)")
+    except OSError as e:
+        logger.error(f"프레임 캐시 저장 실패: {e}", extra={
+            "errorType": type(e).__name__,
+            "error_message": str(e)
+        })
+        for path in (temp_path, temp_index_path, data_path):
+            if path.exists():
+                path.unlink()
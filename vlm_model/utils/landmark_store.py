@@ -0,0 +1,173 @@
+# vlm_model/utils/landmark_store.py
+
+import os
+import json
+import uuid
+import logging
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional
+
+import numpy as np
+
+from vlm_model.utils.cv_mediapipe_analysis.landmark_arrays import LandmarkSeries
+from vlm_model.utils.cv_mediapipe_analysis.segment_scoring import score_sampled_frames
+from vlm_model.utils.cv_mediapipe_analysis.event_detection import select_problem_events
+
+logger = logging.getLogger(__name__) # 로거 사용
+
+# 업로드 파일 옆에 저장되는 랜드마크 기록 파일 접미사 (예: {video_id}_original.mp4.landmarks.npz)
+LANDMARK_STORE_SUFFIX = ".landmarks.npz"
+
+class LandmarkTrack(NamedTuple):
+    """
+    한 세그먼트의 랜드마크 기록입니다. 점수 재계산에 필요한 정보만 담습니다.
+
+    - landmarks: 랜드마크를 검출한 프레임의 LandmarkSeries
+    - score_rows: (T,) 샘플 프레임별로 사용할 landmarks의 위치 (움직임 게이트로 생략한 프레임은 직전 검출 프레임)
+    - skipped: (T,) 샘플 프레임별 검출 생략 여부
+    - frame_indices: (T,) 원본 프레임 인덱스
+    - timestamps: (T,) 타임스탬프(초)
+    """
+    segment_index: int
+    landmarks: LandmarkSeries
+    score_rows: np.ndarray
+    skipped: np.ndarray
+    frame_indices: np.ndarray
+    timestamps: np.ndarray
+
+class LandmarkStore(NamedTuple):
+    params: dict
+    tracks: List[LandmarkTrack]
+
+def landmark_store_path(video_path: str) -> Path:
+    """
+    비디오 파일에 대응하는 랜드마크 기록 파일 경로를 반환합니다.
+    """
+    return Path(f"{video_path}{LANDMARK_STORE_SUFFIX}")
+
+def _source_signature(video_path: str) -> dict:
+    stat = os.stat(video_path)
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+def save_landmark_store(video_path: str, tracks: List[LandmarkTrack], params: dict) -> Optional[Path]:
+    """
+    세그먼트별 랜드마크 기록을 float16 배열의 npz 파일 하나로 저장합니다.
+    랜드마크는 검출한 프레임만 세그먼트 순서대로 이어 붙이고, 샘플 프레임별 인덱스 배열로 위치를 기록합니다.
+    저장에 실패해도 분석 결과에는 영향이 없으므로 None을 반환합니다.
+
+    Args:
+        video_path (str): 원본 비디오 파일의 경로.
+        tracks (List[LandmarkTrack]): 세그먼트 순서의 랜드마크 기록.
+        params (dict): 분석 조건 (세그먼트 길이, 프레임 간격, 엔진 등). 점수 재계산 결과와 함께 반환됩니다.
+
+    Returns:
+        Optional[Path]: 저장된 파일 경로.
+    """
+    # 샘플 프레임이 없는 세그먼트는 재계산할 것이 없으므로 저장하지 않음
+    tracks = [track for track in tracks if len(track.timestamps)]
+    if not tracks:
+        return None
+
+    store_path = landmark_store_path(video_path)
+    temp_path = store_path.with_name(f"{store_path.name}.{uuid.uuid4().hex}.tmp")
+    try:
+        meta = {"source": _source_signature(video_path), "params": params}
+        with open(temp_path, "wb") as f:
+            np.savez_compressed(
+                f,
+                meta=np.array(json.dumps(meta)),
+                pose=np.concatenate([track.landmarks.pose for track in tracks]).astype(np.float16),
+                face=np.concatenate([track.landmarks.face for track in tracks]).astype(np.float16),
+                hands=np.concatenate([track.landmarks.hands for track in tracks]).astype(np.float16),
+                segment_indices=np.array([track.segment_index for track in tracks], dtype=np.int32),
+                landmark_counts=np.array([len(track.landmarks) for track in tracks], dtype=np.int32),
+                frame_counts=np.array([len(track.timestamps) for track in tracks], dtype=np.int32),
+                score_rows=np.concatenate([np.asarray(track.score_rows, dtype=np.int32) for track in tracks]),
+                skipped=np.concatenate([np.asarray(track.skipped, dtype=bool) for track in tracks]),
+                frame_indices=np.concatenate([np.asarray(track.frame_indices, dtype=np.int64) for track in tracks]),
+                timestamps=np.concatenate([np.asarray(track.timestamps, dtype=np.float64) for track in tracks])
+            )
+        os.replace(temp_path, store_path)
+    except OSError as e:
+        logger.info(f"랜드마크 기록을 저장하지 못했습니다: {store_path} ({e})")
+        if temp_path.exists():
+            temp_path.unlink()
+        return None
+
+    logger.info(f"랜드마크 기록 저장 완료: {store_path} ({sum(len(track.timestamps) for track in tracks)}개 프레임)")
+    return store_path
+
+def load_landmark_store(video_path: str) -> Optional[LandmarkStore]:
+    """
+    저장된 랜드마크 기록을 읽어옵니다.
+
+    Args:
+        video_path (str): 원본 비디오 파일의 경로.
+
+    Returns:
+        Optional[LandmarkStore]: 기록이 없거나, 원본 파일이 바뀌었거나, 손상된 경우 None.
+    """
+    store_path = landmark_store_path(video_path)
+    try:
+        with np.load(store_path) as data:
+            meta = json.loads(str(data["meta"]))
+            if meta["source"] != _source_signature(video_path):
+                logger.info(f"원본 비디오가 변경되어 랜드마크 기록을 사용하지 않습니다: {store_path}")
+                return None
+            arrays = {key: data[key] for key in data.files if key != "meta"}
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, KeyError) as e:
+        logger.info(f"랜드마크 기록을 읽을 수 없어 무시합니다: {store_path} ({e})")
+        return None
+
+    tracks = []
+    landmark_offsets = np.concatenate(([0], np.cumsum(arrays["landmark_counts"])))
+    frame_offsets = np.concatenate(([0], np.cumsum(arrays["frame_counts"])))
+    for position, segment_index in enumerate(arrays["segment_indices"]):
+        lower, upper = landmark_offsets[position], landmark_offsets[position + 1]
+        start, end = frame_offsets[position], frame_offsets[position + 1]
+        tracks.append(LandmarkTrack(
+            segment_index=int(segment_index),
+            landmarks=LandmarkSeries(
+                pose=arrays["pose"][lower:upper].astype(np.float32),
+                face=arrays["face"][lower:upper].astype(np.float32),
+                hands=arrays["hands"][lower:upper].astype(np.float32)
+            ),
+            score_rows=arrays["score_rows"][start:end],
+            skipped=arrays["skipped"][start:end],
+            frame_indices=arrays["frame_indices"][start:end],
+            timestamps=arrays["timestamps"][start:end]
+        ))
+    return LandmarkStore(params=meta["params"], tracks=tracks)
+
+def rescore_landmark_store(store: LandmarkStore, merge_events: bool, **event_options) -> List[Dict]:
+    """
+    저장된 랜드마크로 점수와 문제 프레임 선택을 다시 계산합니다. 디코딩과 Mediapipe 추론을 하지 않습니다.
+
+    Args:
+        store (LandmarkStore): load_landmark_store의 결과.
+        merge_events (bool): 연속된 문제 프레임을 구간으로 묶을지 여부.
+        **event_options: detect_events의 window, hysteresis_margin, max_gap.
+
+    Returns:
+        List[Dict]: 문제 프레임별 {"segment_index", "frame_index", "source_frame_index", "timestamp", "scores", "event"}.
+    """
+    problem_frames = []
+    for track in store.tracks:
+        scores = score_sampled_frames(track.landmarks, track.score_rows, track.skipped)
+        for event in select_problem_events(scores, merge_events, **event_options):
+            idx = event.peak
+            problem_frames.append({
+                "segment_index": track.segment_index,
+                "frame_index": idx,
+                "source_frame_index": int(track.frame_indices[idx]),
+                "timestamp": float(track.timestamps[idx]),
+                "scores": {key: float(values[idx]) for key, values in scores.items()},
+                "event": {
+                    "start": float(track.timestamps[event.start]),
+                    "end": float(track.timestamps[event.end]),
+                    "frames": event.length
+                } if event.length > 1 else None
+            })
+    return problem_frames
@@ -0,0 +1,181 @@
+# vlm_model/utils/media_probe.py
+
+import os
+import json
+import logging
+import subprocess
+from pathlib import Path
+from typing import Optional
+
+from vlm_model.exceptions import VideoProcessingError
+
+logger = logging.getLogger(__name__) # 로거 사용
+
+# 업로드 파일 옆에 저장되는 메타데이터 파일 접미사 (예: {video_id}_original.mp4.probe.json)
+MEDIA_INFO_SUFFIX = ".probe.json"
+
+def parse_frame_rate(rate: Optional[str]) -> float:
+    """
+    ffprobe의 "30000/1001" 형식 프레임 레이트를 float로 변환합니다. 변환할 수 없으면 0.0을 반환합니다.
+    """
+    if not rate:
+        return 0.0
+    try:
+        numerator, _, denominator = rate.partition("/")
+        denominator = float(denominator) if denominator else 1.0
+        return float(numerator) / denominator if denominator else 0.0
+    except ValueError:
+        return 0.0
+
+def parse_rotation(stream: dict) -> int:
+    """
+    ffprobe 스트림 정보의 side data 또는 rotate 태그에서 회전 각도(0, 90, 180, 270)를 가져옵니다.
+    """
+    rotation = 0
+    for side_data in stream.get("side_data_list", []):
+        if "rotation" in side_data:
+            rotation = int(side_data["rotation"])
+    if not rotation and "rotate" in stream.get("tags", {}):
+        rotation = int(stream["tags"]["rotate"])
+    return rotation % 360
+
+def _parse_float(value) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+def media_info_path(video_path: str) -> Path:
+    """
+    비디오 파일에 대응하는 메타데이터 파일 경로를 반환합니다.
+    """
+    return Path(f"{video_path}{MEDIA_INFO_SUFFIX}")
+
+def probe_media(video_path: str) -> dict:
+    """
+    ffprobe를 한 번 실행하여 비디오의 코덱, 길이, FPS, 해상도, 회전, 키프레임 위치를 가져옵니다.
+    키프레임 위치는 디코딩 없이 패킷 플래그만으로 계산합니다.
+
+    Args:
+        video_path (str): 비디오 파일의 경로.
+
+    Returns:
+        dict: {
+            "codec": str,               # 예: "h264", "vp9"
+            "duration": float,          # 초 단위 길이
+            "fps": float,               # 평균 FPS
+            "vfr": bool,                # 가변 프레임 레이트 여부
+            "width": int, "height": int,  # 회전이 적용된(디코딩 결과) 크기
+            "rotation": int,
+            "frame_count": int,
+            "keyframes": List[float]    # 키프레임 타임스탬프(초), 오름차순
+        }
+
+    Raises:
+        VideoProcessingError: ffprobe 실행에 실패하거나 비디오 스트림이 없는 경우.
+    """
+    command = [
+        'ffprobe', '-v', 'error',
+        '-select_streams', 'v:0',
+        '-show_entries',
+        'stream=codec_name,width,height,avg_frame_rate,r_frame_rate,duration'
+        ':stream_tags=rotate:stream_side_data=rotation'
+        ':format=duration:packet=pts_time,flags',
+        '-print_format', 'json',
+        video_path
+    ]
+    try:
+        result = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True)
+        output = json.loads(result.stdout.decode() or "{}")
+    except FileNotFoundError as e:
+        raise VideoProcessingError("ffprobe 실행 파일을 찾을 수 없습니다.") from e
+    except (subprocess.CalledProcessError, ValueError) as e:
+        raise VideoProcessingError(f"ffprobe로 비디오 정보를 가져올 수 없습니다: {video_path}") from e
+
+    streams = output.get("streams", [])
+    if not streams:
+        raise VideoProcessingError(f"비디오 스트림을 찾을 수 없습니다: {video_path}")
+
+    stream = streams[0]
+    rotation = parse_rotation(stream)
+    width, height = int(stream["width"]), int(stream["height"])
+    if rotation in (90, 270):
+        width, height = height, width
+
+    avg_rate = parse_frame_rate(stream.get("avg_frame_rate"))
+    base_rate = parse_frame_rate(stream.get("r_frame_rate"))
+    fps = avg_rate or base_rate
+
+    packets = output.get("packets", [])
+    keyframes = sorted(
+        _parse_float(packet.get("pts_time"))
+        for packet in packets
+        if "K" in packet.get("flags", "") and packet.get("pts_time") is not None
+    )
+
+    # 컨테이너 길이가 없으면(예: MediaRecorder webm) 스트림 길이, 패킷 수 순으로 대체
+    duration = _parse_float(output.get("format", {}).get("duration")) or _parse_float(stream.get("duration"))
+    if not duration and packets and fps:
+        duration = len(packets) / fps
+
+    return {
+        "codec": stream.get("codec_name", ""),
+        "duration": duration,
+        "fps": fps,
+        "vfr": bool(avg_rate and base_rate and abs(avg_rate - base_rate) > 0.01),
+        "width": width,
+        "height": height,
+        "rotation": rotation,
+        "frame_count": len(packets),
+        "keyframes": keyframes,
+    }
+
+def write_media_info(video_path: str) -> dict:
+    """
+    비디오를 ffprobe로 분석하고 결과를 비디오 파일 옆의 메타데이터 파일로 저장합니다.
+    업로드 시 한 번 호출하여 이후 요청에서 코덱/FPS/길이 확인을 위한 프로세스 실행과 파일 열기를 생략합니다.
+
+    Args:
+        video_path (str): 비디오 파일의 경로.
+
+    Returns:
+        dict: probe_media의 결과.
+
+    Raises:
+        VideoProcessingError: ffprobe 실행에 실패하거나 메타데이터를 저장할 수 없는 경우.
+    """
+    info = probe_media(video_path)
+    sidecar_path = media_info_path(video_path)
+    temp_path = sidecar_path.with_name(f"{sidecar_path.name}.tmp")
+    try:
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(info, f)
+        # 읽는 쪽에서 쓰다 만 파일을 보지 않도록 완성 후 이동
+        os.replace(temp_path, sidecar_path)
+    except OSError as e:
+        if temp_path.exists():
+            temp_path.unlink()
+        raise VideoProcessingError(f"비디오 메타데이터를 저장할 수 없습니다: {sidecar_path}") from e
+
+    logger.debug(f"비디오 메타데이터 저장 완료: {sidecar_path}")
+    return info
+
+def load_media_info(video_path: str) -> Optional[dict]:
+    """
+    업로드 시 저장된 메타데이터를 읽어옵니다.
+
+    Args:
+        video_path (str): 비디오 파일의 경로.
+
+    Returns:
+        Optional[dict]: 메타데이터 또는 파일이 없거나 손상된 경우 None.
+    """
+    sidecar_path = media_info_path(video_path)
+    try:
+        with open(sidecar_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logger.info(f"비디오 메타데이터를 읽을 수 없어 무시합니다: {sidecar_path} ({e})")
+        return None
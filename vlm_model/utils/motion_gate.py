@@ -0,0 +1,61 @@
+# vlm_model/utils/motion_gate.py
+
+import logging
+from typing import Optional, Tuple
+
+import cv2
+import numpy as np
+
+from vlm_model.config import MOTION_GATE_THRESHOLD
+
+logger = logging.getLogger(__name__) # 로거 사용
+
+class MotionGate:
+    """
+    샘플링된 프레임이 마지막으로 분석한 프레임과 거의 같은지 판단하는 전처리 필터입니다.
+
+    프레임을 작은 흑백 이미지로 줄인 뒤 픽셀 절대 차이의 평균(0~1)을 threshold와 비교합니다.
+    비교 기준은 직전 프레임이 아니라 마지막으로 "변화 있음"으로 판단된 프레임이므로,
+    조금씩 누적되는 변화도 threshold를 넘는 순간 다시 분석됩니다.
+    """
+
+    def __init__(self, threshold: Optional[float] = None, size: Tuple[int, int] = (32, 32)):
+        """
+        Args:
+            threshold (Optional[float]): 평균 픽셀 차이(0~1)가 이 값 미만이면 변화 없음으로 판단. 0 이하이면 비활성화.
+                None이면 MOTION_GATE_THRESHOLD 설정값을 사용합니다.
+            size (Tuple[int, int]): 비교에 사용할 축소 이미지 크기 (가로, 세로).
+        """
+        self.threshold = MOTION_GATE_THRESHOLD if threshold is None else threshold
+        self.size = size
+        self.reference = None
+        self.checked = 0
+        self.skipped = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.threshold > 0
+
+    def is_unchanged(self, frame: np.ndarray) -> bool:
+        """
+        frame이 기준 프레임과 거의 같으면 True를 반환합니다. False를 반환하면 frame이 새 기준 프레임이 됩니다.
+
+        Args:
+            frame (np.ndarray): BGR 프레임.
+
+        Returns:
+            bool: 변화가 없으면 True.
+        """
+        if not self.enabled:
+            return False
+
+        self.checked += 1
+        small = cv2.resize(cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY), self.size, interpolation=cv2.INTER_AREA)
+        if self.reference is not None:
+            difference = float(cv2.absdiff(small, self.reference).mean()) / 255.0
+            if difference < self.threshold:
+                self.skipped += 1
+                return True
+
+        self.reference = small
+        return False
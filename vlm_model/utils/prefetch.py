@@ -0,0 +1,82 @@
+# vlm_model/utils/prefetch.py
+
+import queue
+import logging
+import threading
+from typing import Iterator, TypeVar
+
+logger = logging.getLogger(__name__) # 로거 사용
+
+T = TypeVar("T")
+
+# 생산자 스레드가 종료를 알리는 표식
+_END = object()
+
+class _ProducerError:
+    """
+    생산자 스레드에서 발생한 예외를 소비자 스레드로 전달하기 위한 래퍼입니다.
+    """
+    def __init__(self, error: BaseException):
+        self.error = error
+
+def prefetch(iterator: Iterator[T], depth: int) -> Iterator[T]:
+    """
+    iterator를 별도의 생산자 스레드에서 미리 읽어 크기가 제한된 큐에 채워두고, 소비자에게 순서대로 반환합니다.
+
+    OpenCV와 ffmpeg 파이프 읽기는 디코딩 중 GIL을 해제하므로, 다음 프레임의 디코딩이 현재 프레임의 Mediapipe 분석과 겹쳐서 실행됩니다.
+    큐가 가득 차면 생산자가 대기하므로 긴 비디오에서도 메모리 사용량은 depth개 항목으로 제한됩니다.
+
+    생산자에서 발생한 예외는 소비자 쪽에서 같은 예외로 다시 발생합니다.
+    소비자가 중간에 반복을 멈추면(close) 생산자도 멈추고, 생산자 스레드에서 iterator를 닫아 디코더 자원을 해제합니다.
+
+    Args:
+        iterator (Iterator[T]): 미리 읽을 iterator (예: stream_sampled_frames).
+        depth (int): 큐에 미리 채워둘 최대 항목 수. 0 이하이면 스레드 없이 iterator를 그대로 반환합니다.
+
+    Yields:
+        T: iterator의 항목.
+    """
+    if depth <= 0:
+        yield from iterator
+        return
+
+    items: "queue.Queue" = queue.Queue(maxsize=depth)
+    stop_event = threading.Event()
+
+    def put(item) -> bool:
+        # 소비자가 멈춘 경우 큐가 가득 차 있어도 대기하지 않고 종료
+        while not stop_event.is_set():
+            try:
+                items.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce():
+        try:
+            for item in iterator:
+                if not put(item):
+                    break
+            else:
+                put(_END)
+        except BaseException as e:
+            put(_ProducerError(e))
+        finally:
+            close = getattr(iterator, "close", None)
+            if close is not None:
+                close()
+
+    producer = threading.Thread(target=produce, name="frame-prefetch", daemon=True)
+    producer.start()
+    try:
+        while True:
+            item = items.get()
+            if item is _END:
+                break
+            if isinstance(item, _ProducerError):
+                raise item.error
+            yield item
+    finally:
+        stop_event.set()
+        producer.join()
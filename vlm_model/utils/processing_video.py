@@ -5,30 +5,174 @@ import re
 import uuid
 import base64
 import logging
+import math
 import openai
+import threading
+import multiprocessing
+from contextlib import closing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from itertools import groupby
+from operator import itemgetter
 from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
 
 from fastapi import HTTPException
 
 from vlm_model.schemas.feedback import FeedbackFrame
-from vlm_model.utils.download_video import download_and_sample_video_local
+from vlm_model.utils.download_video import stream_sampled_frames
+from vlm_model.utils.read_video import read_video_opencv
 from vlm_model.utils.analysis import analyze_frames
 from vlm_model.utils.analysis_video.load_prompt import load_user_prompt
 from vlm_model.utils.analysis_video.parse_feedback import parse_feedback_text
 from vlm_model.utils.encoding_image import encode_image
 from vlm_model.utils.encoding_feedback_image import encode_feedback_image
 from vlm_model.utils.video_duration import get_video_duration
-from vlm_model.utils.cv_mediapipe_analysis.analyze_mediapipe_main import analyze_frame
+from vlm_model.utils.prefetch import prefetch
+from vlm_model.utils.frame_cache import load_frame_cache, write_through_frame_cache
+from vlm_model.utils.cv_mediapipe_analysis.graph_pool import checkout_graphs
+from vlm_model.utils.cv_mediapipe_analysis.profiles import ANALYSIS_PROFILES, AnalysisProfile
+from vlm_model.utils.landmark_store import LandmarkTrack, save_landmark_store
+from vlm_model.utils.segment_analysis import frame_sample_size, analyze_segment_frames, analyze_segment_worker
 from vlm_model.exceptions import VideoProcessingError, ImageEncodingError
 from vlm_model.openai_config import SYSTEM_INSTRUCTION
-from vlm_model.config import FEEDBACK_DIR
+from vlm_model.config import FEEDBACK_DIR, SEGMENT_WORKERS, PREFETCH_QUEUE_DEPTH, ANALYSIS_PROFILE, MEDIAPIPE_CASCADE, LANDMARK_STORE_ENABLED, MEDIAPIPE_ENGINE, MEDIAPIPE_ROI_CROP
 
 logger = logging.getLogger(__name__) 
 
-def process_video(file_path: str, video_id: str):
+def _iter_sampled_frames(file_path: str, video_duration: float, segment_length: int, frame_interval: int, frame_size: Tuple[int, int]) -> Iterator[Tuple[int, int, float, np.ndarray]]:
+    """
+    stream_sampled_frames를 감싸 프레임 추출 오류를 process_video의 오류 메시지로 변환합니다.
+    """
+    try:
+        yield from stream_sampled_frames(file_path, segment_length, frame_interval, target_size=frame_size, end_time=video_duration)
+    except VideoProcessingError as vpe:
+        logger.error(f"프레임을 추출할 수 없습니다: {vpe.message}", extra={
+            "errorType": "VideoProcessingError",
+            "error_message": f"프레임 추출 실패: {vpe.message}"
+        })
+        raise VideoProcessingError("프레임을 추출할 수 없습니다.") from vpe
+
+# 세그먼트 병렬 분석용 프로세스 풀 (첫 요청 시 생성하여 재사용)
+_segment_pool: Optional[ProcessPoolExecutor] = None
+_segment_pool_lock = threading.Lock()
+
+def _get_segment_pool() -> ProcessPoolExecutor:
+    """
+    세그먼트 분석용 프로세스 풀을 반환합니다.
+    Mediapipe 그래프는 내부 스레드를 가지므로 fork 대신 spawn으로 작업자를 생성하며,
+    작업자는 segment_analysis 모듈만 import하여 VLM 클라이언트 없이 자신만의 그래프 풀을 만들고 작업 간에 재사용합니다.
+    """
+    global _segment_pool
+    with _segment_pool_lock:
+        if _segment_pool is None:
+            _segment_pool = ProcessPoolExecutor(
+                max_workers=SEGMENT_WORKERS,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+            logger.info(f"세그먼트 분석 프로세스 풀 생성: workers={SEGMENT_WORKERS}")
+        return _segment_pool
+
+def _reset_segment_pool(broken_pool: ProcessPoolExecutor) -> None:
+    """
+    작업자가 비정상 종료되어 사용할 수 없게 된 풀을 버리고, 다음 요청에서 새 풀을 만들도록 합니다.
+    """
+    global _segment_pool
+    with _segment_pool_lock:
+        if _segment_pool is broken_pool:
+            _segment_pool = None
+    broken_pool.shutdown(wait=False, cancel_futures=True)
+
+def _iter_segment_results(file_path: str, video_duration: float, segment_length: int, profile: AnalysisProfile) -> Iterator[Tuple[int, List[tuple], List[dict], Dict[str, int], Optional[LandmarkTrack]]]:
+    """
+    세그먼트별 Mediapipe 분석 결과를 세그먼트 순서대로 반환합니다.
+
+    SEGMENT_WORKERS가 1이면 비디오를 한 번만 디코딩하며 순차 분석하고 (디코딩은 PREFETCH_QUEUE_DEPTH 크기의 큐를 채우는 별도 스레드에서 수행),
+    2 이상이면 세그먼트를 프로세스 풀에 나누어 병렬로 분석한 뒤 세그먼트 순서대로 병합합니다.
+    샘플링 간격, 샘플 프레임 크기, 그래프 풀은 분석 프로필을 따릅니다.
+
+    Yields:
+        Tuple[int, List[tuple], List[dict], Dict[str, int], Optional[LandmarkTrack]]: (segment_index, 문제 프레임 목록, 문제 프레임별 Mediapipe 점수, 프레임 수 통계, 랜드마크 기록)
+    """
+    segment_count = math.ceil(int(video_duration) / segment_length)
+    frame_interval = profile.frame_interval
+    frame_size = frame_sample_size(profile)
+    if SEGMENT_WORKERS <= 1 or segment_count <= 1:
+        frame_cache = load_frame_cache(file_path, segment_length, frame_interval, frame_size)
+        if frame_cache is not None:
+            # 이전 분석에서 저장된 프레임을 메모리 맵으로 읽음 (디코딩 생략)
+            frame_stream = iter(frame_cache)
+        else:
+            # 디코딩을 생산자 스레드에서 미리 수행하여 Mediapipe 분석과 겹치도록 하고, 샘플 프레임은 캐시에 기록
+            frame_stream = prefetch(
+                write_through_frame_cache(
+                    file_path, segment_length, frame_interval, frame_size,
+                    _iter_sampled_frames(file_path, video_duration, segment_length, frame_interval, frame_size)
+                ),
+                PREFETCH_QUEUE_DEPTH
+            )
+        # 비디오 하나를 분석하는 동안 그래프 묶음을 독점하여 다른 요청과 추적 상태가 섞이지 않도록 함
+        with checkout_graphs(profile.name) as graphs:
+            for segment_index, segment_frames in groupby(frame_stream, key=itemgetter(0)):
+                yield (segment_index, *analyze_segment_frames(
+                    segment_index, ((frame_idx, timestamp_sec, frame) for _, frame_idx, timestamp_sec, frame in segment_frames), graphs
+                ))
+        return
+
+    logger.info(f"{segment_count}개 세그먼트를 병렬로 분석합니다 (workers={SEGMENT_WORKERS})")
+    pool = _get_segment_pool()
+    futures = [
+        pool.submit(analyze_segment_worker, file_path, segment_index, segment_length, profile)
+        for segment_index in range(segment_count)
+    ]
+    try:
+        for segment_index, future in enumerate(futures):
+            result = future.result()
+            if result is not None:
+                yield (segment_index, *result)
+    except BrokenProcessPool as e:
+        logger.error(f"세그먼트 분석 프로세스가 비정상 종료되었습니다: {e}", extra={
+            "errorType": "BrokenProcessPool",
+            "error_message": str(e)
+        })
+        _reset_segment_pool(pool)
+        raise VideoProcessingError("세그먼트 분석 중 오류가 발생했습니다.") from e
+    finally:
+        # 중간에 중단된 경우 아직 시작되지 않은 세그먼트는 취소
+        for future in futures:
+            future.cancel()
+
+def _fetch_high_res_frames(file_path: str, frame_indices: List[int]) -> Dict[int, np.ndarray]:
+    """
+    피드백 이미지용으로 지정된 프레임만 원본 해상도로 다시 추출합니다.
+    read_video_opencv는 키프레임 탐색(또는 ffmpeg select)으로 해당 프레임 근처만 디코딩합니다.
+
+    Args:
+        file_path (str): 비디오 파일의 경로.
+        frame_indices (List[int]): 추출할 원본 프레임 인덱스 리스트.
+
+    Returns:
+        Dict[int, np.ndarray]: 프레임 인덱스별 원본 해상도 프레임. 추출에 실패한 프레임은 포함되지 않습니다.
+    """
+    indices = sorted(set(frame_indices))
+    if not indices:
+        return {}
+    try:
+        frames = read_video_opencv(file_path, indices)
+    except VideoProcessingError as vpe:
+        logger.info(f"원본 해상도 프레임을 가져오지 못해 샘플 프레임을 사용합니다: {vpe.message}")
+        return {}
+    # 프레임은 인덱스 오름차순으로 반환되며, 비디오 끝을 넘는 인덱스는 뒤에서부터 누락됨
+    return dict(zip(indices, frames or []))
+
+def process_video(file_path: str, video_id: str, profile: str = ANALYSIS_PROFILE):
     """
     비디오 파일을 처리하여 피드백 데이터를 생성합니다.
+    profile(fast, balanced, accurate)에 따라 샘플링 간격, 분석 해상도, Mediapipe 모델 설정이 달라집니다.
     """
+    analysis_profile = ANALYSIS_PROFILES[profile]
     try:
         video_duration = get_video_duration(file_path)
     except VideoProcessingError as vpe:
@@ -40,7 +184,7 @@ def process_video(file_path: str, video_id: str):
 
     # 세그먼트 길이와 프레임 간격 설정
     segment_length = 60  # 초
-    frame_interval = 1    # 초
+    frame_interval = analysis_profile.frame_interval  # 초
     feedback_data = []
     mediapipe_results = []
 
@@ -52,192 +196,170 @@ def process_video(file_path: str, video_id: str):
         })
         raise VideoProcessingError("피드백 이미지를 저장할 디렉터리가 지정되지 않았거나 존재하지 않습니다.")
 
-    # 각 세그먼트별로 프레임 추출 및 피드백 분석
-    for start_time in range(0, int(video_duration), segment_length):
-        segment_index = start_time // segment_length
-        try:
-            frames_low_res = download_and_sample_video_local(file_path, start_time, segment_length, frame_interval)
-        except VideoProcessingError as vpe:
-            logger.error(f"프레임을 추출할 수 없습니다: {vpe.message}", extra={
-                "errorType": "VideoProcessingError",
-                "error_message": f"프레임 추출 실패: {vpe.message}"
-            })
-            raise VideoProcessingError("프레임을 추출할 수 없습니다.") from vpe
-
-        if frames_low_res is None or len(frames_low_res) == 0:
-            logger.error(f"프레임을 추출할 수 없습니다. 비디오 파일에 문제가 있을 수 있습니다: {file_path}", extra={
-                "errorType": "VideoProcessingError",
-                "error_message": f"비디오 파일에 문제가 있을 수 있습니다. {file_path}"
-            })
-            raise VideoProcessingError("비디오 파일에 문제가 있을 수 있습니다.")
-
-        # Mediapipe 기반 문제 프레임 필터링
-        problematic_frames = []
-        mediapipe_results_segment = []  # 세그먼트별 Mediapipe 결과 저장
-        problematic_timestamps = []  # 타임스탬프 리스트 추가
-        previous_pose_landmarks = None
-        previous_hand_landmarks = None
-
-        for idx, frame_low_res in enumerate(frames_low_res):
-            # 기본값으로 초기화
-            mediapipe_feedback = {
-                "posture_score": 0.0,
-                "gaze_score": 0.0,
-                "gestures_score": 0.0,
-                "sudden_movement_score": 0.0
-            }
-            current_pose_landmarks = previous_pose_landmarks
-            current_hand_landmarks = previous_hand_landmarks
-
-            # analyze_frame 호출 및 결과 처리
-            try:
-                mediapipe_feedback, current_pose_landmarks, current_hand_landmarks = analyze_frame(
-                    frame_low_res, previous_pose_landmarks, previous_hand_landmarks
-                )
-            except Exception as e:
-                logger.error(f"프레임 {idx} 분석 중 오류 발생: {str(e)}", extra={
-                    "errorType": type(e).__name__,
-                    "error_message": str(e)
-                })
-                continue  # 다음 프레임으로 계속 진행
-
-            # 특정 기준을 초과하는 경우 문제 프레임으로 간주
-            if (mediapipe_feedback["posture_score"] > 0.8 or
-                mediapipe_feedback["gaze_score"] > 0.7 or
-                mediapipe_feedback["gestures_score"] > 0.7 or
-                mediapipe_feedback["sudden_movement_score"] > 0.7):
-
-                # 문제 프레임 및 Mediapipe 결과 저장
-                timestamp_sec = start_time + idx * frame_interval  # 타임스탬프 계산
-                problematic_frames.append((frame_low_res, segment_index, idx, timestamp_sec))
-                problematic_timestamps.append(timestamp_sec)  # 타임스탬프 추가
-
-                mediapipe_results_segment.append({
-                    "gaze_processing": {
-                        "score": mediapipe_feedback["gaze_score"]
-                    },
-                    "gestures": {
-                        "score": mediapipe_feedback["gestures_score"]
-                    },
-                    "posture_body": {
-                        "score": mediapipe_feedback["posture_score"]
-                    },
-                    "movement": {
-                        "score": mediapipe_feedback["sudden_movement_score"]
-                    }
-                })
-
-            # 이전 랜드마크 갱신
-            previous_pose_landmarks = current_pose_landmarks if current_pose_landmarks else previous_pose_landmarks
-            previous_hand_landmarks = current_hand_landmarks if current_hand_landmarks else previous_hand_landmarks
-
-        # 문제가 되는 프레임만 처리
-        if problematic_frames:
-            try:
-                frames_to_analyze = [frame_info[0] for frame_info in problematic_frames]
-                timestamps_to_analyze = [frame_info[3] for frame_info in problematic_frames]  # 초 단위 타임스탬프 전달
-                mediapipe_results_subset = mediapipe_results_segment[:len(problematic_frames)]
-
-                problematic_frames_processed, feedbacks = analyze_frames(
-                    frames=frames_to_analyze,
-                    timestamps=timestamps_to_analyze,  # 초 단위 타임스탬프 전달
-                    mediapipe_results=mediapipe_results_subset,
-                    segment_idx=segment_index,
-                    duration=segment_length,
-                    segment_length=segment_length,
-                    system_instruction=SYSTEM_INSTRUCTION,
-                    frame_interval=frame_interval
-                )
-            except Exception as e:
-                logger.error(f"프레임 분석 중 오류 발생: {str(e)}",  extra={
-                    "errorType": type(e).__name__,
-                    "error_message": str(e)
-                })
-                raise HTTPException(status_code=422, detail="프레임 분석 중 오류가 발생했습니다.") from e
-        else:
-            problematic_frames_processed = []
-            feedbacks = []
+    # 세그먼트별 Mediapipe 분석 결과를 순서대로 받아 문제 프레임에 대한 피드백 생성
+    has_frames = False
+    total_frames = 0
+    skipped_frames = 0
+    flagged_frames = 0
+    event_count = 0
+    face_mesh_skipped = 0
+    hands_skipped = 0
+    landmark_tracks = []
+    # 중간에 오류가 나도 생성기를 바로 닫아 그래프 묶음, 디코딩 스레드, 프레임 캐시 임시 파일을 정리
+    with closing(_iter_segment_results(file_path, video_duration, segment_length, analysis_profile)) as segment_results:
+        for segment_index, problematic_frames, mediapipe_results_segment, frame_stats, track in segment_results:
+            has_frames = True
+            if track is not None:
+                landmark_tracks.append(track)
+            total_frames += frame_stats["frames"]
+            skipped_frames += frame_stats["skipped"]
+            flagged_frames += frame_stats["flagged"]
+            event_count += len(problematic_frames)
+            face_mesh_skipped += frame_stats["face_mesh_skipped"]
+            hands_skipped += frame_stats["hands_skipped"]
 
-        logger.debug(f"프레임 수: {len(problematic_frames_processed)}, 피드백 수: {len(feedbacks)}")
+            # 문제가 되는 프레임만 처리
+            if problematic_frames:
+                try:
+                    frames_to_analyze = [frame_info[0] for frame_info in problematic_frames]
+                    timestamps_to_analyze = [frame_info[3] for frame_info in problematic_frames]  # 초 단위 타임스탬프 전달
+                    mediapipe_results_subset = mediapipe_results_segment[:len(problematic_frames)]
 
-        for frame_info, feedback_text in zip(problematic_frames_processed, feedbacks):
-            frame_low_res, segment_number, frame_number, timestamp = frame_info  # timestamp는 float
+                    problematic_frames_processed, feedbacks = analyze_frames(
+                        frames=frames_to_analyze,
+                        timestamps=timestamps_to_analyze,  # 초 단위 타임스탬프 전달
+                        mediapipe_results=mediapipe_results_subset,
+                        segment_idx=segment_index,
+                        duration=segment_length,
+                        segment_length=segment_length,
+                        system_instruction=SYSTEM_INSTRUCTION,
+                        frame_interval=frame_interval,
+                        flow_id=video_id
+                    )
+                except Exception as e:
+                    logger.error(f"프레임 분석 중 오류 발생: {str(e)}",  extra={
+                        "errorType": type(e).__name__,
+                        "error_message": str(e)
+                    })
+                    raise HTTPException(status_code=422, detail="프레임 분석 중 오류가 발생했습니다.") from e
+            else:
+                problematic_frames_processed = []
+                feedbacks = []
+
+            logger.debug(f"프레임 수: {len(problematic_frames_processed)}, 피드백 수: {len(feedbacks)}")
+
+            # 피드백이 생성된 프레임만 원본 해상도로 다시 추출 (타임스탬프로 원본 프레임 인덱스를 찾음)
+            source_frame_indices = {frame_info[3]: frame_info[4] for frame_info in problematic_frames}
+            high_res_frames = _fetch_high_res_frames(file_path, [
+                source_frame_indices[frame_info[3]]
+                for frame_info in problematic_frames_processed[:len(feedbacks)]
+                if frame_info[3] in source_frame_indices
+            ])
 
-            # 이미지 인코딩 (Base64)
-            try:
-                image_base64 = encode_feedback_image(frame_low_res)
-                if not image_base64:
-                    logger.error(f"프레임 {frame_number}의 이미지 인코딩 실패", extra={
+            for frame_info, feedback_text in zip(problematic_frames_processed, feedbacks):
+                frame_low_res, segment_number, frame_number, timestamp = frame_info  # timestamp는 float
+                feedback_image = high_res_frames.get(source_frame_indices.get(timestamp), frame_low_res)
+
+                # 이미지 인코딩 (Base64)
+                try:
+                    image_base64 = encode_feedback_image(feedback_image)
+                    if not image_base64:
+                        logger.error(f"프레임 {frame_number}의 이미지 인코딩 실패", extra={
+                            "errorType": "ImageEncodingError",
+                            "error_message": f"이미지 인코딩 실패. 프레임 {frame_number}"
+                        })
+                        raise ImageEncodingError("이미지 인코딩이 실패했습니다.")
+                except ImageEncodingError as iee:
+                    logger.error(f"이미지 인코딩 실패: {iee}", extra={
                         "errorType": "ImageEncodingError",
-                        "error_message": f"이미지 인코딩 실패. 프레임 {frame_number}"
+                        "error_message": f"이미지 인코딩 실패: {iee}"
                     })
-                    raise ImageEncodingError("이미지 인코딩이 실패했습니다.")
-            except ImageEncodingError as iee:
-                logger.error(f"이미지 인코딩 실패: {iee}", extra={
-                    "errorType": "ImageEncodingError",
-                    "error_message": f"이미지 인코딩 실패: {iee}"
-                })
-                raise ImageEncodingError("이미지 인코딩 중 오류가 발생했습니다.") from iee
-
-            # feedback_text를 FeedbackSections 구조로 변환
-            try:
-                feedback_sections = parse_feedback_text(feedback_text)
-                logger.debug(f"변환된 피드백 섹션: {feedback_sections}")
-            except VideoProcessingError as vpe:
-                logger.error(f"피드백 텍스트 파싱 오류: {vpe.message}", extra={
-                    "errorType": "VideoProcessingError",
-                    "error_message": f"피드백 텍스트 파싱 오류: {vpe.message}"
-                })
-                raise VideoProcessingError("피드백 텍스트를 생성하는 중 오류가 발생했습니다.") from vpe
-            except Exception as e:
-                logger.error(f"피드백 텍스트 파싱 중 예상치 못한 오류 발생: {str(e)}", extra={
-                    "errorType": type(e).__name__,
-                    "error_message": str(e)
-                })
-                raise VideoProcessingError("피드백 텍스트를 생성하는 중 오류가 발생했습니다.") from e
-
-            # 초 단위 타임스탬프를 "Xm Ys" 형식으로 변환
-            minutes = int(timestamp // 60)
-            seconds = int(timestamp % 60)
-            timestamp_str = f"{minutes}m {seconds}s"
-
-            # FeedbackFrame creation:
-            feedback_frame = FeedbackFrame(
-                video_id=video_id,
-                frame_index=frame_number,
-                timestamp=timestamp_str,  # 문자열 타임스탬프 전달
-                feedback_text=feedback_sections,
-                image_base64=image_base64
-            )
-            feedback_data.append(feedback_frame.dict())
-
-            # 피드백 이미지를 저장하는 경우
-            if FEEDBACK_DIR:
-                # 초 단위 타임스탬프를 "Xm Ys" 형식으로 변환 (이미 변환됨)
-                # safe_timestamp는 timestamp_str을 기반으로 생성
-                safe_timestamp = re.sub(r'[^\w_]', '', timestamp_str.replace("m ", "m_").replace(" ", "_").replace("s", "s_").strip("_"))
-                unique_id = uuid.uuid4().hex  # 고유한 식별자 생성
-                image_filename = f"{video_id}_segment_{segment_number}_frame_{frame_number}_{safe_timestamp}_{unique_id}.jpg"  # video_id 포함
-                image_path = os.path.join(FEEDBACK_DIR, image_filename)
+                    raise ImageEncodingError("이미지 인코딩 중 오류가 발생했습니다.") from iee
+
+                # feedback_text를 FeedbackSections 구조로 변환
                 try:
-                    with open(image_path, "wb") as img_file:
-                        img_file.write(base64.b64decode(image_base64))
-                    if not os.path.exists(image_path):
-                        raise IOError("이미지가 지정된 경로에 저장되지 않았습니다.")
-
-                except IOError as ioe:
-                    logger.error(f"이미지 저장 중 오류 발생: {ioe}", extra={
-                        "errorType": "ImageSaveError",
-                        "error_message": f"이미지 저장 중 오류 발생: {ioe}"
+                    feedback_sections = parse_feedback_text(feedback_text)
+                    logger.debug(f"변환된 피드백 섹션: {feedback_sections}")
+                except VideoProcessingError as vpe:
+                    logger.error(f"피드백 텍스트 파싱 오류: {vpe.message}", extra={
+                        "errorType": "VideoProcessingError",
+                        "error_message": f"피드백 텍스트 파싱 오류: {vpe.message}"
                     })
-                    raise HTTPException(status_code=500, detail="이미지 저장 중 오류가 발생했습니다.") from ioe
-
+                    raise VideoProcessingError("피드백 텍스트를 생성하는 중 오류가 발생했습니다.") from vpe
                 except Exception as e:
-                    logger.error(f"이미지 저장 중 예상치 못한 오류 발생: {e}", extra={
-                        "errorType": "ImageSaveError",
-                        "error_message": f"이미지 저장 중 오류 발생: {e}"
+                    logger.error(f"피드백 텍스트 파싱 중 예상치 못한 오류 발생: {str(e)}", extra={
+                        "errorType": type(e).__name__,
+                        "error_message": str(e)
                     })
-                    raise HTTPException(status_code=500, detail="이미지 저장 중 오류가 발생했습니다.") from e
+                    raise VideoProcessingError("피드백 텍스트를 생성하는 중 오류가 발생했습니다.") from e
+
+                # 초 단위 타임스탬프를 "Xm Ys" 형식으로 변환
+                minutes = int(timestamp // 60)
+                seconds = int(timestamp % 60)
+                timestamp_str = f"{minutes}m {seconds}s"
+
+                # FeedbackFrame creation:
+                feedback_frame = FeedbackFrame(
+                    video_id=video_id,
+                    frame_index=frame_number,
+                    timestamp=timestamp_str,  # 문자열 타임스탬프 전달
+                    feedback_text=feedback_sections,
+                    image_base64=image_base64
+                )
+                feedback_data.append(feedback_frame.dict())
+
+                # 피드백 이미지를 저장하는 경우
+                if FEEDBACK_DIR:
+                    # 초 단위 타임스탬프를 "Xm Ys" 형식으로 변환 (이미 변환됨)
+                    # safe_timestamp는 timestamp_str을 기반으로 생성
+                    safe_timestamp = re.sub(r'[^\w_]', '', timestamp_str.replace("m ", "m_").replace(" ", "_").replace("s", "s_").strip("_"))
+                    unique_id = uuid.uuid4().hex  # 고유한 식별자 생성
+                    image_filename = f"{video_id}_segment_{segment_number}_frame_{frame_number}_{safe_timestamp}_{unique_id}.jpg"  # video_id 포함
+                    image_path = os.path.join(FEEDBACK_DIR, image_filename)
+                    try:
+                        with open(image_path, "wb") as img_file:
+                            img_file.write(base64.b64decode(image_base64))
+                        if not os.path.exists(image_path):
+                            raise IOError("이미지가 지정된 경로에 저장되지 않았습니다.")
+
+                    except IOError as ioe:
+                        logger.error(f"이미지 저장 중 오류 발생: {ioe}", extra={
+                            "errorType": "ImageSaveError",
+                            "error_message": f"이미지 저장 중 오류 발생: {ioe}"
+                        })
+                        raise HTTPException(status_code=500, detail="이미지 저장 중 오류가 발생했습니다.") from ioe
+
+                    except Exception as e:
+                        logger.error(f"이미지 저장 중 예상치 못한 오류 발생: {e}", extra={
+                            "errorType": "ImageSaveError",
+                            "error_message": f"이미지 저장 중 오류 발생: {e}"
+                        })
+                        raise HTTPException(status_code=500, detail="이미지 저장 중 오류가 발생했습니다.") from e
+
+    logger.info(f"Mediapipe 분석 프레임: {total_frames - skipped_frames}/{total_frames} (변화 없어 생략: {skipped_frames})")
+    logger.info(f"기준 초과 프레임 {flagged_frames}개 → VLM 분석 대상 {event_count}개")
+    if MEDIAPIPE_CASCADE:
+        analyzed_frames = total_frames - skipped_frames
+        logger.info(f"조건부 실행으로 생략한 모델 호출: FaceMesh {face_mesh_skipped}/{analyzed_frames}, Hands {hands_skipped}/{analyzed_frames}")
+
+    # 기준이나 구간 설정을 바꿔 다시 점수를 계산할 수 있도록 랜드마크를 저장 (디코딩과 Mediapipe 추론 없이 재계산)
+    if LANDMARK_STORE_ENABLED:
+        save_landmark_store(file_path, landmark_tracks, {
+            "segment_length": segment_length,
+            "frame_interval": frame_interval,
+            "profile": analysis_profile.name,
+            "frame_size": analysis_profile.frame_size,
+            "engine": MEDIAPIPE_ENGINE,
+            "roi_crop": MEDIAPIPE_ROI_CROP,
+            "cascade": MEDIAPIPE_CASCADE
+        })
+
+    if int(video_duration) > 0 and not has_frames:
+        logger.error(f"프레임을 추출할 수 없습니다. 비디오 파일에 문제가 있을 수 있습니다: {file_path}", extra={
+            "errorType": "VideoProcessingError",
+            "error_message": f"비디오 파일에 문제가 있을 수 있습니다. {file_path}"
+        })
+        raise VideoProcessingError("비디오 파일에 문제가 있을 수 있습니다.")
 
     # 피드백 데이터 반환 (비어 있을 수 있음)        
     return feedback_data
@@ -5,13 +5,45 @@ import cv2
 import numpy as np
 import logging
 from vlm_model.exceptions import VideoProcessingError
+from vlm_model.utils.ffmpeg_decoder import use_ffmpeg_backend, probe_video_stream, read_frames_ffmpeg
+from vlm_model.utils.seek_video import get_keyframe_index, read_frames_with_seek
 
 # 모듈별 로거 생성
 logger = logging.getLogger(__name__) 
 
 def read_video_opencv(video_path: str, frame_indices: List[int]) -> Optional[List[np.ndarray]]:
+    """
+    비디오에서 특정 프레임들을 추출합니다.
+    VIDEO_DECODER_BACKEND가 "ffmpeg"이면 ffmpeg select 필터로 지정된 프레임만 디코딩하고, 실패하면 OpenCV로 대체합니다.
+
+    Args:
+        video_path (str): 비디오 파일의 경로.
+        frame_indices (List[int]): 추출할 프레임의 인덱스 리스트.
+
+    Returns:
+        Optional[List[np.ndarray]]: 추출된 프레임들의 리스트 또는 실패 시 None.
+
+    Raises:
+        VideoProcessingError: 비디오 파일을 열 수 없거나 프레임을 찾을 수 없을 때.
+    """
+    if use_ffmpeg_backend():
+        try:
+            stream_info = probe_video_stream(video_path)
+            # 키프레임 정보가 있는(고정 프레임 레이트) 비디오는 첫 프레임 근처로 탐색 후 디코딩
+            seek_fps = stream_info["fps"] if len(get_keyframe_index(video_path)) > 1 else None
+            frames = read_frames_ffmpeg(video_path, frame_indices, (stream_info["width"], stream_info["height"]), seek_fps)
+            if not frames:
+                raise VideoProcessingError("FFmpeg로 추출된 프레임이 없습니다.")
+            return frames
+        except VideoProcessingError as e:
+            logger.info(f"FFmpeg 디코더 사용에 실패하여 OpenCV로 대체합니다: {e.message}")
+
+    return _read_video_frames_opencv(video_path, frame_indices)
+
+def _read_video_frames_opencv(video_path: str, frame_indices: List[int]) -> Optional[List[np.ndarray]]:
     """
     OpenCV를 사용하여 비디오에서 특정 프레임들을 추출합니다.
+    키프레임 인덱스가 있으면 각 프레임 직전 키프레임으로 이동하여 디코딩하고, 없으면 처음부터 순차적으로 디코딩합니다.
 
     Args:
         video_path (str): 비디오 파일의 경로.
@@ -35,20 +67,25 @@ def read_video_opencv(video_path: str, frame_indices: List[int]) -> Optional[Lis
             raise VideoProcessingError(f"비디오 파일을 열 수 없습니다: {video_path}")
 
         frames = []
-        frame_counter = 0
-        frame_indices_set = set(frame_indices)
+        keyframes = get_keyframe_index(video_path)
 
-        while True:
-            ret, frame = cap.read()
-            if not ret:
-                break
+        if len(keyframes) > 1:
+            frames = read_frames_with_seek(cap, frame_indices, keyframes)
+        else:
+            frame_counter = 0
+            frame_indices_set = set(frame_indices)
 
-            if frame_counter in frame_indices_set:
-                frames.append(frame)
-                if len(frames) == len(frame_indices):
+            while True:
+                ret, frame = cap.read()
+                if not ret:
                     break
 
-            frame_counter += 1
+                if frame_counter in frame_indices_set:
+                    frames.append(frame)
+                    if len(frames) == len(frame_indices):
+                        break
+
+                frame_counter += 1
 
         cap.release()
 
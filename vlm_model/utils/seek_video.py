@@ -0,0 +1,109 @@
+# vlm_model/utils/seek_video.py
+
+import bisect
+import logging
+from typing import List, Optional
+
+import cv2
+import numpy as np
+
+from vlm_model.exceptions import VideoProcessingError
+from vlm_model.utils.media_probe import load_media_info, write_media_info
+
+logger = logging.getLogger(__name__) # 로거 사용
+
+def get_keyframe_index(video_path: str) -> List[int]:
+    """
+    비디오의 키프레임 위치를 프레임 인덱스 리스트로 반환합니다.
+
+    업로드 시 저장된 메타데이터의 키프레임 타임스탬프를 사용하며, 메타데이터가 없으면 한 번 분석하여 비디오 옆에 저장합니다.
+    가변 프레임 레이트(VFR) 비디오는 타임스탬프를 프레임 인덱스로 정확히 변환할 수 없으므로 [0]만 반환합니다.
+
+    Args:
+        video_path (str): 비디오 파일의 경로.
+
+    Returns:
+        List[int]: 오름차순 키프레임 인덱스 리스트 (항상 0 포함). [0]이면 처음부터 순차 디코딩해야 함을 의미합니다.
+    """
+    media_info = load_media_info(video_path)
+    if media_info is None:
+        try:
+            media_info = write_media_info(video_path)
+        except VideoProcessingError as e:
+            logger.info(f"키프레임 정보를 가져올 수 없어 순차 디코딩을 사용합니다: {e.message}")
+            return [0]
+
+    fps = media_info.get("fps") or 0
+    keyframe_times = media_info.get("keyframes") or []
+    if media_info.get("vfr") or not fps or not keyframe_times:
+        return [0]
+
+    # 첫 키프레임의 pts를 0번 프레임으로 간주 (mp4 edit list 등으로 시작 pts가 0이 아닐 수 있음)
+    offset = keyframe_times[0]
+    return sorted({0} | {int(round((t - offset) * fps)) for t in keyframe_times})
+
+def keyframe_before(keyframes: List[int], frame_index: int) -> int:
+    """
+    frame_index 이하인 키프레임 중 가장 가까운 키프레임 인덱스를 반환합니다.
+    """
+    position = bisect.bisect_right(keyframes, frame_index)
+    return keyframes[position - 1] if position else 0
+
+class FrameSeeker:
+    """
+    키프레임 인덱스를 이용해 열린 VideoCapture에서 임의의 프레임을 읽습니다.
+
+    목표 프레임이 현재 위치보다 앞에 있거나, 현재 위치와 목표 사이에 키프레임이 있으면
+    목표 직전 키프레임으로 이동한 뒤 그 지점부터 grab()으로 디코딩합니다.
+    따라서 프레임 하나를 읽는 비용은 최대 GOP 하나의 디코딩입니다.
+    """
+
+    def __init__(self, cap: cv2.VideoCapture, keyframes: List[int]):
+        self.cap = cap
+        self.keyframes = keyframes or [0]
+        self.position = 0  # 다음에 디코딩될 프레임 인덱스
+        self.seek_count = 0
+
+    def read(self, frame_index: int) -> Optional[np.ndarray]:
+        """
+        frame_index 위치의 프레임을 읽습니다. 비디오 끝을 넘어가면 None을 반환합니다.
+        """
+        keyframe = keyframe_before(self.keyframes, frame_index)
+        if frame_index < self.position or keyframe > self.position:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, keyframe)
+            self.position = keyframe
+            self.seek_count += 1
+
+        while self.position < frame_index:
+            if not self.cap.grab():
+                return None
+            self.position += 1
+
+        ret, frame = self.cap.read()
+        if not ret:
+            return None
+        self.position += 1
+        return frame
+
+def read_frames_with_seek(cap: cv2.VideoCapture, frame_indices: List[int], keyframes: List[int]) -> List[np.ndarray]:
+    """
+    키프레임 인덱스를 이용해 지정된 프레임들을 프레임 인덱스 오름차순으로 읽습니다.
+    비디오 길이를 넘는 인덱스는 건너뜁니다.
+
+    Args:
+        cap (cv2.VideoCapture): 열린 VideoCapture 객체.
+        frame_indices (List[int]): 추출할 프레임 인덱스 리스트.
+        keyframes (List[int]): get_keyframe_index로 구한 키프레임 인덱스 리스트.
+
+    Returns:
+        List[np.ndarray]: 추출된 프레임 리스트.
+    """
+    seeker = FrameSeeker(cap, keyframes)
+    frames = []
+    for frame_index in sorted(set(frame_indices)):
+        frame = seeker.read(frame_index)
+        if frame is None:
+            break
+        frames.append(frame)
+    logger.debug(f"키프레임 탐색으로 {len(frames)}개 프레임 추출 (탐색 횟수: {seeker.seek_count})")
+    return frames
@@ -0,0 +1,160 @@
+# vlm_model/utils/segment_analysis.py
+
+import logging
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from vlm_model.utils.download_video import sample_segment_frames
+from vlm_model.utils.motion_gate import MotionGate
+from vlm_model.utils.frame_cache import load_frame_cache
+from vlm_model.utils.cv_mediapipe_analysis.analyze_mediapipe_main import detect_landmarks
+from vlm_model.utils.cv_mediapipe_analysis.graph_pool import GraphBundle, checkout_graphs
+from vlm_model.utils.cv_mediapipe_analysis.cascade import GraphCascade
+from vlm_model.utils.cv_mediapipe_analysis.event_detection import problem_mask, select_problem_events
+from vlm_model.utils.cv_mediapipe_analysis.segment_scoring import score_sampled_frames
+from vlm_model.utils.cv_mediapipe_analysis.landmark_arrays import stack_landmarks
+from vlm_model.utils.cv_mediapipe_analysis.profiles import AnalysisProfile
+from vlm_model.utils.landmark_store import LandmarkTrack
+from vlm_model.exceptions import VideoProcessingError
+from vlm_model.config import MEDIAPIPE_CASCADE, EVENT_DETECTION_ENABLED
+
+# 세그먼트 병렬 분석 작업자(spawn 프로세스)가 import하는 모듈입니다.
+# 작업자마다 VLM 클라이언트와 응답 캐시 DB가 만들어지지 않도록 Mediapipe 분석에 필요한 모듈만 import합니다.
+
+logger = logging.getLogger(__name__) # 로거 사용
+
+def frame_sample_size(profile: AnalysisProfile) -> Tuple[int, int]:
+    # Mediapipe 분석에 사용하는 샘플 프레임 크기 (가로, 세로). 피드백 이미지는 원본 해상도로 다시 추출하므로 분석 정확도에만 영향
+    return (profile.frame_size, profile.frame_size)
+
+def analyze_segment_frames(segment_index: int, segment_frames: Iterable[Tuple[int, float, np.ndarray]], graphs: GraphBundle) -> Tuple[List[tuple], List[dict], Dict[str, int], Optional[LandmarkTrack]]:
+    """
+    한 세그먼트의 프레임들을 Mediapipe로 분석하여 기준을 초과하는 문제 프레임을 골라냅니다.
+    프레임마다 랜드마크를 한 번 배열로 변환해 두고, 점수는 score_segment로 세그먼트 전체에 대해 한 번에 계산합니다.
+    EVENT_DETECTION_ENABLED이면 점수 시계열에서 문제 구간을 찾아 구간마다 대표 프레임 하나만 문제 프레임으로 반환합니다.
+    이전 랜드마크 비교는 세그먼트 안에서만 이루어지므로 세그먼트 간 의존성이 없습니다.
+
+    MOTION_GATE_THRESHOLD가 설정되면 마지막으로 분석한 프레임과 거의 같은 프레임은 랜드마크 검출을 생략하고
+    직전 분석 프레임의 점수를 그대로 사용합니다. 움직임이 없으므로 sudden_movement_score만 0으로 둡니다.
+
+    Args:
+        segment_index (int): 세그먼트 인덱스.
+        segment_frames (Iterable[Tuple[int, float, np.ndarray]]): (원본 프레임 인덱스, 타임스탬프(초), 저해상도 프레임) 목록.
+        graphs (GraphBundle): 이 비디오가 빌린 Mediapipe 그래프 묶음.
+
+    Returns:
+        Tuple[List[tuple], List[dict], Dict[str, int], Optional[LandmarkTrack]]:
+            - 문제 프레임 목록 (frame, segment_index, 세그먼트 내 인덱스, timestamp, 원본 프레임 인덱스)
+            - 문제 프레임별 Mediapipe 점수
+            - 프레임 수 통계 {"frames": 전체 프레임 수, "skipped": 분석을 생략한 프레임 수,
+                              "flagged": 기준을 초과한 프레임 수,
+                              "face_mesh_skipped"/"hands_skipped": MEDIAPIPE_CASCADE로 생략한 FaceMesh/Hands 실행 수}
+            - 점수 재계산용 랜드마크 기록 (프레임이 없으면 None)
+    """
+    frames = []  # 점수 계산 후 문제 프레임을 골라내기 위해 세그먼트 프레임을 보관
+    landmarks = []  # 랜드마크를 검출한 프레임의 랜드마크 배열
+    score_rows = []  # 프레임별로 사용할 landmarks의 위치 (변화 없는 프레임은 직전 분석 프레임)
+    skipped = []
+    motion_gate = MotionGate()
+    cascade = GraphCascade() if MEDIAPIPE_CASCADE else None
+
+    for source_frame_idx, timestamp_sec, frame_low_res in segment_frames:
+        # 모든 프레임을 게이트에 통과시켜 기준 프레임을 갱신
+        frame_skipped = motion_gate.is_unchanged(frame_low_res) and bool(landmarks)
+        if not frame_skipped:
+            landmarks.append(detect_landmarks(frame_low_res, graphs, cascade))
+        frames.append((frame_low_res, timestamp_sec, source_frame_idx))
+        score_rows.append(len(landmarks) - 1)
+        skipped.append(frame_skipped)
+
+    if not frames:
+        return [], [], {"frames": 0, "skipped": 0, "flagged": 0, "face_mesh_skipped": 0, "hands_skipped": 0}, None
+
+    # 세그먼트 전체 점수 (T,) 배열. 변화 없는 프레임은 직전 분석 프레임의 점수를 이어서 사용
+    track = LandmarkTrack(
+        segment_index=segment_index,
+        landmarks=stack_landmarks(landmarks),
+        score_rows=np.array(score_rows, dtype=np.int32),
+        skipped=np.array(skipped, dtype=bool),
+        frame_indices=np.array([frame[2] for frame in frames], dtype=np.int64),
+        timestamps=np.array([frame[1] for frame in frames], dtype=np.float64)
+    )
+    scores = score_sampled_frames(track.landmarks, track.score_rows, track.skipped)
+
+    # 특정 기준을 초과하는 경우 문제 프레임으로 간주
+    # EVENT_DETECTION_ENABLED이면 연속된 문제 프레임을 하나의 구간으로 묶어 구간마다 대표 프레임 하나만 VLM으로 분석
+    flagged = problem_mask(scores)
+    events = select_problem_events(scores, EVENT_DETECTION_ENABLED)
+
+    problematic_frames = []
+    mediapipe_results_segment = []  # 세그먼트별 Mediapipe 결과 저장
+    for event in events:
+        idx = event.peak
+        frame_low_res, timestamp_sec, source_frame_idx = frames[idx]
+        problematic_frames.append((frame_low_res, segment_index, idx, timestamp_sec, source_frame_idx))
+        mediapipe_result = {
+            "gaze_processing": {
+                "score": float(scores["gaze_score"][idx])
+            },
+            "gestures": {
+                "score": float(scores["gestures_score"][idx])
+            },
+            "posture_body": {
+                "score": float(scores["posture_score"][idx])
+            },
+            "movement": {
+                "score": float(scores["sudden_movement_score"][idx])
+            },
+            "facial_expression": {
+                "score": float(scores["facial_expression_score"][idx])
+            }
+        }
+        if event.length > 1:
+            # 문제 행동이 지속된 구간 (초)
+            mediapipe_result["event"] = {"start": frames[event.start][1], "end": frames[event.end][1], "frames": event.length}
+        mediapipe_results_segment.append(mediapipe_result)
+
+    frame_stats = {
+        "frames": len(frames),
+        "skipped": int(track.skipped.sum()),
+        "flagged": int(flagged.sum()),
+        "face_mesh_skipped": cascade.skipped["face_mesh"] if cascade else 0,
+        "hands_skipped": cascade.skipped["hands"] if cascade else 0
+    }
+    return problematic_frames, mediapipe_results_segment, frame_stats, track
+
+def analyze_segment_worker(file_path: str, segment_index: int, segment_length: int, profile: AnalysisProfile) -> Optional[Tuple[List[tuple], List[dict], Dict[str, int], Optional[LandmarkTrack]]]:
+    """
+    프로세스 풀 작업자에서 실행됩니다. 작업자가 직접 비디오를 열어 세그먼트 시작 지점으로 탐색한 뒤
+    해당 세그먼트의 프레임만 추출하여 분석 프로필의 설정으로 Mediapipe 분석을 수행합니다.
+    그래프 묶음은 작업자 프로세스의 그래프 풀에서 빌리므로, 같은 작업자가 처리하는 다음 세그먼트에서 재사용됩니다.
+
+    Returns:
+        Optional[Tuple[List[tuple], List[dict], Dict[str, int], Optional[LandmarkTrack]]]: analyze_segment_frames의 결과. 세그먼트에서 프레임을 추출하지 못하면 None.
+    """
+    frame_interval = profile.frame_interval
+    frame_size = frame_sample_size(profile)
+
+    # 이전 분석에서 저장된 프레임 캐시가 있으면 디코딩하지 않음
+    frame_cache = load_frame_cache(file_path, segment_length, frame_interval, frame_size)
+    if frame_cache is not None:
+        segment_frames = frame_cache.segment_frames(segment_index)
+        if not segment_frames:
+            return None
+        with checkout_graphs(profile.name) as graphs:
+            return analyze_segment_frames(segment_index, segment_frames, graphs)
+
+    start_time = segment_index * segment_length
+    try:
+        frame_indices, frames = sample_segment_frames(file_path, start_time=start_time, duration=segment_length, frame_interval=frame_interval, target_size=frame_size)
+    except VideoProcessingError as vpe:
+        logger.info(f"세그먼트 {segment_index}에서 프레임을 추출하지 못했습니다: {vpe.message}")
+        return None
+    if frames is None or len(frames) == 0:
+        return None
+
+    # 프레임 인덱스는 샘플러가 실제로 읽은 값을 사용 (29.97fps 등에서 타임스탬프로 다시 계산하면 어긋남)
+    timestamps = [float(start_time + i * frame_interval) for i in range(len(frames))]
+    with checkout_graphs(profile.name) as graphs:
+        return analyze_segment_frames(segment_index, zip(frame_indices, timestamps, frames), graphs)
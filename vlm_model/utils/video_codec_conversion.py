@@ -5,12 +5,17 @@ import re
 import uuid
 import base64
 import logging
+import threading
 import subprocess
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
+from typing import Dict
 
 from fastapi import HTTPException
 
+from vlm_model.config import VP9_TRANSCODE_WORKERS
 from vlm_model.exceptions import VideoImportingError
+from vlm_model.utils.media_probe import load_media_info
 
 logger = logging.getLogger(__name__) # 로거 사용
 
@@ -113,6 +118,7 @@ def get_video_codec_info(video_path: str) -> str:
 def is_vp9(video_path: str) -> bool:
     """
     주어진 비디오 파일이 VP9 코덱인지 확인합니다.
+    업로드 시 저장된 메타데이터가 있으면 ffmpeg를 실행하지 않고 그 코덱 정보를 사용합니다.
     
     Parameters:
     - video_path: 비디오 파일 경로
@@ -120,7 +126,11 @@ def is_vp9(video_path: str) -> bool:
     Returns:
     - bool: VP9 코덱인 경우 True, 아니면 False
     """
-    codec_info = get_video_codec_info(video_path)
+    media_info = load_media_info(video_path)
+    if media_info and media_info.get("codec"):
+        codec_info = media_info["codec"]
+    else:
+        codec_info = get_video_codec_info(video_path)
     is_vp9_codec = 'vp9' in codec_info.lower()
     logger.debug(f"파일 {video_path}의 VP9 여부: {is_vp9_codec}")
     return is_vp9_codec
@@ -155,3 +165,76 @@ def convert_to_vp9_if_needed(input_path: str, output_path: str, preset: str = 'f
         tile_rows=tile_rows,
         bitrate=bitrate
     )
+
+
+# 백그라운드 VP9 변환 작업 (output_path별로 하나의 작업만 실행)
+_transcode_executor = ThreadPoolExecutor(max_workers=VP9_TRANSCODE_WORKERS, thread_name_prefix="vp9-transcoder")
+_transcode_jobs: Dict[str, Future] = {}
+_transcode_lock = threading.Lock()
+
+def _transcode_to_vp9(input_path: str, output_path: str) -> bool:
+    """
+    임시 파일로 VP9 변환을 수행한 뒤 완료되면 output_path로 이동합니다.
+    변환 도중의 파일이 완성된 VP9 파일로 보이지 않도록 하기 위함입니다.
+    """
+    output = Path(output_path)
+    partial_path = output.with_name(f"{output.stem}.part{output.suffix}")
+    try:
+        converted = convert_to_vp9_if_needed(input_path=input_path, output_path=str(partial_path))
+        if converted:
+            os.replace(partial_path, output)
+        return converted
+    finally:
+        if partial_path.exists():
+            partial_path.unlink()
+
+def request_vp9_derivative(input_path: str, output_path: str) -> str:
+    """
+    VP9 파일을 요청합니다. 파일이 없으면 백그라운드 변환을 시작하고 즉시 상태를 반환합니다.
+
+    Parameters:
+    - input_path: 원본 비디오 파일 경로
+    - output_path: VP9 비디오 파일 경로
+
+    Returns:
+    - str: 변환 상태
+        - "ready": VP9 파일이 준비됨
+        - "original": 원본이 이미 VP9 코덱이므로 변환하지 않음
+        - "pending": 백그라운드 변환 진행 중
+        - "failed": 변환 실패 (다음 요청 시 다시 시도)
+    """
+    if os.path.exists(output_path):
+        return "ready"
+
+    with _transcode_lock:
+        job = _transcode_jobs.get(output_path)
+        if job is not None and job.done():
+            if job.exception() is not None:
+                # 실패한 작업만 목록에서 제거하여 다음 요청에서 재시도
+                del _transcode_jobs[output_path]
+                logger.error(f"백그라운드 VP9 변환 실패: {job.exception()}", extra={
+                    "errorType": type(job.exception()).__name__,
+                    "error_message": str(job.exception())
+                })
+                return "failed"
+            if not job.result():
+                return "original"
+            # 변환은 끝났지만 파일이 삭제된 경우 다시 변환
+            del _transcode_jobs[output_path]
+            job = None
+        if job is not None:
+            return "pending"
+
+    # 원본이 이미 VP9이면 작업을 만들지 않음 (업로드 시 저장된 메타데이터가 있으면 ffmpeg를 실행하지 않음)
+    try:
+        if is_vp9(input_path):
+            return "original"
+    except VideoImportingError as e:
+        logger.info(f"코덱 확인에 실패하여 백그라운드 변환에서 다시 확인합니다: {e}")
+
+    with _transcode_lock:
+        if output_path not in _transcode_jobs:
+            logger.info(f"백그라운드 VP9 변환을 시작합니다: {input_path}")
+            _transcode_jobs[output_path] = _transcode_executor.submit(_transcode_to_vp9, input_path, output_path)
+
+    return "pending"
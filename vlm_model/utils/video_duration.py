@@ -4,6 +4,7 @@ import cv2
 from typing import Optional
 import logging
 from vlm_model.exceptions import VideoImportingError
+from vlm_model.utils.media_probe import load_media_info
 import traceback
 
 # 모듈별 로거 생성
@@ -12,6 +13,7 @@ logger = logging.getLogger(__name__)
 def get_video_duration(video_path: str) -> Optional[float]:
     """
     비디오 길이를 초 단위로 반환합니다.
+    업로드 시 저장된 메타데이터가 있으면 비디오 파일을 열지 않고 그 값을 사용합니다.
     
     Args:
         video_path (str): 비디오 파일의 경로.
@@ -24,6 +26,11 @@ def get_video_duration(video_path: str) -> Optional[float]:
         ValueError: FPS 값을 가져올 수 없을 때.
         Exception: 기타 예외 발생 시.
     """
+    media_info = load_media_info(video_path)
+    if media_info and media_info.get("duration", 0) > 0:
+        logger.debug(f"메타데이터의 비디오 길이 사용: {media_info['duration']}")
+        return media_info["duration"]
+
     try:
         cap = cv2.VideoCapture(video_path)
         if not cap.isOpened():
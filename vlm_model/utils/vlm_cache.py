@@ -0,0 +1,183 @@
+# vlm_model/utils/vlm_cache.py
+
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional
+
+import cv2
+import numpy as np
+
+from vlm_model.config import (
+    VLM_CACHE_ENABLED,
+    VLM_CACHE_MAX_ENTRIES,
+    VLM_CACHE_DB_PATH,
+    VLM_CACHE_DB_MAX_ENTRIES,
+    VLM_CACHE_TTL,
+    VLM_CACHE_SCORE_STEP
+)
+
+logger = logging.getLogger(__name__) # 로거 사용
+
+def perceptual_hash(frame: np.ndarray) -> str:
+    """
+    프레임의 difference hash(64비트)를 16진수 문자열로 반환합니다.
+    압축이나 미세한 밝기 변화가 있어도 거의 같은 프레임은 같은 해시가 됩니다.
+
+    Args:
+        frame (np.ndarray): BGR 또는 흑백 프레임.
+
+    Returns:
+        str: 16자리 16진수 해시.
+    """
+    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) if frame.ndim == 3 else frame
+    small = cv2.resize(gray, (9, 8), interpolation=cv2.INTER_AREA)
+    bits = (small[:, 1:] > small[:, :-1]).flatten()
+    return f"{int(np.packbits(bits).view('>u8')[0]):016x}"
+
+def score_bucket(mediapipe_feedback: dict, step: float = VLM_CACHE_SCORE_STEP) -> str:
+    """
+    Mediapipe 점수를 step 단위로 반올림하여 캐시 키에 쓸 문자열로 만듭니다.
+    """
+    parts = []
+    for key in sorted(mediapipe_feedback):
+        value = mediapipe_feedback[key]
+        if isinstance(value, dict):
+            value = value.get("score", 0.0)
+        parts.append(f"{key}={round(float(value) / step) * step:.2f}")
+    return ",".join(parts)
+
+def prompt_hash(*parts: str) -> str:
+    """
+    시스템 지침, 사용자 프롬프트, 이미지 설정 등을 합친 해시를 반환합니다. 프롬프트가 바뀌면 기존 캐시는 사용되지 않습니다.
+    """
+    return hashlib.sha256("\x00".join(parts).encode("utf-8")).hexdigest()[:16]
+
+def cache_key(model: str, prompt_digest: str, frame: np.ndarray, mediapipe_feedback: dict) -> str:
+    """
+    모델 이름, 프롬프트 해시, 프레임의 perceptual hash, 구간화한 Mediapipe 점수로 캐시 키를 만듭니다.
+    """
+    return f"{model}:{prompt_digest}:{perceptual_hash(frame)}:{score_bucket(mediapipe_feedback)}"
+
+class VLMResponseCache:
+    """
+    프레임별 VLM 피드백 텍스트 캐시입니다.
+    메모리 LRU를 먼저 확인하고, db_path가 있으면 SQLite 파일을 두 번째 단계로 사용합니다.
+    SQLite 항목은 ttl초가 지나면 만료되고, max_db_entries를 넘으면 가장 오래 사용하지 않은 항목부터 삭제됩니다.
+    """
+
+    def __init__(self, max_entries: int = 1024, db_path: Optional[str] = None, ttl: float = 7 * 24 * 3600, max_db_entries: int = 10000):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_db_entries = max_db_entries
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"memory_hits": 0, "db_hits": 0, "misses": 0, "evictions": 0}
+        self._db = None
+        if db_path:
+            try:
+                Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+                self._db = sqlite3.connect(db_path, check_same_thread=False)
+                self._db.execute(
+                    "CREATE TABLE IF NOT EXISTS vlm_cache ("
+                    "key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+                )
+                self._db.execute("CREATE INDEX IF NOT EXISTS vlm_cache_accessed_at ON vlm_cache (accessed_at)")
+                self._db.commit()
+            except sqlite3.Error as e:
+                logger.info(f"VLM 캐시 DB를 열 수 없어 메모리 캐시만 사용합니다: {db_path} ({e})")
+                self._db = None
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        캐시된 피드백 텍스트를 반환합니다. 없거나 만료되었으면 None.
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None and now - entry[1] <= self.ttl:
+                self._memory.move_to_end(key)
+                self._stats["memory_hits"] += 1
+                return entry[0]
+            if entry is not None:
+                del self._memory[key]
+
+            if self._db is not None:
+                try:
+                    row = self._db.execute(
+                        "SELECT value, created_at FROM vlm_cache WHERE key = ? AND created_at >= ?",
+                        (key, now - self.ttl)
+                    ).fetchone()
+                    if row is not None:
+                        self._db.execute("UPDATE vlm_cache SET accessed_at = ? WHERE key = ?", (now, key))
+                        self._db.commit()
+                        self._store_memory(key, row[0], row[1])
+                        self._stats["db_hits"] += 1
+                        return row[0]
+                except sqlite3.Error as e:
+                    logger.info(f"VLM 캐시 DB 조회 실패: {e}")
+
+            self._stats["misses"] += 1
+            return None
+
+    def put(self, key: str, value: str) -> None:
+        """
+        피드백 텍스트를 캐시에 저장합니다.
+        """
+        now = time.time()
+        with self._lock:
+            self._store_memory(key, value, now)
+            if self._db is None:
+                return
+            try:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO vlm_cache (key, value, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                    (key, value, now, now)
+                )
+                # 만료 항목과 최대 개수를 넘는 오래된 항목 삭제
+                expired = self._db.execute("DELETE FROM vlm_cache WHERE created_at < ?", (now - self.ttl,)).rowcount
+                overflow = self._db.execute(
+                    "DELETE FROM vlm_cache WHERE key IN (SELECT key FROM vlm_cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                    (self.max_db_entries,)
+                ).rowcount
+                self._db.commit()
+                self._stats["evictions"] += expired + overflow
+            except sqlite3.Error as e:
+                logger.info(f"VLM 캐시 DB 저장 실패: {e}")
+
+    def _store_memory(self, key: str, value: str, created_at: float) -> None:
+        self._memory[key] = (value, created_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self._stats["evictions"] += 1
+
+    def stats(self) -> Dict[str, int]:
+        """
+        적중/실패 횟수와 현재 항목 수를 반환합니다.
+        """
+        with self._lock:
+            db_entries = 0
+            if self._db is not None:
+                try:
+                    db_entries = self._db.execute("SELECT COUNT(*) FROM vlm_cache").fetchone()[0]
+                except sqlite3.Error:
+                    pass
+            return {
+                **self._stats,
+                "hits": self._stats["memory_hits"] + self._stats["db_hits"],
+                "memory_entries": len(self._memory),
+                "db_entries": db_entries
+            }
+
+# 프로세스 전체에서 공유하는 VLM 응답 캐시 (VLM_CACHE_ENABLED가 false이면 None)
+vlm_cache = VLMResponseCache(
+    max_entries=VLM_CACHE_MAX_ENTRIES,
+    db_path=VLM_CACHE_DB_PATH or None,
+    ttl=VLM_CACHE_TTL,
+    max_db_entries=VLM_CACHE_DB_MAX_ENTRIES
+) if VLM_CACHE_ENABLED else None
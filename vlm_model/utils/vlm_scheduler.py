@@ -0,0 +1,233 @@
+# vlm_model/utils/vlm_scheduler.py
+
+import time
+import random
+import asyncio
+import logging
+import email.utils
+from collections import OrderedDict, deque
+from typing import Awaitable, Callable, Optional, TypeVar
+
+from openai import (
+    APIConnectionError,
+    APITimeoutError,
+    ConflictError,
+    InternalServerError,
+    RateLimitError
+)
+
+from vlm_model.config import (
+    VLM_RPM_LIMIT,
+    VLM_TPM_LIMIT,
+    VLM_MAX_RETRIES,
+    VLM_BACKOFF_BASE,
+    VLM_BACKOFF_MAX
+)
+
+logger = logging.getLogger(__name__) # 로거 사용
+
+T = TypeVar("T")
+
+# 다시 시도하면 성공할 수 있는 오류 (인증, 잘못된 요청 등은 바로 실패)
+RETRYABLE_ERRORS = (RateLimitError, APITimeoutError, APIConnectionError, InternalServerError, ConflictError)
+
+class TokenBucket:
+    """
+    분당 한도를 초당 비율로 채우는 토큰 버킷입니다. 최대 용량은 분당 한도와 같습니다.
+    limit이 0 이하이면 제한하지 않습니다.
+    """
+
+    def __init__(self, limit: float, now: Optional[float] = None):
+        self.capacity = float(limit)
+        self.rate = self.capacity / 60.0
+        self.level = self.capacity
+        self.updated = time.monotonic() if now is None else now
+
+    @property
+    def unlimited(self) -> bool:
+        return self.capacity <= 0
+
+    def _refill(self, now: float) -> None:
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def time_until(self, amount: float, now: float) -> float:
+        """
+        amount만큼 사용할 수 있을 때까지 기다려야 하는 시간(초)을 반환합니다.
+        """
+        if self.unlimited:
+            return 0.0
+        self._refill(now)
+        amount = min(amount, self.capacity)  # 한도보다 큰 요청도 버킷이 가득 차면 보냄
+        return max(0.0, (amount - self.level) / self.rate)
+
+    def consume(self, amount: float, now: float) -> None:
+        if self.unlimited:
+            return
+        self._refill(now)
+        self.level -= min(amount, self.capacity)
+
+    def refund(self, amount: float) -> None:
+        """
+        예상보다 적게 사용한 양을 돌려줍니다 (음수이면 초과 사용량만큼 차감).
+        """
+        if self.unlimited:
+            return
+        self.level = min(self.capacity, self.level + amount)
+
+def retry_after_seconds(error: Exception) -> Optional[float]:
+    """
+    오류 응답의 retry-after-ms 또는 retry-after 헤더(초 또는 HTTP 날짜)에서 대기 시간을 읽습니다.
+    """
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    for header, divisor in (("retry-after-ms", 1000), ("retry-after", 1)):
+        value = headers.get(header)
+        if value is None:
+            continue
+        try:
+            return max(0.0, float(value) / divisor)
+        except ValueError:
+            pass
+    parsed = email.utils.parsedate_tz(headers.get("retry-after") or "")
+    if parsed is None:
+        return None
+    return max(0.0, email.utils.mktime_tz(parsed) - time.time())
+
+class VLMScheduler:
+    """
+    프로세스의 모든 VLM 호출이 거치는 스케줄러입니다. 같은 API 키를 쓰는 요청들을 다음과 같이 조율합니다.
+
+    - 분당 요청 수(RPM)와 분당 토큰 수(TPM) 토큰 버킷으로 요청 시작 시점을 조절
+    - 비디오(flow)별 대기열을 번갈아 처리하여 먼저 들어온 비디오가 한도를 독차지하지 않도록 함
+    - 재시도 가능한 오류는 retry-after 헤더 또는 지터를 더한 지수 백오프 후 다시 시도
+    - RateLimitError를 받으면 대기 시간 동안 모든 요청의 시작을 멈춤
+
+    VLM 전용 이벤트 루프 하나에서만 사용합니다.
+    """
+
+    def __init__(self, rpm_limit: float = 0, tpm_limit: float = 0, max_retries: int = 5, backoff_base: float = 1.0, backoff_max: float = 60.0):
+        self.requests = TokenBucket(rpm_limit)
+        self.tokens = TokenBucket(tpm_limit)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._queues: "OrderedDict[str, deque]" = OrderedDict()
+        self._paused_until = 0.0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._dispatcher: Optional[asyncio.Task] = None
+        self._wake: Optional[asyncio.Event] = None
+
+    async def acquire(self, flow: str, tokens: int) -> None:
+        """
+        flow의 차례가 오고 RPM/TPM 한도에 여유가 생길 때까지 기다립니다.
+        """
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            # 다른 이벤트 루프에서 처음 사용하는 경우 대기 상태를 새로 만듦
+            self._loop = loop
+            self._queues.clear()
+            self._dispatcher = None
+            self._wake = asyncio.Event()
+
+        waiter = loop.create_future()
+        self._queues.setdefault(flow, deque()).append((waiter, tokens))
+        self._wake.set()
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = asyncio.ensure_future(self._dispatch())
+        await waiter
+
+    async def _dispatch(self) -> None:
+        while self._queues:
+            # 대기열의 맨 앞 flow부터 번갈아 처리 (처리한 flow는 맨 뒤로)
+            flow, queue = next(iter(self._queues.items()))
+            waiter, tokens = queue[0]
+            if waiter.done():
+                # gather 취소 등으로 이미 끝난 대기는 건너뜀
+                queue.popleft()
+                if not queue:
+                    del self._queues[flow]
+                continue
+
+            now = time.monotonic()
+            delay = max(
+                self._paused_until - now,
+                self.requests.time_until(1, now),
+                self.tokens.time_until(tokens, now)
+            )
+            if delay > 0:
+                self._wake.clear()
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            self.requests.consume(1, now)
+            self.tokens.consume(tokens, now)
+            queue.popleft()
+            waiter.set_result(None)
+            if queue:
+                self._queues.move_to_end(flow)
+            else:
+                del self._queues[flow]
+
+    def pause(self, seconds: float) -> None:
+        """
+        seconds초 동안 새 요청을 시작하지 않습니다 (공유 API 키가 한도에 걸렸을 때).
+        """
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    def backoff(self, attempt: int) -> float:
+        # 지터를 더한 지수 백오프 (0 ~ base * 2^attempt, 최대 backoff_max)
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    async def run(self, flow: str, tokens: int, call: Callable[[], Awaitable[T]], used_tokens: Callable[[T], int] = lambda result: 0) -> T:
+        """
+        한도와 순서를 지켜 call을 실행하고, 재시도 가능한 오류는 max_retries번까지 다시 시도합니다.
+
+        Args:
+            flow (str): 공정하게 나눌 단위 (비디오 ID 등).
+            tokens (int): 요청이 사용할 것으로 예상하는 토큰 수 (입력 + 최대 출력).
+            call (Callable[[], Awaitable[T]]): VLM 요청을 만드는 함수. 시도마다 새로 호출됩니다.
+            used_tokens (Callable[[T], int], optional): 결과에서 실제 사용 토큰 수를 읽는 함수. 예상과의 차이를 TPM 버킷에 반영합니다.
+
+        Returns:
+            T: call의 결과.
+
+        Raises:
+            Exception: 재시도할 수 없는 오류이거나 재시도 횟수를 모두 사용한 경우 마지막 오류.
+        """
+        attempt = 0
+        while True:
+            await self.acquire(flow, tokens)
+            try:
+                result = await call()
+            except RETRYABLE_ERRORS as e:
+                # 사용 한도(크레딧) 소진은 기다려도 해결되지 않으므로 바로 실패
+                if attempt >= self.max_retries or getattr(e, "code", None) == "insufficient_quota":
+                    raise
+                retry_after = retry_after_seconds(e)
+                delay = retry_after if retry_after is not None else self.backoff(attempt)
+                if isinstance(e, RateLimitError):
+                    self.pause(delay)
+                attempt += 1
+                logger.info(f"VLM 요청 재시도 {attempt}/{self.max_retries} ({type(e).__name__}, {delay:.2f}초 후)")
+                await asyncio.sleep(delay)
+                continue
+
+            used = used_tokens(result)
+            if used:
+                self.tokens.refund(tokens - used)
+            return result
+
+# 프로세스 전체에서 공유하는 VLM 스케줄러 (한도가 0이면 해당 버킷은 제한하지 않음)
+vlm_scheduler = VLMScheduler(
+    rpm_limit=VLM_RPM_LIMIT,
+    tpm_limit=VLM_TPM_LIMIT,
+    max_retries=VLM_MAX_RETRIES,
+    backoff_base=VLM_BACKOFF_BASE,
+    backoff_max=VLM_BACKOFF_MAX
+)